@@ -1,16 +1,21 @@
 
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import base64
 import os
-import io
 import random
 import json
+import uuid
 import pandas as pd
 from datetime import datetime, timedelta
 from PIL import Image
 import altair as alt
+from assets import ASSET_VARIANTS, render_variant
+from cards import card_cache_stats, render_card
+from clubs import split_clubs
 
 # --- 기본 설정 ---
 # FastAPI 백엔드 주소
@@ -26,6 +31,9 @@ else: # Streamlit Cloud 또는 로컬 환경
         # 로컬에서 secrets.toml 파일이 없을 때 예외 발생, 기본값을 사용하므로 pass
         pass
 
+# 브라우저가 직접 접속하는 백엔드 주소 (실시간 알림 SSE용, 내부 주소와 다를 때만 지정)
+PUBLIC_API_URL = os.environ.get("PUBLIC_API_URL", API_URL).rstrip("/")
+
 # 페이지 설정 (넓은 레이아웃, 제목, 아이콘 등)
 logo_image = Image.open("logo.png")
 st.set_page_config(page_title="디지털 회원증", layout="wide", page_icon=logo_image)
@@ -37,15 +45,36 @@ def local_css(file_name):
 
 local_css("style.css")
 
-# --- 이미지 로딩 캐싱 (매 렌더링마다 파일 읽기 방지) ---
-@st.cache_data
-def load_base64_image(file_path):
+# --- 로고 이미지 (백엔드 정적 파일) ---
+# [최적화] 로고를 화면마다 base64로 넣지 않고, 백엔드가 제공하는 WebP 변환본 주소를 사용
+# (브라우저가 한 번 받은 뒤 캐시하므로 회원증을 여러 장 그려도 이미지 전송 없음)
+@st.cache_data(ttl=600, show_spinner=False)
+def load_asset_manifest():
+    # 실패 시 예외를 그대로 올려 빈 결과가 캐시되지 않게 함
+    res = get_api_session().get(f"{API_URL}/assets/manifest", timeout=API_TIMEOUT)
+    res.raise_for_status()
+    return {name: f"{PUBLIC_API_URL}{path}" for name, path in res.json().items()}
+
+@st.cache_data(show_spinner=False)
+def load_base64_asset(name):
+    # 백엔드에 연결할 수 없을 때만 사용 (같은 크기로 줄인 변환본을 직접 만들어 base64로 삽입)
+    source, width = ASSET_VARIANTS[name]
     try:
-        with open(file_path, "rb") as f:
-            return base64.b64encode(f.read()).decode()
+        return base64.b64encode(render_variant(source, width)).decode()
     except FileNotFoundError:
         return ""
 
+def asset_src(name):
+    """로고 이미지의 img src (백엔드 주소, 실패 시 data URI, 파일이 없으면 빈 문자열)"""
+    try:
+        url = load_asset_manifest().get(name)
+        if url:
+            return url
+    except (requests.exceptions.RequestException, ValueError):
+        pass
+    encoded = load_base64_asset(name)
+    return f"data:image/webp;base64,{encoded}" if encoded else ""
+
 # --- 파티클 배경 효과 (CSS + Python) ---
 def add_particle_effect():
     particles_html = ""
@@ -199,7 +228,7 @@ if not st.session_state.local_storage_checked:
         if ls_expire:
             try:
                 st.session_state.expire_time = datetime.fromisoformat(ls_expire)
-            except:
+            except ValueError:
                 pass
         if ls_extend and ls_extend.isdigit():
             st.session_state.extend_count = int(ls_extend)
@@ -214,63 +243,142 @@ def do_logout():
     st.session_state.local_storage_checked = True
     st.rerun()
 
-# --- 헬퍼 함수: 분과 및 동아리 매핑 ---
-CLUB_DIVISIONS = {
-    "예술음악분과": ["LACOV", "한울", "딕트", "스타피쉬", "JB", "한사랑 오케스트라", "백우회", "거트", "우서", "어쿠스틱스", "4D"],
-    "창업학술분과": ["유토피아", "소란", "PSM", "제5세대", "리더", "우하오"],
-    "취미교양분과": ["왓치", "가비", "산악부", "FOCUS", "두점머리", "워너비", "만화마을", "0AE"],
-    "봉사종교분과": ["JYM", "CCC", "뉴라이프", "로타랙트", "LEO", "필리아", "Team911"],
-    "체육레저분과": ["K.B", "아웃사이더", "보디가드", "팬서스", "RELAX", "SPLASH", "KUBIC", "건무회"]
-}
-
-def get_division(club_name):
-    if not club_name: return "미분류"
-    club_upper = str(club_name).strip().upper()
-    for div, clubs in CLUB_DIVISIONS.items():
-        if any(c.upper() == club_upper for c in clubs):
-            return div
-    if club_upper in ["총동아리연합회"]:
-        return "학생자치기구"
-    return "미분류"
+# --- 헬퍼 함수: 백엔드 API 클라이언트 ---
+API_TIMEOUT = (3.05, 15) # (연결, 응답) 대기 시간(초)
+API_UPLOAD_TIMEOUT = (3.05, 120) # 파일 업로드용
+API_POOL_SIZE = 20 # 백엔드로 유지할 keep-alive 연결 수
 
-# --- 헬퍼 함수: 회원증 HTML 생성 (재사용 목적) ---
-def get_card_html(info, is_preview=False):
-    # KU 로고 이미지 로드
-    ku_logo_html = ""
-    encoded_ku = load_base64_image("ku logo.png")
-    if encoded_ku:
-        ku_logo_html = f'<img src="data:image/png;base64,{encoded_ku}" style="width: 50px; margin-top: 5px;">'
+@st.cache_resource
+def get_api_session():
+    """
+    [최적화] 모든 사용자/rerun이 공유하는 requests.Session (연결 재사용으로 매 요청마다의 TCP/TLS 연결 생략)
+    조회(GET) 요청은 연결 실패나 일시적인 서버 오류(502/503/504) 시 짧게 대기 후 재시도
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        connect=3,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=API_POOL_SIZE, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def api_request(method, path, timeout=API_TIMEOUT, logout_on_401=True, **kwargs):
+    """백엔드 API 호출. 로그인 상태에서 401(토큰 만료 등)을 받으면 바로 로그아웃 처리"""
+    res = get_api_session().request(method, f"{API_URL}{path}", timeout=timeout, **kwargs)
+    if res.status_code == 401 and logout_on_401 and st.session_state.get('token'):
+        do_logout()
+    return res
 
-    # 소속 동아리가 여러 개일 경우 (콤마 구분), 쉼표를 없애고 각각 간격을 두어 옆으로 나열
-    raw_club = info.get('club')
-    raw_club = raw_club if raw_club else '소속 없음'
-    club_html = "".join([f"<span style='margin-right: 8px;'>{c.strip()}</span>" for c in raw_club.split(',')])
+# --- 헬퍼 함수: 분과 및 동아리 매핑 (clubs.py 공통 모듈 사용) ---
+def load_admin_stats(headers):
+    # [최적화] 대시보드 통계와 동아리 목록/분과는 서버에서 SQL로 집계 (결과는 서버에 캐시됨)
+    if st.session_state.get('admin_stats') is None:
+        try:
+            res = api_request("GET", "/admin/stats", headers=headers)
+            if res.status_code == 200:
+                st.session_state.admin_stats = res.json()
+        except requests.exceptions.RequestException:
+            pass
+    return st.session_state.get('admin_stats')
 
-    return f"""
-        <style>
-            .membership-card {{
-                max-width: 600px !important; /* 카드 너비 확대 */
-            }}
-        </style>
-        <div class="membership-card">
-            <div class="card-header">
-                <div class="card-chip"></div>
-                <div style="text-align: right;">
-                    <div class="card-logo">DIGITAL MEMBER</div>
-                    {ku_logo_html}
-                </div>
-            </div>
-            <div class="card-body">
-                <div class="card-label">NAME</div>
-                <h2>{info['name']}</h2>
-                <div class="card-label">STUDENT ID</div>
-                <p class="student-id">{info['student_id']}</p>
-            </div>
-            <div class="card-footer">
-                <p class="club">{club_html}</p>
-            </div>
-        </div>
+def load_admin_clubs(headers):
+    stats = load_admin_stats(headers)
+    return stats['clubs'] if stats else []
+
+# --- 헬퍼 함수: 관리자 회원 목록 (서버 페이지네이션) ---
+MEMBER_PAGE_CACHE_SIZE = 50 # 세션별로 보관할 조회 결과(페이지) 수
+TAB4_MEMBER_LIMIT = 200 # 개별 회원 관리 탭에서 한 번에 불러올 최대 회원 수
+
+def fetch_member_page(headers, limit=50, cursor=None, **filters):
+    """
+    /admin/members 한 페이지 조회. 같은 조건은 세션 캐시를 사용하여 rerun마다 다시 요청하지 않음
+    (회원 정보를 바꾸는 작업 후에는 invalidate_member_pages() 호출)
+    """
+    params = {"limit": limit}
+    params.update({k: v for k, v in filters.items() if v})
+    if cursor:
+        params["cursor"] = cursor
+
+    cache = st.session_state.setdefault('member_page_cache', {})
+    key = json.dumps(params, sort_keys=True, ensure_ascii=False)
+    if key not in cache:
+        res = api_request("GET", "/admin/members", headers=headers, params=params)
+        res.raise_for_status()
+        cache[key] = res.json()
+        while len(cache) > MEMBER_PAGE_CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+    return cache[key]
+
+def fetch_all_members(headers, **filters):
+    # CSV 다운로드용: 조건에 맞는 회원을 큰 페이지 단위로 모두 조회 (캐시하지 않음)
+    members, cursor = [], None
+    while True:
+        params = {"limit": 500}
+        params.update({k: v for k, v in filters.items() if v})
+        if cursor:
+            params["cursor"] = cursor
+        res = api_request("GET", "/admin/members", headers=headers, params=params)
+        res.raise_for_status()
+        page = res.json()
+        members.extend(page['items'])
+        cursor = page['next_cursor']
+        if not cursor:
+            return members
+
+def invalidate_member_pages():
+    st.session_state.member_page_cache = {}
+    st.session_state.admin_stats = None
+
+# --- 헬퍼 함수: 자유 소통방 메시지 ---
+def sync_chat_messages(headers):
+    """
+    [최적화] 처음에는 최근 메시지만 불러오고, 이후 rerun에서는 마지막 메시지 id 이후의 새 메시지와
+    화면에 있는 범위에서 삭제된 메시지 id만 서버에서 받아 세션의 목록에 반영
     """
+    chat = st.session_state.get('chat_messages')
+    params = {"after_id": chat[-1]['id'], "window_start": chat[0]['id'], "limit": 200} if chat else {}
+    try:
+        res = api_request("GET", "/chat/messages", headers=headers, params=params)
+    except requests.exceptions.RequestException:
+        return chat or []
+    if res.status_code != 200:
+        return chat or []
+
+    page = res.json()
+    if chat:
+        deleted = set(page['deleted_ids'])
+        chat = [m for m in chat if m['id'] not in deleted] + page['items']
+    else:
+        chat = page['items']
+        st.session_state.chat_has_more = page['has_more']
+    st.session_state.chat_messages = chat
+    return chat
+
+def load_older_chat_messages(headers):
+    # 이전 기록 더 보기: 화면에 있는 가장 오래된 메시지 이전의 메시지를 앞에 붙임
+    chat = st.session_state.get('chat_messages') or []
+    params = {"before_id": chat[0]['id']} if chat else {}
+    res = api_request("GET", "/chat/messages", headers=headers, params=params)
+    if res.status_code == 200:
+        page = res.json()
+        st.session_state.chat_messages = page['items'] + chat
+        st.session_state.chat_has_more = page['has_more']
+
+def format_chat_time(created_at):
+    if not created_at:
+        return ""
+    return datetime.fromisoformat(created_at).strftime("%m/%d %H:%M")
+
+# --- 헬퍼 함수: 회원증 HTML 생성 (재사용 목적) ---
+def get_card_html(info, is_preview=False):
+    # [최적화] cards.py의 템플릿/캐시 사용 (같은 회원 정보의 카드는 다시 만들지 않음)
+    return render_card(info['name'], info['student_id'], info.get('club') or '', asset_src("ku-logo"))
 
 # --- 페이지 로직 ---
 
@@ -290,9 +398,9 @@ def show_login_page():
         c1, c2, c3 = st.columns([1, 2, 1])
         with c2:
             # 로고에 애니메이션 클래스 적용을 위해 HTML로 렌더링
-            encoded_logo = load_base64_image("logo.png")
-            if encoded_logo:
-                st.markdown(f'<img src="data:image/png;base64,{encoded_logo}" class="login-logo">', unsafe_allow_html=True)
+            logo_src = asset_src("logo")
+            if logo_src:
+                st.markdown(f'<img src="{logo_src}" class="login-logo">', unsafe_allow_html=True)
             else:
                 st.image(logo_image, use_container_width=True)
         
@@ -310,9 +418,8 @@ def show_login_page():
                 # [UX 개선] 서버 응답 대기 중 로딩 표시 추가
                 with st.spinner("서버에 접속 중입니다... (무료 서버가 깨어나는 데 최대 1분 소요될 수 있습니다)"):
                     try:
-                        response = requests.post(
-                            f"{API_URL}/token",
-                            data={"username": student_id, "password": password}
+                        response = api_request("POST", "/token",
+                            data={"username": student_id, "password": password}, logout_on_401=False
                         )
                         if response.status_code == 200:
                             token = response.json()['access_token']
@@ -322,12 +429,12 @@ def show_login_page():
                             role = "member"
                             try:
                                 headers = {"Authorization": f"Bearer {token}"}
-                                me_res = requests.get(f"{API_URL}/members/me", headers=headers)
+                                me_res = api_request("GET", "/members/me", headers=headers)
                                 if me_res.status_code == 200:
                                     user_info = me_res.json()
                                     user_name = user_info['name']
                                     role = user_info.get('role', 'member')
-                            except:
+                            except requests.exceptions.RequestException:
                                 pass
 
                             # 로그인 만료 시간 설정 (관리자, 회원 모두 10분)
@@ -343,8 +450,8 @@ def show_login_page():
 
                                 # [수정] 폼 내부가 아닌 외부 placeholder에 애니메이션 렌더링
                                 with animation_placeholder:
-                                    anim_logo = load_base64_image("logo.png")
-                                    img_tag = f'<img src="data:image/png;base64,{anim_logo}" style="width: 200px; animation: zoomOutLogo 0.6s cubic-bezier(0.19, 1, 0.22, 1) forwards;">' if anim_logo else ""
+                                    anim_logo = asset_src("logo")
+                                    img_tag = f'<img src="{anim_logo}" style="width: 200px; animation: zoomOutLogo 0.6s cubic-bezier(0.19, 1, 0.22, 1) forwards;">' if anim_logo else ""
                                     st.markdown(f"""
                                         <div style="
                                             position: fixed;
@@ -374,7 +481,7 @@ def show_login_page():
                                         </style>
                                     """, unsafe_allow_html=True)
                                 time.sleep(0.7) 
-                            except:
+                            except Exception:
                                 pass
 
                             st.session_state.token = token
@@ -386,6 +493,186 @@ def show_login_page():
                         st.error("백엔드 서버에 연결할 수 없습니다. 잠시 후 다시 시도해주세요.")
 
 
+# --- 헬퍼 함수: 명단 일괄 등록 작업 진행률 ---
+@st.fragment(run_every=1.0)
+def show_import_job_progress(job_id, headers):
+    # 대시보드 전체가 아닌 이 영역만 1초마다 다시 실행하여 작업 상태를 조회
+    try:
+        res = api_request("GET", f"/admin/imports/{job_id}", headers=headers)
+    except requests.exceptions.RequestException:
+        st.warning("작업 상태를 확인하는 중입니다... (서버 연결 재시도)")
+        return
+
+    if res.status_code != 200:
+        st.error("등록 작업 정보를 찾을 수 없습니다.")
+        st.session_state.import_job_id = None
+        return
+
+    job = res.json()
+    if job['status'] in ("queued", "running"):
+        total = job.get('total_rows')
+        if total:
+            st.progress(min(job['processed'] / total, 1.0), text=f"등록 진행 중... {job['processed']} / {total}행")
+        else:
+            st.progress(0.0, text="파일을 읽는 중입니다...")
+        st.caption(f"신규 {job['inserted']}명 · 동아리 추가 {job['updated']}명 · 중복 제외 {job['skipped']}명 · 오류 {job['error_count']}행")
+    else:
+        st.session_state.import_job_id = None
+        st.session_state.import_job_result = job
+        st.session_state.upload_idempotency_key = None
+        # 등록된 회원이 목록에 보이도록 캐시된 회원 목록 초기화 (다음 실행 시 다시 불러옴)
+        invalidate_member_pages()
+        st.rerun()
+
+def show_import_job_result(job):
+    if job['status'] == "completed":
+        st.success(f"업로드 성공! {job.get('message') or ''}")
+    else:
+        st.error(f"업로드 실패: {job.get('message')}")
+
+    if job.get('errors'):
+        with st.expander(f"⚠️ 등록되지 않은 행 {job['error_count']}개 보기", expanded=False):
+            st.dataframe(pd.DataFrame(job['errors']).rename(columns={"row": "행 번호", "message": "사유"}), hide_index=True, use_container_width=True)
+
+# --- 동아리 회원증 갤러리 (개별 회원 관리 탭) ---
+CARD_GALLERY_PAGE_SIZES = [6, 12, 24, 48] # 한 페이지에 그릴 회원증 수
+
+def move_gallery_page(cursors, next_cursor=None):
+    # 페이지 이동 버튼 콜백 (다음: 커서 추가, 이전: 마지막 커서 제거)
+    if next_cursor:
+        cursors.append(next_cursor)
+    elif len(cursors) > 1:
+        cursors.pop()
+
+@st.fragment
+def show_card_gallery(headers, club):
+    """
+    [최적화] 동아리 회원증 갤러리
+    펼쳤을 때만 현재 페이지의 회원증만 그리고, 페이지 이동은 이 영역만 다시 실행
+    """
+    with st.expander(f"🖼️ '{club}' 소속 회원증 한눈에 보기", expanded=False):
+        col_toggle, col_size = st.columns([3, 1])
+        with col_toggle:
+            show = st.toggle("회원증 불러오기", key="gallery_show")
+        with col_size:
+            page_size = st.selectbox("페이지당 회원증 수", CARD_GALLERY_PAGE_SIZES, index=1, key="gallery_page_size")
+        if not show:
+            return
+
+        gallery_sig = json.dumps([club, page_size], ensure_ascii=False)
+        if st.session_state.get('gallery_sig') != gallery_sig:
+            # 동아리나 페이지 크기가 바뀌면 첫 페이지부터
+            st.session_state.gallery_sig = gallery_sig
+            st.session_state.gallery_cursors = [None]
+        cursors = st.session_state.gallery_cursors
+
+        try:
+            page = fetch_member_page(headers, limit=page_size, cursor=cursors[-1], club=[club])
+        except requests.exceptions.RequestException:
+            st.error("서버 연결 실패")
+            return
+
+        cols = st.columns(2) # 2열로 회원증 나열
+        for i, col in enumerate(cols):
+            with col:
+                st.markdown("".join(get_card_html(m, is_preview=True) for m in page['items'][i::2]), unsafe_allow_html=True)
+
+        col_prev, col_info, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            st.button("◀ 이전", disabled=len(cursors) == 1, key="gallery_prev", on_click=move_gallery_page, args=(cursors,))
+        with col_info:
+            total_pages = max(1, -(-page['total'] // page_size))
+            st.caption(f"총 {page['total']}명 · {len(cursors)}/{total_pages}페이지")
+        with col_next:
+            st.button("다음 ▶", disabled=not page['next_cursor'], key="gallery_next", on_click=move_gallery_page, args=(cursors, page['next_cursor']))
+
+# --- 학기 명단 동기화 미리보기 (명단 일괄 등록 탭) ---
+SYNC_KIND_LABELS = {"added": "추가", "removed": "제외", "changed": "변경"}
+UPLOAD_PREVIEW_ROWS = 5 # 업로드 전 미리보기/열 선택에 읽는 행 수
+SHEET_TITLE_OPTION = "(시트 이름 사용)"
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def read_upload_preview(file_id, _uploaded_file):
+    """업로드 파일의 시트별 상위 행 {시트 이름: DataFrame} (CSV는 {None: DataFrame}). 같은 파일은 다시 읽지 않음"""
+    if _uploaded_file.name.endswith('.csv'):
+        return {None: pd.read_csv(_uploaded_file, nrows=UPLOAD_PREVIEW_ROWS)}
+    with pd.ExcelFile(_uploaded_file) as workbook:
+        return {sheet: workbook.parse(sheet, nrows=UPLOAD_PREVIEW_ROWS) for sheet in workbook.sheet_names}
+
+def select_roster_columns(df, key, sheet_title=False):
+    """이름/학번/소속 열 선택 -> 서버에 보낼 열 번호 (sheet_title이면 소속 열 대신 시트 이름 사용 가능)"""
+    cols = df.columns.tolist()
+    club_options = cols + [SHEET_TITLE_OPTION] if sheet_title else cols
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        name_col = st.selectbox("이름이 있는 열", cols, index=0, key=f"{key}_name")
+    with c2:
+        sid_col = st.selectbox("학번이 있는 열", cols, index=1 if len(cols) > 1 else 0, key=f"{key}_sid")
+    with c3:
+        club_col = st.selectbox("소속이 있는 열", club_options, index=2 if len(cols) > 2 else (len(club_options) - 1 if sheet_title else 0), key=f"{key}_club")
+    return {
+        "name_col": cols.index(name_col),
+        "sid_col": cols.index(sid_col),
+        "club_col": None if club_col == SHEET_TITLE_OPTION else cols.index(club_col),
+    }
+
+def show_roster_sync_preview(headers):
+    preview = st.session_state.get('roster_sync_preview')
+    if not preview:
+        return
+
+    st.caption(f"대상 동아리: {', '.join(preview['clubs'])}")
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("추가", f"{preview['added']}명")
+    c2.metric("제외", f"{preview['removed']}명")
+    c3.metric("변경", f"{preview['changed']}명")
+    c4.metric("유지", f"{preview['unchanged']}명")
+    if preview['error_count']:
+        with st.expander(f"⚠️ 읽지 못한 행 {preview['error_count']}개 보기", expanded=False):
+            st.dataframe(pd.DataFrame(preview['errors']).rename(columns={"row": "행 번호", "message": "사유"}), hide_index=True, use_container_width=True)
+
+    changes = preview['changes']
+    if not changes:
+        st.success("명단과 현재 소속이 같습니다. 변경할 내용이 없습니다.")
+        return
+
+    df_changes = pd.DataFrame([
+        {
+            "구분": SYNC_KIND_LABELS.get(c['kind'], c['kind']),
+            "학번": c['student_id'],
+            "이름": c['name'],
+            "변경 전": ", ".join(c['before']),
+            "변경 후": ", ".join(c['after']) or "(소속 없음)",
+        }
+        for c in changes
+    ])
+    st.dataframe(df_changes, hide_index=True, use_container_width=True)
+    total_changes = preview['added'] + preview['removed'] + preview['changed']
+    if len(changes) < total_changes:
+        st.caption(f"변경 대상 {total_changes}명 중 {len(changes)}명만 표시됩니다.")
+
+    delete_members = False
+    if preview['deletable']:
+        delete_members = st.checkbox(f"소속 동아리가 하나도 남지 않는 회원 {preview['deletable']}명은 회원 정보도 삭제")
+
+    if st.button("변경 사항 적용", type="primary", key="roster_sync_apply"):
+        try:
+            res = api_request(
+                "POST", f"/admin/roster-sync/{preview['token']}/apply",
+                headers=headers, params={"delete_members": str(delete_members).lower()}, timeout=API_UPLOAD_TIMEOUT,
+            )
+            if res.status_code == 200:
+                st.session_state.roster_sync_preview = None
+                invalidate_member_pages()
+                st.session_state.admin_stats = None
+                st.success(res.json()['message'])
+            else:
+                if res.status_code in (404, 409):
+                    st.session_state.roster_sync_preview = None
+                st.error(f"적용 실패: {res.json().get('detail')}")
+        except requests.exceptions.RequestException:
+            st.error("서버 연결 실패")
+
 # 1.5 관리자 대시보드 (신규 추가)
 def show_admin_dashboard():
     st.title("🛡️ 관리자 대시보드")
@@ -393,108 +680,116 @@ def show_admin_dashboard():
     
     headers = {"Authorization": f"Bearer {st.session_state.token}"}
 
-    # [기능 추가] 데이터 자동 로드 및 통계 위젯 표시
-    if 'admin_member_list' not in st.session_state or not st.session_state.admin_member_list:
-        try:
-            res = requests.get(f"{API_URL}/admin/members", headers=headers)
-            if res.status_code == 200:
-                st.session_state.admin_member_list = res.json()
-        except:
-            pass
-            
-    if st.session_state.get('admin_member_list'):
-        df_stats = pd.DataFrame(st.session_state.admin_member_list)
-        
-        # [수정] 차트 및 통계를 위해 데이터 분리 및 완벽 정제
-        def get_clean_clubs_for_stats(club_str):
-            if pd.isnull(club_str) or str(club_str).strip() == "": return []
-            import re
-            clean_str = str(club_str).replace('[', '').replace(']', '').replace("'", "").replace('"', '')
-            # 쉼표(,), 전각 쉼표(，), 슬래시(/), 앰퍼샌드(&), 더하기(+) 등 다양한 기호로 확실히 분리
-            clubs = re.split(r'[,，/&+]', clean_str)
-            # 앞뒤 공백을 완벽히 제거(strip)하여 동일한 동아리가 공백 때문에 두 번 세어지는 현상 방지
-            return list(set(c.strip() for c in clubs if c.strip() and c.strip().lower() not in ["소속없음", "소속 없음", "none", "null"]))
-            
-        exploded_clubs = df_stats['club'].apply(get_clean_clubs_for_stats).explode().dropna()
-
+    # [기능 추가] 통계 위젯 표시 (서버 집계 결과 한 번만 요청)
+    stats = load_admin_stats(headers)
+    if stats:
         c1, c2, c3, c4 = st.columns(4)
-        c1.metric("총 회원 수", f"{len(df_stats)}명")
-        c2.metric("활동 회원", f"{len(df_stats[df_stats['status'] == 'active'])}명")
-        c3.metric("관리자", f"{len(df_stats[df_stats['role'] == 'admin'])}명")
-        c4.metric("등록 동아리", f"{exploded_clubs.nunique()}개")
+        c1.metric("총 회원 수", f"{stats['total']}명")
+        c2.metric("활동 회원", f"{stats['active']}명")
+        c3.metric("관리자", f"{stats['admins']}명")
+        c4.metric("등록 동아리", f"{stats['club_count']}개")
         st.markdown("---")
         
         # [기능 추가] 등록된 전체 동아리 목록 작게 표시 (접이식 메뉴)
         with st.expander("📋 등록된 전체 동아리 목록 보기", expanded=False):
-            unique_clubs = sorted(exploded_clubs.unique().tolist())
-            st.caption(", ".join(unique_clubs))
+            st.caption(", ".join(c['name'] for c in stats['clubs']))
+            st.caption(" · ".join(f"{d['division']} {d['member_count']}명" for d in stats['divisions']))
+    else:
+        st.error("통계 정보를 불러올 수 없습니다.")
+
+    # 회원증 HTML 캐시 상태 (cards.py, 이 Streamlit 서버 프로세스 기준)
+    card_stats = card_cache_stats()
+    card_lookups = card_stats['hits'] + card_stats['misses']
+    hit_rate = f"{card_stats['hits'] / card_lookups:.0%}" if card_lookups else "-"
+    st.caption(
+        f"회원증 캐시: {card_stats['size']}/{card_stats['maxsize']}개 · "
+        f"적중 {card_stats['hits']}회 · 생성 {card_stats['misses']}회 · 적중률 {hit_rate}"
+    )
 
     # 탭으로 기능 분리
     tab1, tab2, tab3, tab4, tab5 = st.tabs(["👥 전체 회원 조회", "📂 명단 일괄 등록", "➕ 신규 회원 등록", "⚙️ 개별 회원 관리", "📢 공지사항 관리"])
 
     with tab1:
         if st.button("회원 목록 새로고침"):
-            try:
-                res = requests.get(f"{API_URL}/admin/members", headers=headers)
-                if res.status_code == 200:
-                    st.session_state.admin_member_list = res.json()
-                else:
-                    st.error("데이터를 불러올 수 없습니다.")
-            except requests.exceptions.RequestException:
-                st.error("서버 연결 실패")
+            invalidate_member_pages()
+
+        # [기능 추가] 동아리 필터링 (동아리 목록과 분과는 서버의 clubs 테이블 기준)
+        club_list = load_admin_clubs(headers)
+        all_clubs = [c['name'] for c in club_list]
+        club_division = {c['name']: c['division'] for c in club_list}
         
-        if st.session_state.admin_member_list:
-            # 데이터프레임 생성
-            df = pd.DataFrame(st.session_state.admin_member_list)
-
-            # [기능 추가] 동아리 필터링
-            all_clubs = set()
-            for clubs_str in df['club'].dropna():
-                for c in str(clubs_str).split(','):
-                    if c.strip(): all_clubs.add(c.strip())
-            all_clubs = sorted(list(all_clubs))
-            
-            # [기능 추가] 분과 필터링 적용
-            available_divisions = sorted(list(set(get_division(c) for c in all_clubs)))
-            
-            col_div, col_club = st.columns(2)
-            with col_div:
-                selected_division = st.selectbox("분과별 보기", options=["전체 분과"] + available_divisions)
+        # [기능 추가] 분과 필터링 적용
+        available_divisions = sorted(set(club_division.values()))
+        
+        col_div, col_club = st.columns(2)
+        with col_div:
+            selected_division = st.selectbox("분과별 보기", options=["전체 분과"] + available_divisions)
+        
+        filtered_clubs_by_div = all_clubs
+        if selected_division != "전체 분과":
+            filtered_clubs_by_div = [c for c in all_clubs if club_division[c] == selected_division]
             
-            filtered_clubs_by_div = all_clubs
-            if selected_division != "전체 분과":
-                filtered_clubs_by_div = [c for c in all_clubs if get_division(c) == selected_division]
-                
-            with col_club:
-                selected_clubs = st.multiselect("동아리별 보기", options=filtered_clubs_by_div, placeholder="해당 분과의 전체 동아리")
-                
-            # 필터링 적용
-            if selected_clubs:
-                mask = df['club'].apply(lambda x: any(c in [cs.strip() for cs in str(x).split(',')] for c in selected_clubs) if pd.notnull(x) else False)
-                df = df[mask]
-            elif selected_division != "전체 분과":
-                mask = df['club'].apply(lambda x: any(get_division(c.strip()) == selected_division for c in str(x).split(',')) if pd.notnull(x) else False)
-                df = df[mask]
-
-            # [기능 추가] 엑셀(CSV) 다운로드 버튼 (필터링된 결과 반영)
-            csv = df.to_csv(index=False).encode('utf-8-sig')
-            st.download_button(
-                label="📥 회원 명단 다운로드 (CSV)",
-                data=csv,
-                file_name=f"members_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv"
-            )
+        with col_club:
+            selected_clubs = st.multiselect("동아리별 보기", options=filtered_clubs_by_div, placeholder="해당 분과의 전체 동아리")
+
+        col_search, col_size = st.columns([3, 1])
+        with col_search:
+            search_tab1 = st.text_input("🔍 이름 또는 학번 검색 (앞부분 일치)", key="tab1_search")
+        with col_size:
+            page_size = st.selectbox("페이지당 인원", [50, 100, 200], key="tab1_page_size")
+
+        # [최적화] 필터링/정렬/페이지 나누기는 서버에서 처리하고 현재 페이지만 받아옴
+        member_filters = {
+            "q": search_tab1.strip(),
+            "club": selected_clubs,
+            "division": selected_division if selected_division != "전체 분과" and not selected_clubs else None,
+            "sort": "club",
+        }
+        filter_sig = json.dumps([member_filters, page_size], ensure_ascii=False)
+        if st.session_state.get('tab1_filter_sig') != filter_sig:
+            # 조건이 바뀌면 첫 페이지부터 다시 조회
+            st.session_state.tab1_filter_sig = filter_sig
+            st.session_state.tab1_cursors = [None]
+            st.session_state.tab1_export = None
+        cursors = st.session_state.tab1_cursors
+
+        try:
+            page = fetch_member_page(headers, limit=page_size, cursor=cursors[-1], **member_filters)
+        except requests.exceptions.RequestException:
+            st.error("서버 연결 실패")
+            page = None
+
+        if page is not None:
+            # 데이터프레임 생성
+            df = pd.DataFrame(page['items'], columns=["name", "student_id", "club", "status", "role"])
+
+            # [기능 추가] 엑셀(CSV) 다운로드 버튼 (필터링된 전체 결과 반영, 요청 시에만 전체 조회)
+            if st.session_state.get('tab1_export') is None:
+                if st.button("📥 회원 명단 다운로드 준비 (CSV)"):
+                    try:
+                        all_members = fetch_all_members(headers, **member_filters)
+                        st.session_state.tab1_export = pd.DataFrame(all_members).to_csv(index=False).encode('utf-8-sig')
+                        st.rerun()
+                    except requests.exceptions.RequestException:
+                        st.error("서버 연결 실패")
+            else:
+                st.download_button(
+                    label="📥 회원 명단 다운로드 (CSV)",
+                    data=st.session_state.tab1_export,
+                    file_name=f"members_{datetime.now().strftime('%Y%m%d')}.csv",
+                    mime="text/csv"
+                )
 
             # [기능 개선] 여러 동아리에 소속된 경우 데이터 표에서 행(row)을 분리하여 각 동아리별로 표시
             df_display = df.copy()
-            df_display['club'] = df_display['club'].apply(lambda x: [c.strip() for c in str(x).split(',')] if pd.notnull(x) and str(x).strip() else ["소속없음"])
+            df_display['club'] = df_display['club'].apply(lambda x: split_clubs(x) if pd.notnull(x) and split_clubs(x) else ["소속없음"])
             df_display = df_display.explode('club')
             
             # 필터가 선택된 상태라면 선택한 동아리(또는 분과) 행만 화면에 표시
             if selected_clubs:
                 df_display = df_display[df_display['club'].isin(selected_clubs)]
             elif selected_division != "전체 분과":
-                df_display = df_display[df_display['club'].apply(lambda c: get_division(c) == selected_division)]
+                df_display = df_display[df_display['club'].apply(lambda c: club_division.get(c) == selected_division)]
 
             # 선택 컬럼 추가 (화면 표시용)
             df_display.insert(0, "선택", False)
@@ -510,14 +805,27 @@ def show_admin_dashboard():
                 use_container_width=True,
                 key="member_list_editor"
             )
+
+            # [기능 추가] 페이지 이동
+            col_prev, col_info, col_next = st.columns([1, 2, 1])
+            with col_prev:
+                if st.button("◀ 이전", disabled=len(cursors) == 1, key="tab1_prev"):
+                    cursors.pop()
+                    st.rerun()
+            with col_info:
+                st.caption(f"총 {page['total']}명 · {len(cursors)}페이지")
+            with col_next:
+                if st.button("다음 ▶", disabled=not page['next_cursor'], key="tab1_next"):
+                    cursors.append(page['next_cursor'])
+                    st.rerun()
             
             # 선택된 회원 필터링
             selected_rows = edited_df[edited_df["선택"]]
             
             if not selected_rows.empty:
                 st.markdown("---")
-                if st.button(f"선택한 {len(selected_rows)}명 삭제하기", type="primary", key="delete_selected_btn"):
-                    st.session_state['delete_confirm_targets'] = selected_rows['student_id'].tolist()
+                if st.button(f"선택한 {len(selected_rows['student_id'].unique())}명 삭제하기", type="primary", key="delete_selected_btn"):
+                    st.session_state['delete_confirm_targets'] = selected_rows['student_id'].unique().tolist()
             
             # 삭제 확인 및 처리
             if st.session_state.get('delete_confirm_targets'):
@@ -526,15 +834,22 @@ def show_admin_dashboard():
                 col_yes, col_no = st.columns(2)
                 with col_yes:
                     if st.button("✅ 예, 일괄 삭제", key="confirm_yes_bulk"):
-                        success_cnt = 0
-                        for tid in targets:
-                            try:
-                                requests.delete(f"{API_URL}/admin/members/{tid}", headers=headers)
-                                success_cnt += 1
-                            except: pass
-                        
-                        st.success(f"{success_cnt}명 삭제 완료.")
-                        st.session_state.admin_member_list = [m for m in st.session_state.admin_member_list if m['student_id'] not in targets]
+                        # [최적화] 회원마다 요청하지 않고 일괄 처리 API로 한 번에 삭제
+                        try:
+                            res = api_request("POST", "/admin/members/batch", headers=headers,
+                                                json={"action": "delete", "student_ids": targets})
+                            if res.status_code == 200:
+                                batch = res.json()
+                                st.success(f"{batch['succeeded']}명 삭제 완료.")
+                                if batch['failed']:
+                                    failed_ids = [r['student_id'] for r in batch['results'] if not r['ok']]
+                                    st.warning(f"{batch['failed']}명은 삭제하지 못했습니다: {', '.join(failed_ids)}")
+                            else:
+                                st.error(f"삭제 실패: {res.json().get('detail')}")
+                        except Exception as e:
+                            st.error(f"서버 연결 오류: {e}")
+
+                        invalidate_member_pages()
                         del st.session_state['delete_confirm_targets']
                         time.sleep(0.5) # 삭제 후 대기 시간 단축
                         st.rerun()
@@ -551,54 +866,99 @@ def show_admin_dashboard():
         if uploaded_file:
             try:
                 # 1. 파일 읽기 (Pandas 활용)
-                if uploaded_file.name.endswith('.csv'):
-                    df = pd.read_csv(uploaded_file)
-                else:
-                    df = pd.read_excel(uploaded_file)
+                # [최적화] 미리보기와 열 선택에 필요한 상위 행만 읽음 (전체 명단은 서버에서 한 번만 읽음)
+                previews = read_upload_preview(uploaded_file.file_id, uploaded_file)
+                is_csv = uploaded_file.name.endswith('.csv')
+                # 열이 하나도 없는 빈 시트는 제외
+                sheet_names = [name for name, df in previews.items() if len(df.columns) > 0]
                 
-                st.write("▼ 파일 미리보기 (상위 5개 행)")
-                st.dataframe(df.head(), use_container_width=True)
+                # [기능 추가] 여러 시트 엑셀 파일: 등록할 시트 선택 (시트마다 열을 따로 지정, 서버에서 동시에 읽음)
+                club_from_title = False
+                if len(sheet_names) > 1:
+                    selected_sheets = st.multiselect("등록할 시트", sheet_names, default=sheet_names, key=f"upload_sheets_{uploaded_file.file_id}")
+                    club_from_title = st.checkbox(
+                        "시트 이름을 소속 동아리로 사용",
+                        help="소속 열 대신 시트 이름을 동아리 이름으로 등록합니다. 소속 열을 지정한 경우에도 소속 칸이 비어 있는 행은 시트 이름을 사용합니다.",
+                    )
+                else:
+                    selected_sheets = sheet_names
                 
                 # 2. 컬럼 매핑 UI
-                st.subheader("컬럼 연결 (Mapping)")
-                cols = df.columns.tolist()
-                
-                c1, c2, c3 = st.columns(3)
-                with c1:
-                    name_col = st.selectbox("이름이 있는 열", cols, index=0 if len(cols) > 0 else 0)
-                with c2:
-                    sid_col = st.selectbox("학번이 있는 열", cols, index=1 if len(cols) > 1 else 0)
-                with c3:
-                    club_col = st.selectbox("소속이 있는 열", cols, index=2 if len(cols) > 2 else 0)
+                mappings = {}
+                for sheet in selected_sheets:
+                    df = previews[sheet]
+                    key = f"upload_map_{uploaded_file.file_id}_{sheet}"
+                    if len(selected_sheets) > 1:
+                        with st.expander(f"📄 {sheet} (상위 {UPLOAD_PREVIEW_ROWS}개 행)"):
+                            st.dataframe(df, use_container_width=True)
+                            mappings[sheet] = select_roster_columns(df, key, sheet_title=club_from_title)
+                    else:
+                        st.write(f"▼ 파일 미리보기 (상위 {UPLOAD_PREVIEW_ROWS}개 행)")
+                        st.dataframe(df, use_container_width=True)
+                        st.subheader("컬럼 연결 (Mapping)")
+                        mappings[sheet] = select_roster_columns(df, key)
                 
+                # [기능 추가] 등록 방식: 추가 등록(기존 회원 유지) / 학기 명단 동기화(명단에서 빠진 회원 제외)
+                sync_mode = st.radio(
+                    "등록 방식",
+                    ["추가 등록", "학기 명단 동기화"],
+                    horizontal=True,
+                    help="학기 명단 동기화: 파일에 나온 동아리의 현재 소속 회원과 비교하여, 명단에서 빠진 회원은 해당 동아리에서 제외합니다. 적용 전에 변경 사항을 미리 확인할 수 있습니다.",
+                )
+
+                def build_roster_upload():
+                    # [최적화] 원본 파일을 그대로 보내고 열 위치만 지정 (CSV로 다시 변환하지 않음)
+                    # 미리보기의 첫 행은 열 제목으로 읽었으므로 서버에서도 헤더 행 1개를 건너뜀
+                    files = {"file": (uploaded_file.name, uploaded_file.getvalue(), uploaded_file.type)}
+                    # 시트가 하나뿐인 파일은 열 지정만 보냄 (서버는 활성 시트를 바로 읽음)
+                    # 여러 시트 중 일부를 고르거나 시트 이름을 소속 동아리로 쓸 때만 시트별 지정을 보냄
+                    if is_csv or (len(previews) == 1 and not club_from_title):
+                        return files, {**mappings[selected_sheets[0]], "header_rows": 1}
+                    sheets = [
+                        {"sheet": sheet, **mappings[sheet], "header_rows": 1, "club_from_title": club_from_title}
+                        for sheet in selected_sheets
+                    ]
+                    return files, {"sheets": json.dumps(sheets, ensure_ascii=False)}
+
+                if not selected_sheets:
+                    st.warning("등록할 시트를 선택해주세요.")
+                elif sync_mode == "학기 명단 동기화":
+                    if st.button("변경 사항 미리보기", type="primary"):
+                        try:
+                            files, data = build_roster_upload()
+                            res = api_request("POST", "/admin/roster-sync", headers=headers, files=files, data=data, timeout=API_UPLOAD_TIMEOUT)
+                            if res.status_code == 200:
+                                st.session_state.roster_sync_preview = res.json()
+                            else:
+                                st.error(f"미리보기 실패: {res.json().get('detail')}")
+                        except requests.exceptions.RequestException:
+                            st.error("서버 연결 실패")
+                    show_roster_sync_preview(headers)
+
                 # 3. 업로드 버튼
-                if st.button("설정된 내용으로 업로드 시작", type="primary"):
-                    # 데이터 정제 (문자열 변환 및 소수점 제거)
-                    new_df = pd.DataFrame()
-                    new_df['name'] = df[name_col].astype(str).str.strip()
-                    # 학번이 숫자로 읽혔을 경우 .0 제거 로직
-                    new_df['sid'] = df[sid_col].apply(lambda x: str(int(x)) if pd.notnull(x) and isinstance(x, float) and x.is_integer() else str(x).strip())
-                    new_df['club'] = df[club_col].astype(str).str.strip()
-                    
-                    # CSV로 변환 (메모리 상에서 처리) - 백엔드는 (이름, 학번, 소속) 순서의 CSV를 기대함
-                    csv_buffer = io.StringIO()
-                    # 헤더 없이 데이터만 전송 (백엔드 로직 단순화)
-                    new_df.to_csv(csv_buffer, index=False, header=False)
-                    csv_bytes = csv_buffer.getvalue().encode('utf-8-sig')
-                    
-                    files = {"file": ("upload.csv", csv_bytes, "text/csv")}
+                elif st.button("설정된 내용으로 업로드 시작", type="primary"):
+                    files, data = build_roster_upload()
+                    # [개선] 같은 파일의 업로드 요청에는 같은 Idempotency-Key 사용 (두 번 클릭하거나 응답 시간 초과 후
+                    # 다시 눌러도 서버는 새 작업을 만들지 않고 기존 작업을 반환). 작업이 끝나면 새 키 사용
+                    upload_source = (uploaded_file.file_id, tuple(data.values()))
+                    upload_key = st.session_state.get('upload_idempotency_key')
+                    if not upload_key or upload_key[0] != upload_source:
+                        upload_key = (upload_source, uuid.uuid4().hex)
+                        st.session_state.upload_idempotency_key = upload_key
                     
                     try:
-                        res = requests.post(f"{API_URL}/admin/upload-csv", headers=headers, files=files)
-                        if res.status_code == 200:
-                            st.success(f"업로드 성공! {res.json().get('message', '')}")
-                        elif res.status_code == 401:
-                            st.error("세션이 만료되었습니다. 다시 로그인해주세요.")
-                            time.sleep(1)
-                            do_logout()
+                        # [개선] 업로드는 작업 ID만 받고 즉시 반환, 진행 상황은 아래에서 주기적으로 조회
+                        res = api_request(
+                            "POST", "/admin/imports",
+                            headers={**headers, "Idempotency-Key": upload_key[1]}, files=files, data=data, timeout=API_UPLOAD_TIMEOUT,
+                        )
+                        if res.status_code == 202:
+                            st.session_state.import_job_id = res.json()['job_id']
+                            st.session_state.import_job_result = None
+                            st.rerun()
                         else:
                             try: err_msg = res.json().get('detail')
-                            except: err_msg = res.text
+                            except ValueError: err_msg = res.text
                             st.error(f"업로드 실패: {err_msg}")
                     except requests.exceptions.RequestException:
                         st.error("서버 연결 실패")
@@ -606,6 +966,12 @@ def show_admin_dashboard():
             except Exception as e:
                 st.error(f"파일을 읽는 중 오류가 발생했습니다: {e}")
 
+        # [기능 추가] 백그라운드 등록 작업 진행률 표시
+        if st.session_state.get('import_job_id'):
+            show_import_job_progress(st.session_state.import_job_id, headers)
+        elif st.session_state.get('import_job_result'):
+            show_import_job_result(st.session_state.import_job_result)
+
     with tab3:
         st.subheader("신규 회원 직접 등록")
         with st.form("add_member_form", clear_on_submit=True):
@@ -619,13 +985,9 @@ def show_admin_dashboard():
             if st.form_submit_button("회원 등록"):
                 if new_sid and new_name and new_club:
                     try:
-                        res = requests.post(f"{API_URL}/admin/members", headers=headers, json={"student_id": new_sid, "name": new_name, "club": new_club})
+                        res = api_request("POST", "/admin/members", headers=headers, json={"student_id": new_sid, "name": new_name, "club": new_club})
                         if res.status_code == 200:
                             st.success(f"✅ {new_name}({new_sid}) 등록 (또는 동아리 추가) 완료!")
-                        elif res.status_code == 401:
-                            st.error("세션이 만료되었습니다. 다시 로그인해주세요.")
-                            time.sleep(1)
-                            do_logout()
                         else:
                             st.error(f"❌ 등록 실패: {res.json().get('detail')}")
                     except requests.exceptions.RequestException:
@@ -634,67 +996,56 @@ def show_admin_dashboard():
                     st.warning("모든 정보를 입력해주세요.")
 
     with tab4:
-        # 회원 목록 데이터가 없으면 로드 시도
-        if not st.session_state.get('admin_member_list'):
-            try:
-                res = requests.get(f"{API_URL}/admin/members", headers=headers)
-                if res.status_code == 200:
-                    st.session_state.admin_member_list = res.json()
-            except:
-                pass
-
-        if st.session_state.get('admin_member_list'):
-            # 개별 동아리 목록 추출
-            all_clubs_tab4 = set()
-            for m in st.session_state.admin_member_list:
-                for c in (m.get('club') or "").split(','):
-                    if c.strip(): all_clubs_tab4.add(c.strip())
-            all_clubs_tab4 = sorted(list(all_clubs_tab4))
-            
-            # [추가] 이름/학번 통합 검색창
-            search_query = st.text_input("🔍 이름 또는 학번 빠른 검색", placeholder="찾으시는 회원의 이름이나 학번을 입력하세요...")
-            st.markdown("---")
-            
-            # [기능 추가] 개별 회원 관리에도 분과 필터 연동
-            available_divisions_tab4 = sorted(list(set(get_division(c) for c in all_clubs_tab4)))
-            
-            col_div_4, col_club_4 = st.columns(2)
-            with col_div_4:
-                selected_division_tab4 = st.selectbox("분과 필터", options=["전체 분과"] + available_divisions_tab4)
-            
-            filtered_clubs_tab4 = all_clubs_tab4
-            if selected_division_tab4 != "전체 분과":
-                filtered_clubs_tab4 = [c for c in all_clubs_tab4 if get_division(c) == selected_division_tab4]
-                
-            with col_club_4:
-                selected_club_tab4 = st.selectbox("동아리 필터", options=["전체 동아리"] + filtered_clubs_tab4)
-                
-            filtered_members = st.session_state.admin_member_list
+        # 개별 동아리 목록 (서버의 clubs 테이블 기준)
+        club_list_tab4 = load_admin_clubs(headers)
+        all_clubs_tab4 = [c['name'] for c in club_list_tab4]
+        club_division_tab4 = {c['name']: c['division'] for c in club_list_tab4}
+        
+        # [추가] 이름/학번 통합 검색창
+        search_query = st.text_input("🔍 이름 또는 학번 빠른 검색", placeholder="찾으시는 회원의 이름이나 학번 앞부분을 입력하세요...")
+        st.markdown("---")
+        
+        # [기능 추가] 개별 회원 관리에도 분과 필터 연동
+        available_divisions_tab4 = sorted(set(club_division_tab4.values()))
+        
+        col_div_4, col_club_4 = st.columns(2)
+        with col_div_4:
+            selected_division_tab4 = st.selectbox("분과 필터", options=["전체 분과"] + available_divisions_tab4)
+        
+        filtered_clubs_tab4 = all_clubs_tab4
+        if selected_division_tab4 != "전체 분과":
+            filtered_clubs_tab4 = [c for c in all_clubs_tab4 if club_division_tab4[c] == selected_division_tab4]
             
-            # 검색어 필터링 우선 적용
-            if search_query.strip():
-                q = search_query.strip().lower()
-                filtered_members = [m for m in filtered_members if q in m['name'].lower() or q in str(m['student_id']).lower()]
-                
-            if selected_division_tab4 != "전체 분과":
-                filtered_members = [m for m in filtered_members if any(get_division(c.strip()) == selected_division_tab4 for c in (m.get('club') or "").split(','))]
-                
-            if selected_club_tab4 != "전체 동아리":
-                filtered_members = [m for m in filtered_members if selected_club_tab4 in [c.strip() for c in (m.get('club') or "").split(',')]]
+        with col_club_4:
+            selected_club_tab4 = st.selectbox("동아리 필터", options=["전체 동아리"] + filtered_clubs_tab4)
+
+        # [최적화] 검색어/분과/동아리 조건은 서버에서 인덱스로 조회
+        try:
+            page_tab4 = fetch_member_page(
+                headers,
+                limit=TAB4_MEMBER_LIMIT,
+                q=search_query.strip(),
+                club=[selected_club_tab4] if selected_club_tab4 != "전체 동아리" else None,
+                division=selected_division_tab4 if selected_division_tab4 != "전체 분과" else None,
+            )
+        except requests.exceptions.RequestException:
+            st.error("서버 연결 실패")
+            page_tab4 = None
+
+        if page_tab4 is not None:
+            filtered_members = page_tab4['items']
+            if page_tab4['next_cursor']:
+                st.caption(f"조건에 맞는 회원 {page_tab4['total']}명 중 {len(filtered_members)}명만 표시됩니다. 검색어나 필터로 범위를 좁혀주세요.")
             
             # [기능 추가] 특정 동아리 선택 시, 해당 동아리 전체 회원증 갤러리 뷰 제공
             if selected_club_tab4 != "전체 동아리" and filtered_members:
-                with st.expander(f"🖼️ '{selected_club_tab4}' 소속 회원증 한눈에 보기", expanded=False):
-                    cols = st.columns(2) # 2열로 회원증 나열
-                    for i, m in enumerate(filtered_members):
-                        with cols[i % 2]:
-                            st.markdown(get_card_html(m, is_preview=True), unsafe_allow_html=True)
+                show_card_gallery(headers, selected_club_tab4)
 
             if filtered_members:
                 # [기능 개선] 여러 동아리에 소속된 경우 콤마로 묶지 않고 각각 분리하여 목록에 표시
                 member_dict = {}
                 for m in filtered_members:
-                    clubs = [c.strip() for c in (m.get('club') or "소속없음").split(',') if c.strip()]
+                    clubs = split_clubs(m.get('club'))
                     if not clubs:
                         clubs = ["소속없음"]
                     
@@ -705,7 +1056,7 @@ def show_admin_dashboard():
                     elif selected_division_tab4 != "전체 분과":
                         # 분과 필터만 적용된 경우, 해당 분과의 동아리만 표시
                         for c in clubs:
-                            if get_division(c) == selected_division_tab4:
+                            if club_division_tab4.get(c) == selected_division_tab4:
                                 label = f"[{c}] {m['name']} ({m['student_id']})"
                                 member_dict[label] = m['student_id']
                     else:
@@ -721,11 +1072,12 @@ def show_admin_dashboard():
                 st.warning("해당 동아리에 등록된 회원이 없습니다.")
                 target_id = None
         else:
+            filtered_members = []
             target_id = st.text_input("관리할 대상 학번")
         
         # [기능 추가] 선택된 회원의 회원증 미리보기
-        if st.session_state.get('admin_member_list') and target_id:
-            target_member = next((m for m in st.session_state.admin_member_list if m['student_id'] == target_id), None)
+        if target_id:
+            target_member = next((m for m in filtered_members if m['student_id'] == target_id), None)
             if target_member:
                 with st.expander("💳 회원증 미리보기 (디자인 확인용)", expanded=False):
                     st.markdown(get_card_html(target_member, is_preview=True), unsafe_allow_html=True)
@@ -736,14 +1088,11 @@ def show_admin_dashboard():
         if st.button("동아리 정보 업데이트"):
             if target_id and new_club_name:
                 try:
-                    res = requests.patch(f"{API_URL}/admin/members/{target_id}/club", 
+                    res = api_request("PATCH", f"/admin/members/{target_id}/club", 
                                          headers=headers, params={"club": new_club_name})
                     if res.status_code == 200:
                         st.success("소속 동아리가 변경되었습니다.")
-                    elif res.status_code == 401:
-                        st.error("세션이 만료되었습니다. 다시 로그인해주세요.")
-                        time.sleep(1)
-                        do_logout()
+                        invalidate_member_pages()
                     else:
                         st.error(f"변경 실패: {res.json().get('detail')}")
                 except requests.exceptions.RequestException:
@@ -757,17 +1106,13 @@ def show_admin_dashboard():
         if st.button("학번 변경 적용"):
             if target_id and new_sid_input:
                 try:
-                    res = requests.patch(f"{API_URL}/admin/members/{target_id}/id", 
+                    res = api_request("PATCH", f"/admin/members/{target_id}/id", 
                                          headers=headers, params={"new_id": new_sid_input})
                     if res.status_code == 200:
                         st.success(f"학번이 '{new_sid_input}'로 변경되었습니다.")
-                        st.session_state.admin_member_list = None # 목록 갱신 유도
+                        invalidate_member_pages() # 목록 갱신 유도
                         time.sleep(1)
                         st.rerun()
-                    elif res.status_code == 401:
-                        st.error("세션이 만료되었습니다. 다시 로그인해주세요.")
-                        time.sleep(1)
-                        do_logout()
                     else:
                         st.error(f"변경 실패: {res.json().get('detail')}")
                 except requests.exceptions.RequestException:
@@ -783,15 +1128,11 @@ def show_admin_dashboard():
         if st.button("권한 변경 적용"):
             if target_id:
                 try:
-                    res = requests.patch(f"{API_URL}/admin/members/{target_id}/role", 
+                    res = api_request("PATCH", f"/admin/members/{target_id}/role", 
                                          headers=headers, params={"role": new_role})
-                    if res.status_code == 200: st.success(f"권한이 '{new_role}'로 변경되었습니다.")
                     if res.status_code == 200: 
                         st.success(f"권한이 '{new_role}'로 변경되었습니다.")
-                    elif res.status_code == 401:
-                        st.error("세션이 만료되었습니다. 다시 로그인해주세요.")
-                        time.sleep(1)
-                        do_logout()
+                        invalidate_member_pages()
                     else: st.error(f"변경 실패: {res.json().get('detail')}")
                 except requests.exceptions.RequestException:
                     st.error("서버 연결 실패")
@@ -802,20 +1143,18 @@ def show_admin_dashboard():
         with col1:
             new_status = st.selectbox("상태 선택", ["active", "inactive"])
             if st.button("상태 변경 적용"):
-                res = requests.patch(f"{API_URL}/admin/members/{target_id}/status", 
+                res = api_request("PATCH", f"/admin/members/{target_id}/status", 
                                      headers=headers, params={"status": new_status})
-                if res.status_code == 200: st.success("변경 완료")
-                elif res.status_code == 401:
-                    do_logout()
+                if res.status_code == 200:
+                    st.success("변경 완료")
+                    invalidate_member_pages()
                 else: st.error("변경 실패")
         with col2:
             if st.button("비밀번호 초기화 ('1234')"):
                 if target_id:
-                    res = requests.patch(f"{API_URL}/admin/members/{target_id}/reset-password", headers=headers)
+                    res = api_request("PATCH", f"/admin/members/{target_id}/reset-password", headers=headers)
                     if res.status_code == 200:
                         st.success(f"{target_id}의 비밀번호가 '1234'로 초기화되었습니다.")
-                    elif res.status_code == 401:
-                        do_logout()
                     else:
                         st.error(f"초기화 실패: {res.json().get('detail')}")
                 else:
@@ -833,14 +1172,13 @@ def show_admin_dashboard():
                 with col_yes:
                     if st.button("✅ 예, 삭제합니다", key="confirm_yes_tab4"):
                         try:
-                            res = requests.delete(f"{API_URL}/admin/members/{st.session_state['delete_confirm_target_tab4']}", headers=headers)
+                            res = api_request("DELETE", f"/admin/members/{st.session_state['delete_confirm_target_tab4']}", headers=headers)
                             if res.status_code == 200: 
                                 st.success("삭제 완료")
+                                invalidate_member_pages()
                                 del st.session_state['delete_confirm_target_tab4']
                                 time.sleep(0.3) # 삭제 후 대기 시간 단축
                                 st.rerun()
-                            elif res.status_code == 401:
-                                do_logout()
                             else: 
                                 st.error(f"삭제 실패: {res.json().get('detail')}")
                         except requests.exceptions.RequestException:
@@ -854,20 +1192,239 @@ def show_admin_dashboard():
         st.subheader("📢 실 바 공지사항 배너 설정")
         st.info("여기에 입력한 공지사항이 모든 회원의 스마트폰 회원증 상단에 실시간 전광판처럼 노출됩니다.")
         
-        current_notice = ""
-        if os.path.exists("notice.txt"):
-            with open("notice.txt", "r", encoding="utf-8") as f:
-                current_notice = f.read()
+        # [개선] 공지사항은 백엔드 DB에 버전별로 저장하고, 변경 시 접속 중인 회원증 화면에 실시간(SSE)으로 전달
+        current_notice = load_notice(headers)
                 
         with st.form("notice_form"):
-            new_notice = st.text_area("공지사항 내용 (내용을 모두 지우면 배너가 사라집니다)", value=current_notice, placeholder="예: 이번 주 금요일 총동아리연합회 전체 회의가 있습니다.", height=100)
+            new_notice = st.text_area("공지사항 내용 (내용을 모두 지우면 배너가 사라집니다)", value=current_notice['text'], placeholder="예: 이번 주 금요일 총동아리연합회 전체 회의가 있습니다.", height=100)
+            # [기능 추가] 예약 게시
+            schedule = st.checkbox("예약 게시 (지정한 시각에 배너 변경)")
+            col_date, col_time = st.columns(2)
+            with col_date:
+                publish_date = st.date_input("게시 날짜", value=datetime.now().date())
+            with col_time:
+                publish_time = st.time_input("게시 시각", value=(datetime.now() + timedelta(hours=1)).replace(minute=0, second=0, microsecond=0).time())
             if st.form_submit_button("공지사항 적용 및 배포", type="primary"):
-                with open("notice.txt", "w", encoding="utf-8") as f:
-                    f.write(new_notice.strip())
-                st.success("✅ 공지사항이 성공적으로 업데이트되었습니다! 회원증 화면에 즉시 반영됩니다.")
-                time.sleep(1)
+                payload = {"text": new_notice}
+                if schedule:
+                    payload["publish_at"] = datetime.combine(publish_date, publish_time).astimezone().isoformat()
+                try:
+                    res = api_request("PUT", "/admin/notice", headers=headers, json=payload)
+                    if res.status_code == 200:
+                        saved = res.json()
+                        if schedule and datetime.fromisoformat(saved['publish_at']) > datetime.now():
+                            st.success(f"✅ 공지사항(v{saved['version']})이 {format_chat_time(saved['publish_at'])}에 게시되도록 예약되었습니다.")
+                        else:
+                            st.success("✅ 공지사항이 성공적으로 업데이트되었습니다! 회원증 화면에 즉시 반영됩니다.")
+                        time.sleep(1)
+                        st.rerun()
+                    else:
+                        st.error(f"공지사항 변경 실패: {res.json().get('detail')}")
+                except requests.exceptions.RequestException:
+                    st.error("서버 연결 실패")
+
+        # [기능 추가] 공지사항 수정 기록
+        with st.expander("공지사항 수정 기록"):
+            try:
+                res = api_request("GET", "/admin/notices", headers=headers)
+                history = res.json() if res.status_code == 200 else []
+            except requests.exceptions.RequestException:
+                history = []
+            if history:
+                st.dataframe(pd.DataFrame([{
+                    "버전": n['version'],
+                    "내용": n['text'] or "(배너 숨김)",
+                    "게시 시각": format_chat_time(n['publish_at']),
+                    "작성자": n['created_by'] or "",
+                    "상태": "게시 중" if n['version'] == current_notice['version'] else ("예약" if datetime.fromisoformat(n['publish_at']) > datetime.now() else "이전 버전"),
+                } for n in history]), use_container_width=True, hide_index=True)
+            else:
+                st.caption("수정 기록이 없습니다.")
+
+# --- 헬퍼 함수: 실시간 알림 (SSE) ---
+def hidden_trigger_button(label, key):
+    """
+    화면에 보이지 않는 버튼 (브라우저 스크립트가 label로 찾아서 클릭 -> 해당 fragment만 다시 실행)
+    """
+    st.markdown("""
+        <style>
+            div[data-testid="stElementContainer"]:has(.hide-next-btn) { display: none; }
+            div[data-testid="stElementContainer"]:has(.hide-next-btn) + div[data-testid="stElementContainer"] {
+                position: absolute !important; opacity: 0 !important; z-index: -1 !important; height: 0 !important;
+            }
+        </style>
+        <div class="hide-next-btn"></div>
+    """, unsafe_allow_html=True)
+    return st.button(label, key=key)
+
+@st.cache_resource
+def get_notice_store():
+    # 모든 세션이 공유하는 마지막으로 받은 공지사항 {"current": (ETag, 공지사항)}
+    return {"current": (None, {"version": 0, "text": ""})}
+
+def load_notice(headers):
+    """
+    [최적화] 마지막으로 받은 공지사항의 ETag로 조건부 요청 (바뀌지 않았으면 304, 본문 없음)
+    """
+    store = get_notice_store()
+    etag, notice = store["current"]
+    request_headers = dict(headers)
+    if etag:
+        request_headers["If-None-Match"] = etag
+    try:
+        res = api_request("GET", "/notice", headers=request_headers)
+        if res.status_code == 200:
+            notice = res.json()
+            store["current"] = (res.headers.get("ETag"), notice)
+    except requests.exceptions.RequestException:
+        pass
+    return notice
+
+@st.cache_data(max_entries=16)
+def render_notice_html(etag, text):
+    # 공지사항 버전(ETag)별로 배너 HTML을 한 번만 생성
+    notice_html = text.replace('\n', '<br>')
+    return f"""
+            <div style="background: linear-gradient(135deg, #d4af37 0%, #a88825 100%); padding: 12px 18px; border-radius: 12px; margin: 15px 0 5px 0; color: #050A18; box-shadow: 0 4px 15px rgba(228, 212, 164, 0.2); animation: fadeInUp 0.5s ease-out; display: flex; align-items: flex-start; gap: 12px;">
+                <span style="font-size: 1.3rem; margin-top: -2px;">📢</span>
+                <span style="font-size: 0.95rem; font-weight: 700; line-height: 1.4; word-break: keep-all;">{notice_html}</span>
+            </div>
+        """
+
+def subscribe_live_updates():
+    """
+    브라우저에서 백엔드 /events(SSE)에 연결하여 채팅/공지사항 변경 알림을 받으면 숨김 버튼을 클릭
+    연결은 부모 창에 하나만 유지하고, 토큰이 바뀌면(로그인 연장) 새 토큰으로 다시 연결
+    토큰이 만료되면(auth_expired 이벤트) 또는 연결 실패가 계속되면 재접속하지 않고 연결 종료
+    """
+    events_url = f"{PUBLIC_API_URL}/events?token={st.session_state.token}"
+    st.components.v1.html(f"""
+        <script>
+            const parentWin = window.parent;
+            const parentDoc = parentWin.document;
+            const eventsUrl = {json.dumps(events_url)};
+
+            if (parentWin.liveEventsUrl !== eventsUrl) {{
+                if (parentWin.liveEvents) parentWin.liveEvents.close();
+                parentWin.liveEventsUrl = eventsUrl;
+                parentWin.liveEventTimers = parentWin.liveEventTimers || {{}};
+
+                // 짧은 시간에 알림이 여러 번 와도 한 번만 다시 실행 (0.3초 묶음)
+                const clickHidden = (label) => {{
+                    if (parentWin.liveEventTimers[label]) return;
+                    parentWin.liveEventTimers[label] = parentWin.setTimeout(() => {{
+                        parentWin.liveEventTimers[label] = null;
+                        const btn = Array.from(parentDoc.querySelectorAll('button')).find(b => b.textContent.includes(label));
+                        if (btn) btn.click();
+                    }}, 300);
+                }};
+
+                const source = new parentWin.EventSource(eventsUrl);
+                source.addEventListener('chat', () => clickHidden('chat_event_hidden_btn'));
+                source.addEventListener('chat_deleted', () => clickHidden('chat_event_hidden_btn'));
+                source.addEventListener('notice', () => clickHidden('notice_event_hidden_btn'));
+                // 토큰 만료: 같은 주소로 다시 접속하지 않음 (로그인 연장으로 토큰이 바뀌면 새로 연결)
+                source.addEventListener('auth_expired', () => source.close());
+                // 연결 실패(401 등)가 계속되면 재접속 중단, 다음 화면 갱신 때 다시 연결
+                let failures = 0;
+                source.onopen = () => {{ failures = 0; }};
+                source.onerror = () => {{
+                    failures += 1;
+                    if (source.readyState === parentWin.EventSource.CLOSED || failures >= 3) {{
+                        source.close();
+                        if (parentWin.liveEvents === source) parentWin.liveEventsUrl = null;
+                    }}
+                }};
+                parentWin.liveEvents = source;
+            }}
+        </script>
+    """, height=0)
+
+@st.fragment
+def show_notice_banner():
+    """회원증 상단 공지사항 배너 (변경 알림을 받으면 이 영역만 다시 실행)"""
+    hidden_trigger_button("notice_event_hidden_btn", key="notice_event_btn")
+    notice = load_notice({"Authorization": f"Bearer {st.session_state.token}"})
+
+    if notice['text']:
+        st.markdown(render_notice_html(notice['version'], notice['text']), unsafe_allow_html=True)
+
+@st.fragment
+def show_chat_room(info):
+    """자유 소통방 (새 메시지/삭제 알림이 오면 이 영역만 다시 실행하여 증분 반영)"""
+    chat_headers = {"Authorization": f"Bearer {st.session_state.token}"}
+
+    # 서버에서 새 메시지 알림(SSE)을 받으면 브라우저 스크립트가 이 숨김 버튼을 눌러 이 영역만 다시 실행
+    hidden_trigger_button("chat_event_hidden_btn", key="chat_event_btn")
+
+    # [개선] 채팅 기록은 서버 DB(chat_messages)에 저장, 화면에는 새 메시지만 증분 조회하여 반영
+    chat_history = sync_chat_messages(chat_headers)
+
+    # 채팅 내역 표시 영역 (스크롤이 가능한 박스 생성)
+    chat_container = st.container(height=400)
+    with chat_container:
+        if st.session_state.get('chat_has_more'):
+            if st.button("이전 메시지 더 보기", key="chat_load_older"):
+                load_older_chat_messages(chat_headers)
                 st.rerun()
 
+        for chat in chat_history:
+            role = chat.get("role", "user")
+            # 관리자는 로고 이미지, 일반 회원은 기본 'user' 아이콘 사용
+            with st.chat_message(role, avatar=logo_image if role == "assistant" else "user"):
+                if chat.get("role") == "assistant":
+                    club_tag = "<span style='font-size:0.8rem; color:#ff4b4b; margin-left:5px;'>[관리자]</span>"
+                else:
+                    club_name = chat.get('club', '소속 없음')
+                    club_tag = f"<span style='font-size:0.8rem; color:#E4D4A4; margin-left:5px;'>[{club_name}]</span>"
+                
+                st.markdown(f"**{chat['name']}**{club_tag} <span style='font-size:0.75rem; color:rgba(255,255,255,0.7); margin-left:8px;'>{format_chat_time(chat.get('created_at'))}</span>", unsafe_allow_html=True)
+                
+                # 본인 메시지인지 확인 (기존 메시지는 이름으로, 새 메시지는 학번으로 더 정확히 비교)
+                is_mine = chat.get("student_id") == info["student_id"] if chat.get("student_id") else chat["name"] == info["name"]
+                # [기능 1] 관리자인지 확인
+                is_admin = info.get("role") == "admin"
+                
+                if is_mine or is_admin:
+                    col1, col2 = st.columns([0.85, 0.15])
+                    with col1:
+                        st.write(chat["message"])
+                    with col2:
+                        # 관리자가 남의 글을 지울 때는 버튼을 빨간색 이모지로 표시
+                        btn_label = "🗑️" if (is_admin and not is_mine) else "삭제"
+                        if st.button(btn_label, key=f"del_chat_{chat['id']}"):
+                            try:
+                                res = api_request("DELETE", f"/chat/messages/{chat['id']}", headers=chat_headers)
+                                if res.status_code in (200, 404): # 이미 삭제된 메시지도 화면에서 제거
+                                    st.session_state.chat_messages = [m for m in chat_history if m['id'] != chat['id']]
+                                else:
+                                    st.error(res.json().get('detail', "삭제 실패"))
+                            except requests.exceptions.RequestException:
+                                st.error("서버 연결 실패")
+                            st.rerun()
+                else:
+                    st.write(chat["message"])
+
+    # 하단 채팅 입력창
+    if prompt := st.chat_input("따뜻한 메시지를 입력해주세요..."):
+        
+        # [기능 4] 비속어 필터링
+        banned_words = ['시발', '씨발', '개새끼', '병신', '미친', '존나', '좆', '지랄', '염병', '느금마']
+        filtered_prompt = prompt
+        for word in banned_words:
+            if word in filtered_prompt:
+                filtered_prompt = filtered_prompt.replace(word, '***')
+
+        # 작성자 정보(학번/이름/소속/권한)는 서버가 로그인 정보로 기록
+        try:
+            res = api_request("POST", "/chat/messages", headers=chat_headers, json={"message": filtered_prompt})
+            if res.status_code != 200:
+                st.error(res.json().get('detail', "메시지 전송 실패"))
+        except requests.exceptions.RequestException:
+            st.error("서버 연결 실패")
+        else:
+            st.rerun() # 메시지 입력 후 즉시 화면 새로고침하여 반영 (새 메시지만 다시 조회)
+
 # 2. 디지털 회원증 페이지
 def show_membership_card():
     # --- 만료 시간 체크 및 자동 로그아웃 (새로고침) ---
@@ -901,16 +1458,14 @@ def show_membership_card():
                 if st.session_state.extend_count < 3:
                     headers = {"Authorization": f"Bearer {st.session_state.token}"}
                     try:
-                        res = requests.post(f"{API_URL}/token/refresh", headers=headers)
+                        res = api_request("POST", "/token/refresh", headers=headers)
                         if res.status_code == 200:
                             st.session_state.token = res.json()['access_token']
                             st.session_state.expire_time = datetime.now() + timedelta(minutes=10)
                             st.session_state.extend_count += 1
                             st.session_state.save_ls = True
                             st.rerun()
-                        elif res.status_code == 401:
-                            do_logout()
-                    except:
+                    except requests.exceptions.RequestException: # st.rerun()/로그아웃은 가로채지 않도록 연결 오류만 처리
                         pass
 
             # 화면 우측 상단에 남은 시간을 표시하고, 시간이 지나면 새로고침하여 로그아웃 처리
@@ -1063,7 +1618,7 @@ def show_membership_card():
         headers = {"Authorization": f"Bearer {st.session_state.token}"}
         try:
             with st.spinner("회원 정보를 불러오는 중입니다..."):
-                response = requests.get(f"{API_URL}/members/me", headers=headers)
+                response = api_request("GET", "/members/me", headers=headers)
                 if response.status_code == 200:
                     st.session_state.member_info = response.json()
                 else: # 토큰이 만료되었거나 유효하지 않은 경우
@@ -1091,24 +1646,18 @@ def show_membership_card():
             return
     
     # 로고 표시
-    st.image(logo_image, width=150)
+    logo_src = asset_src("logo-small")
+    if logo_src:
+        st.markdown(f'<img src="{logo_src}" style="width: 150px;">', unsafe_allow_html=True)
+    else:
+        st.image(logo_image, width=150)
     
-    # [추가] 공지사항 배너 렌더링
-    notice_text = ""
-    if os.path.exists("notice.txt"):
-        with open("notice.txt", "r", encoding="utf-8") as f:
-            notice_text = f.read().strip()
-            
-    if notice_text:
-        notice_html = notice_text.replace('\n', '<br>')
-        st.markdown(f"""
-            <div style="background: linear-gradient(135deg, #d4af37 0%, #a88825 100%); padding: 12px 18px; border-radius: 12px; margin: 15px 0 5px 0; color: #050A18; box-shadow: 0 4px 15px rgba(228, 212, 164, 0.2); animation: fadeInUp 0.5s ease-out; display: flex; align-items: flex-start; gap: 12px;">
-                <span style="font-size: 1.3rem; margin-top: -2px;">📢</span>
-                <span style="font-size: 0.95rem; font-weight: 700; line-height: 1.4; word-break: keep-all;">{notice_html}</span>
-            </div>
-        """, unsafe_allow_html=True)
+    # [추가] 공지사항 배너 렌더링 (변경 알림을 받으면 배너 영역만 다시 불러옴)
+    show_notice_banner()
+
+    # [개선] 채팅/공지사항 변경을 서버에서 실시간으로 전달받는 브라우저 연결 (SSE)
+    subscribe_live_updates()
     
-    # KU 로고 이미지 로드 (base64)
     # [수정] 공통 함수 사용하여 회원증 렌더링
     st.markdown(get_card_html(info), unsafe_allow_html=True)
 
@@ -1128,93 +1677,19 @@ def show_membership_card():
                     headers = {"Authorization": f"Bearer {st.session_state.token}"}
                     data = {"current_password": current_password, "new_password": new_password}
                     try:
-                        res = requests.put(f"{API_URL}/members/me/password", headers=headers, json=data)
+                        res = api_request("PUT", "/members/me/password", headers=headers, json=data)
                         if res.status_code == 200:
                             st.success("비밀번호가 성공적으로 변경되었습니다.")
                         else:
                             st.error(f"비밀번호 변경 실패: {res.json().get('detail')}")
-                    except:
+                    except requests.exceptions.RequestException:
                         st.error("서버 오류 발생")
 
     # --- 💬 실시간 자유 소통방 (방명록) ---
     st.markdown("---")
     st.subheader("💬 자유 소통방")
     st.caption("전체 회원들과 자유롭게 이야기를 나누어 보세요!")
-    
-    CHAT_FILE = "chat_history.json"
-    
-    # 파일이 없으면 초기화
-    if not os.path.exists(CHAT_FILE):
-        with open(CHAT_FILE, "w", encoding="utf-8") as f:
-            json.dump([], f)
-            
-    # 기존 채팅 기록 읽기
-    try:
-        with open(CHAT_FILE, "r", encoding="utf-8") as f:
-            chat_history = json.load(f)
-    except:
-        chat_history = []
-
-    # 채팅 내역 표시 영역 (스크롤이 가능한 박스 생성)
-    chat_container = st.container(height=400)
-    with chat_container:
-        for idx, chat in enumerate(chat_history):
-            role = chat.get("role", "user")
-            # 관리자는 로고 이미지, 일반 회원은 기본 'user' 아이콘 사용
-            with st.chat_message(role, avatar=logo_image if role == "assistant" else "user"):
-                if chat.get("role") == "assistant":
-                    club_tag = "<span style='font-size:0.8rem; color:#ff4b4b; margin-left:5px;'>[관리자]</span>"
-                else:
-                    club_name = chat.get('club', '소속 없음')
-                    club_tag = f"<span style='font-size:0.8rem; color:#E4D4A4; margin-left:5px;'>[{club_name}]</span>"
-                
-                st.markdown(f"**{chat['name']}**{club_tag} <span style='font-size:0.75rem; color:rgba(255,255,255,0.7); margin-left:8px;'>{chat['time']}</span>", unsafe_allow_html=True)
-                
-                # 본인 메시지인지 확인 (기존 메시지는 이름으로, 새 메시지는 학번으로 더 정확히 비교)
-                is_mine = chat.get("student_id") == info["student_id"] if "student_id" in chat else chat["name"] == info["name"]
-                # [기능 1] 관리자인지 확인
-                is_admin = info.get("role") == "admin"
-                
-                if is_mine or is_admin:
-                    col1, col2 = st.columns([0.85, 0.15])
-                    with col1:
-                        st.write(chat["message"])
-                    with col2:
-                        # 관리자가 남의 글을 지울 때는 버튼을 빨간색 이모지로 표시
-                        btn_label = "🗑️" if (is_admin and not is_mine) else "삭제"
-                        if st.button(btn_label, key=f"del_chat_{chat.get('id', idx)}"):
-                            chat_history.pop(idx)
-                            with open(CHAT_FILE, "w", encoding="utf-8") as f:
-                                json.dump(chat_history, f, ensure_ascii=False, indent=2)
-                            st.rerun()
-                else:
-                    st.write(chat["message"])
-
-    # 하단 채팅 입력창
-    if prompt := st.chat_input("따뜻한 메시지를 입력해주세요..."):
-        
-        # [기능 4] 비속어 필터링
-        banned_words = ['시발', '씨발', '개새끼', '병신', '미친', '존나', '좆', '지랄', '염병', '느금마']
-        filtered_prompt = prompt
-        for word in banned_words:
-            if word in filtered_prompt:
-                filtered_prompt = filtered_prompt.replace(word, '***')
-
-        new_chat = {
-            "id": str(time.time()),
-            "student_id": info['student_id'],
-            "role": "assistant" if info.get("role") == "admin" else "user",
-            "name": info['name'],
-            "club": info.get('club') if info.get('club') else '소속 없음',
-            "message": filtered_prompt,
-            "time": datetime.now().strftime("%m/%d %H:%M")
-        }
-        chat_history.append(new_chat)
-        # 용량 최적화를 위해 최근 100개의 메시지만 유지
-        chat_history = chat_history[-100:]
-        with open(CHAT_FILE, "w", encoding="utf-8") as f:
-            json.dump(chat_history, f, ensure_ascii=False, indent=2)
-        st.rerun() # 메시지 입력 후 즉시 화면 새로고침하여 반영
+    show_chat_room(info)
 
     # 로그아웃 버튼
     if st.button("로그아웃"):
@@ -1232,6 +1707,12 @@ if st.session_state.token is None:
             if (timerDiv) timerDiv.remove();
             if (window.parent.logoutTimerInterval) {
                 window.parent.clearInterval(window.parent.logoutTimerInterval);
+            }
+            // 실시간 알림(SSE) 연결 종료
+            if (window.parent.liveEvents) {
+                window.parent.liveEvents.close();
+                window.parent.liveEvents = null;
+                window.parent.liveEventsUrl = null;
             }
                     window.parent.currentTargetTime = null;
                     window.parent.lastSeenExtendCount = -1;
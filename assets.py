@@ -0,0 +1,51 @@
+import hashlib
+import io
+import os
+from dataclasses import dataclass
+from typing import Dict
+
+from PIL import Image
+
+# 로고 원본 이미지가 있는 폴더
+ASSET_SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+WEBP_QUALITY = int(os.getenv("ASSET_WEBP_QUALITY", "85"))
+
+# 화면에서 사용하는 이미지 크기별 변환본 {이름: (원본 파일, 가로 px)}
+# 표시 크기의 2배로 만들어 고해상도 화면에서도 선명하게 표시
+ASSET_VARIANTS = {
+    "ku-logo": ("ku logo.png", 100),   # 회원증 카드 하단 로고 (50px)
+    "logo": ("logo.png", 600),         # 로그인 화면 로고, 로그인 애니메이션
+    "logo-small": ("logo.png", 300),   # 회원증 화면 상단 로고 (150px)
+}
+
+
+@dataclass
+class Asset:
+    name: str
+    filename: str  # 내용 해시가 들어간 파일 이름 (내용이 바뀌면 주소도 바뀌므로 브라우저에 오래 캐시 가능)
+    data: bytes
+    media_type: str = "image/webp"
+
+
+def render_variant(source: str, width: int, source_dir: str = ASSET_SOURCE_DIR) -> bytes:
+    """원본 이미지를 가로 width px로 줄여 WebP로 변환 (투명 배경 유지)"""
+    with Image.open(os.path.join(source_dir, source)) as im:
+        im = im.convert("RGBA" if "A" in im.getbands() else "RGB")
+        if im.width > width:
+            im = im.resize((width, round(im.height * width / im.width)), Image.LANCZOS)
+        buffer = io.BytesIO()
+        im.save(buffer, format="WEBP", quality=WEBP_QUALITY, method=6)
+        return buffer.getvalue()
+
+
+def build_assets(source_dir: str = ASSET_SOURCE_DIR) -> Dict[str, Asset]:
+    """모든 변환본 생성 (서버 시작 시 한 번 실행). 원본 파일이 없는 항목은 건너뜀"""
+    assets = {}
+    for name, (source, width) in ASSET_VARIANTS.items():
+        try:
+            data = render_variant(source, width, source_dir)
+        except FileNotFoundError:
+            continue
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        assets[name] = Asset(name=name, filename=f"{name}.{digest}.webp", data=data)
+    return assets
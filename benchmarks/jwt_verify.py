@@ -0,0 +1,64 @@
+"""
+JWT 검증 속도 측정 (서버 없이 실행)
+
+python-jose / PyJWT(설치된 경우)의 검증 속도와, 검증 결과 캐시(tokens.decode_token)를
+사용했을 때 같은 토큰을 다시 확인하는 속도를 초당 검증 수로 비교합니다.
+
+사용법 (프로젝트 폴더에서):
+    python benchmarks/jwt_verify.py --tokens 1000 --rounds 20
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+from jose import jwt as jose_jwt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import tokens  # noqa: E402
+
+SECRET_KEY = "benchmark-secret-key-for-jwt-verify-test"
+ALGORITHM = "HS256"
+
+
+def make_tokens(count):
+    expire = datetime.utcnow() + timedelta(minutes=10)
+    return [tokens.encode_token({"sub": f"2024{i:06d}", "exp": expire}, SECRET_KEY, ALGORITHM) for i in range(count)]
+
+
+def measure(label, verify, token_list, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for token in token_list:
+            verify(token)
+    elapsed = time.perf_counter() - start
+    total = len(token_list) * rounds
+    print(f"{label:<22} {total / elapsed:>12,.0f} tokens/s  {elapsed / total * 1e6:8.2f} us/token")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JWT verification benchmark")
+    parser.add_argument("--tokens", type=int, default=1000, help="서로 다른 토큰 수 (동시 접속 회원 수)")
+    parser.add_argument("--rounds", type=int, default=20, help="토큰마다 반복 검증 횟수 (회원별 요청 수)")
+    args = parser.parse_args()
+
+    token_list = make_tokens(args.tokens)
+
+    measure("python-jose", lambda t: jose_jwt.decode(t, SECRET_KEY, algorithms=[ALGORITHM]), token_list, args.rounds)
+    if tokens.pyjwt is not None:
+        pyjwt = tokens.pyjwt
+        measure("PyJWT", lambda t: pyjwt.decode(t, SECRET_KEY, algorithms=[ALGORITHM]), token_list, args.rounds)
+    else:
+        print("PyJWT                  (설치되지 않음: pip install pyjwt)")
+
+    # 첫 검증(캐시 없음) 후 반복 검증은 캐시에서 처리
+    tokens.clear_token_cache()
+    measure(f"cache miss ({tokens.token_cache_stats()['backend']})",
+            lambda t: tokens.decode_token(t, SECRET_KEY, ALGORITHM), token_list, 1)
+    measure("cache hit", lambda t: tokens.decode_token(t, SECRET_KEY, ALGORITHM), token_list, args.rounds)
+    print(tokens.token_cache_stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+로그인(/token) 부하 테스트
+
+동시에 여러 클라이언트가 로그인할 때의 응답 시간(p50/p99)과,
+그동안 다른 API(/)가 얼마나 지연되는지를 함께 측정합니다.
+
+사용법 (백엔드 서버를 먼저 실행한 상태에서):
+    python benchmarks/login_load.py --url http://127.0.0.1:8000 --clients 50 --requests 4
+"""
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+def summarize(label, latencies):
+    print(
+        f"{label:<10} n={len(latencies):<5} "
+        f"p50={percentile(latencies, 50) * 1000:8.1f}ms  "
+        f"p99={percentile(latencies, 99) * 1000:8.1f}ms  "
+        f"max={max(latencies, default=0) * 1000:8.1f}ms"
+    )
+
+
+def run_login(session, url, username, password):
+    start = time.perf_counter()
+    r = session.post(f"{url}/token", data={"username": username, "password": password}, timeout=120)
+    elapsed = time.perf_counter() - start
+    r.raise_for_status()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Login load benchmark")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin1234")
+    parser.add_argument("--clients", type=int, default=50, help="동시 접속 클라이언트 수")
+    parser.add_argument("--requests", type=int, default=4, help="클라이언트당 로그인 횟수")
+    args = parser.parse_args()
+
+    # 비밀번호가 해시로 저장된 계정이어야 bcrypt 비용이 측정됨 (초기 비밀번호 계정은 해시 없이 비교)
+    run_login(requests.Session(), args.url, args.username, args.password)
+
+    login_latencies = []
+    probe_latencies = []
+    done = threading.Event()
+
+    def client(_):
+        session = requests.Session()
+        return [run_login(session, args.url, args.username, args.password) for _ in range(args.requests)]
+
+    def probe():
+        # 로그인이 몰리는 동안 가벼운 API가 막히지 않는지 확인
+        session = requests.Session()
+        while not done.is_set():
+            start = time.perf_counter()
+            session.get(f"{args.url}/", timeout=120)
+            probe_latencies.append(time.perf_counter() - start)
+            time.sleep(0.05)
+
+    probe_thread = threading.Thread(target=probe, daemon=True)
+    probe_thread.start()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as executor:
+        for latencies in executor.map(client, range(args.clients)):
+            login_latencies.extend(latencies)
+    wall = time.perf_counter() - started
+
+    done.set()
+    probe_thread.join()
+
+    print(f"clients={args.clients} requests/client={args.requests} wall={wall:.1f}s "
+          f"throughput={len(login_latencies) / wall:.1f} logins/s")
+    summarize("login", login_latencies)
+    summarize("probe /", probe_latencies)
+    if login_latencies:
+        print(f"login mean={statistics.mean(login_latencies) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
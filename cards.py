@@ -0,0 +1,66 @@
+import os
+from string import Template
+
+from cache import TTLCache
+from clubs import split_clubs
+
+# 메모리에 보관할 회원증 HTML 수 (갤러리 여러 페이지 분량)
+CARD_CACHE_SIZE = int(os.getenv("CARD_CACHE_SIZE", "500"))
+
+# 회원증 HTML 틀 (모듈을 불러올 때 한 번만 만들고, 렌더링 시에는 값만 채움)
+CARD_TEMPLATE = Template("""
+        <style>
+            .membership-card {
+                max-width: 600px !important; /* 카드 너비 확대 */
+            }
+        </style>
+        <div class="membership-card">
+            <div class="card-header">
+                <div class="card-chip"></div>
+                <div style="text-align: right;">
+                    <div class="card-logo">DIGITAL MEMBER</div>
+                    $ku_logo_html
+                </div>
+            </div>
+            <div class="card-body">
+                <div class="card-label">NAME</div>
+                <h2>$name</h2>
+                <div class="card-label">STUDENT ID</div>
+                <p class="student-id">$student_id</p>
+            </div>
+            <div class="card-footer">
+                <p class="club">$club_html</p>
+            </div>
+        </div>
+    """)
+KU_LOGO_TEMPLATE = Template('<img src="$src" style="width: 50px; margin-top: 5px;">')
+CLUB_TEMPLATE = Template("<span style='margin-right: 8px;'>$club</span>")
+
+# [최적화] 렌더링 결과 캐시 (가장 오래 사용하지 않은 카드부터 제거, 만료 없음)
+# 키는 카드 내용에 영향을 주는 값만 사용 (상태/권한/미리보기 여부는 카드에 표시되지 않음)
+_card_cache = TTLCache(maxsize=CARD_CACHE_SIZE)
+
+
+def render_card(name: str, student_id: str, club: str, ku_logo_src: str = "") -> str:
+    """회원증 HTML (같은 이름/학번/동아리/로고 주소면 캐시된 결과 반환)"""
+    key = (name, student_id, club, ku_logo_src)
+    html = _card_cache.get(key)
+    if html is None:
+        html = CARD_TEMPLATE.substitute(
+            name=name,
+            student_id=student_id,
+            # 소속 동아리가 여러 개일 경우 (콤마 구분), 쉼표를 없애고 각각 간격을 두어 옆으로 나열
+            club_html="".join(CLUB_TEMPLATE.substitute(club=c) for c in split_clubs(club) or ["소속 없음"]),
+            ku_logo_html=KU_LOGO_TEMPLATE.substitute(src=ku_logo_src) if ku_logo_src else "",
+        )
+        _card_cache.set(key, html)
+    return html
+
+
+def card_cache_stats() -> dict:
+    """캐시 크기와 적중(hits)/실패(misses) 횟수"""
+    return _card_cache.stats()
+
+
+def clear_card_cache():
+    _card_cache.clear()
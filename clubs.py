@@ -0,0 +1,49 @@
+import re
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+# 분과별 소속 동아리 (프론트엔드와 백엔드가 함께 사용)
+CLUB_DIVISIONS = {
+    "예술음악분과": ["LACOV", "한울", "딕트", "스타피쉬", "JB", "한사랑 오케스트라", "백우회", "거트", "우서", "어쿠스틱스", "4D"],
+    "창업학술분과": ["유토피아", "소란", "PSM", "제5세대", "리더", "우하오"],
+    "취미교양분과": ["왓치", "가비", "산악부", "FOCUS", "두점머리", "워너비", "만화마을", "0AE"],
+    "봉사종교분과": ["JYM", "CCC", "뉴라이프", "로타랙트", "LEO", "필리아", "Team911"],
+    "체육레저분과": ["K.B", "아웃사이더", "보디가드", "팬서스", "RELAX", "SPLASH", "KUBIC", "건무회"]
+}
+
+# [최적화] 동아리 이름(대문자) → 분과 역색인 (get_division을 분과 목록 순회 없이 한 번에 조회)
+DIVISION_BY_CLUB = {club.upper(): division for division, clubs in CLUB_DIVISIONS.items() for club in clubs}
+DIVISION_BY_CLUB["총동아리연합회"] = "학생자치기구"
+
+# 소속 동아리 구분 기호: 쉼표(,), 전각 쉼표(，), 슬래시(/), 앰퍼샌드(&), 더하기(+)
+CLUB_SEPARATORS = re.compile(r"[,，/&+]")
+# 목록 문자열이 그대로 저장된 예전 데이터의 괄호/따옴표 ("['한울', '딕트']")
+CLUB_STRIP_CHARS = str.maketrans("", "", "[]'\"")
+# 소속 없음으로 취급하는 값 (동아리로 등록하지 않음)
+NO_CLUB_VALUES = {"소속없음", "소속 없음", "none", "null"}
+
+CLUB_PARSE_CACHE_SIZE = 4096
+
+def get_division(club_name: Optional[str]) -> str:
+    if not club_name: return "미분류"
+    return DIVISION_BY_CLUB.get(str(club_name).strip().upper(), "미분류")
+
+@lru_cache(maxsize=CLUB_PARSE_CACHE_SIZE)
+def _parse_clubs(club_str: str) -> Tuple[str, ...]:
+    clubs = []
+    for c in CLUB_SEPARATORS.split(club_str.translate(CLUB_STRIP_CHARS)):
+        c = c.strip()
+        if c and c.lower() not in NO_CLUB_VALUES and c not in clubs:
+            clubs.append(c)
+    return tuple(clubs)
+
+def split_clubs(club_str: Optional[str]) -> List[str]:
+    """
+    '한울, 딕트' 형태의 소속 동아리 문자열을 목록으로 분리 (공백 제거, 중복 제거, 순서 유지)
+    프론트엔드/백엔드/통계가 모두 이 규칙을 사용 (같은 문자열의 결과는 캐시)
+    """
+    return list(_parse_clubs(str(club_str or "")))
+
+def join_clubs(clubs: Iterable[str]) -> str:
+    """동아리 목록을 members.club 저장 형식('한울, 딕트')으로 결합 (중복 제거)"""
+    return ", ".join(dict.fromkeys(clubs))
@@ -1,4 +1,5 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -10,11 +11,78 @@ SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./sql_app.db")
 if SQLALCHEMY_DATABASE_URL.startswith("postgres://"):
     SQLALCHEMY_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False} if "sqlite" in SQLALCHEMY_DATABASE_URL else {}
-)
+# 비동기 엔진 주소 (aiosqlite / asyncpg 드라이버 사용, ASYNC_DATABASE_URL로 직접 지정 가능)
+# 주의: 메모리 SQLite는 엔진마다 별도 DB가 되므로 비동기 경로와 데이터가 공유되지 않음
+def _async_url(url: str) -> str:
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql:"):
+        return url.replace("postgresql:", "postgresql+asyncpg:", 1)
+    if url.startswith("postgresql+psycopg2:"):
+        return url.replace("postgresql+psycopg2:", "postgresql+asyncpg:", 1)
+    return url
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", _async_url(SQLALCHEMY_DATABASE_URL))
+
+IS_SQLITE = SQLALCHEMY_DATABASE_URL.startswith("sqlite")
+IS_SQLITE_MEMORY = IS_SQLITE and (":memory:" in SQLALCHEMY_DATABASE_URL or SQLALCHEMY_DATABASE_URL.rstrip("/") == "sqlite:")
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
+# --- 커넥션 풀 설정 (환경 변수로 조정) ---
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))              # 항상 유지할 연결 수
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))       # 몰릴 때 추가로 열 수 있는 연결 수
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))     # 빈 연결을 기다리는 최대 시간(초)
+DB_POOL_PRE_PING = _env_flag("DB_POOL_PRE_PING", "1")           # 사용 전 연결 확인 (호스트가 끊은 연결 자동 교체)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))     # 이 시간(초)이 지난 연결은 새로 연결 (-1이면 사용 안 함)
+
+# --- SQLite 설정 ---
+# WAL 모드: 읽기와 쓰기가 서로 막지 않아 동시 관리자 작업 시 "database is locked" 오류 감소
+SQLITE_WAL = _env_flag("SQLITE_WAL", "1")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))   # 잠금 해제를 기다리는 시간
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))  # 메모리 맵 읽기 크기 (0이면 사용 안 함)
+
+engine_options = {"pool_pre_ping": DB_POOL_PRE_PING}
+if IS_SQLITE:
+    engine_options["connect_args"] = {"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000}
+if not IS_SQLITE_MEMORY:
+    # 메모리 DB는 단일 연결 풀을 쓰므로 크기 설정을 적용하지 않음
+    engine_options.update(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+    )
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options)
+
+# [최적화] 조회가 많은 async 엔드포인트용 비동기 엔진 (동기 엔진과 같은 풀 설정 사용)
+async_engine_options = dict(engine_options)
+if IS_SQLITE:
+    async_engine_options["connect_args"] = {"timeout": SQLITE_BUSY_TIMEOUT_MS / 1000}
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **async_engine_options)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # 새 연결마다 적용되는 SQLite 설정
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    if SQLITE_WAL and not IS_SQLITE_MEMORY:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL") # WAL에서는 NORMAL로도 DB 손상 없음 (커밋마다 fsync 생략)
+    if SQLITE_MMAP_SIZE:
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.close()
+
+if IS_SQLITE:
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# 커밋 후에도 조회한 값을 그대로 응답에 쓸 수 있도록 expire_on_commit=False
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
@@ -23,4 +91,8 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
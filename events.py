@@ -0,0 +1,71 @@
+import asyncio
+import itertools
+import json
+import threading
+from typing import Optional, Set
+
+# 구독자별 대기열 크기 (느린 클라이언트가 밀린 이벤트를 이만큼 넘기면 연결을 끊고 재접속하도록 함)
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class EventBroker:
+    """
+    프로세스 메모리 내 이벤트 fan-out (채팅/공지사항 변경 알림)
+    /events(SSE) 연결마다 대기열을 하나씩 만들고, publish()된 이벤트를 모든 대기열에 복사
+    동기 엔드포인트(스레드 풀)에서도 publish()할 수 있도록 이벤트 루프로 넘겨서 전달
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        with self.lock:
+            self.loop = asyncio.get_running_loop()
+            self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        with self.lock:
+            self.subscribers.discard(queue)
+
+    def publish(self, event: str, data: Optional[dict] = None):
+        with self.lock:
+            loop = self.loop
+            if loop is None or not self.subscribers:
+                return
+            message = {"id": next(self.ids), "event": event, "data": data or {}}
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._fan_out(message)
+        else:
+            loop.call_soon_threadsafe(self._fan_out, message)
+
+    def _fan_out(self, message: dict):
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for queue in subscribers:
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # 밀린 클라이언트는 연결 종료 신호를 보내 다시 접속하게 함 (EventSource 자동 재접속)
+                self.unsubscribe(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+
+def format_sse(message: dict) -> str:
+    """Server-Sent Events 형식 문자열"""
+    data = json.dumps(message["data"], ensure_ascii=False, default=str)
+    return f"id: {message['id']}\nevent: {message['event']}\ndata: {data}\n\n"
+
+
+event_broker = EventBroker()
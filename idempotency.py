@@ -0,0 +1,122 @@
+import hashlib
+import os
+import threading
+from typing import Any, BinaryIO, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from cache import TTLCache
+from member_cache import AUTH_CACHE_TTL_SECONDS, current_generation
+from models import Member, member_clubs
+
+# 중복 업로드 판별 결과 보관 시간(초)과 최대 개수
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "600"))
+IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "100"))
+
+# 같은 명단 재업로드를 DB 반영 없이 처리할 수 있는 시간(초)
+# 여러 워커 프로세스로 실행할 때를 대비해 회원 정보 캐시(member_cache)와 같은 짧은 TTL 사용
+RECENT_IMPORT_TTL_SECONDS = float(os.getenv("RECENT_IMPORT_TTL_SECONDS", str(AUTH_CACHE_TTL_SECONDS)))
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+# 같은 키의 요청이 처리 중일 때 끝나기를 기다리는 최대 시간(초)
+IDEMPOTENCY_WAIT_SECONDS = 300
+FINGERPRINT_CHUNK_BYTES = 64 * 1024
+
+
+class IdempotencyStore:
+    """
+    Idempotency-Key 헤더별 처리 결과 (같은 키로 다시 요청하면 처리하지 않고 저장된 결과 반환)
+    같은 키의 요청이 동시에 들어오면 나중 요청은 먼저 온 요청이 끝날 때까지 기다림
+    """
+
+    def __init__(self, maxsize: int = IDEMPOTENCY_MAX_ENTRIES, ttl: float = IDEMPOTENCY_TTL_SECONDS):
+        self.results = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.in_flight: Dict[Hashable, threading.Event] = {}
+        self.lock = threading.Lock()
+
+    def claim(self, key: Hashable) -> Tuple[bool, Any]:
+        """(True, None): 이 요청이 처리할 차례 / (False, 결과): 이미 처리된 요청"""
+        while True:
+            with self.lock:
+                result = self.results.get(key)
+                if result is not None:
+                    return False, result
+                event = self.in_flight.get(key)
+                if event is None:
+                    self.in_flight[key] = threading.Event()
+                    return True, None
+            # 처리 중인 같은 요청이 끝나면 결과를 다시 확인 (실패했으면 이 요청이 처리)
+            event.wait(IDEMPOTENCY_WAIT_SECONDS)
+
+    def complete(self, key: Hashable, result: Any):
+        with self.lock:
+            self.results.set(key, result)
+            event = self.in_flight.pop(key, None)
+        if event:
+            event.set()
+
+    def discard(self, key: Hashable, result: Any):
+        """저장된 결과가 result이면 삭제 (결과가 가리키는 작업이 이미 정리된 경우, 다음 claim에서 새로 처리)"""
+        with self.lock:
+            if self.results.get(key) == result:
+                self.results.pop(key)
+
+    def release(self, key: Hashable):
+        """처리에 실패한 경우 (결과를 저장하지 않으므로 같은 키로 다시 시도 가능)"""
+        with self.lock:
+            event = self.in_flight.pop(key, None)
+        if event:
+            event.set()
+
+
+def upload_fingerprint(fileobj: BinaryIO, *options) -> str:
+    """
+    업로드 파일 내용과 읽기 옵션(파일 형식, 열 지정 등)의 SHA-256 지문
+    [최적화] 파일을 조금씩 읽어 계산하므로 명단 전체를 메모리에 올리지 않음 (계산 후 파일 위치는 처음으로 되돌림)
+    """
+    digest = hashlib.sha256(repr(options).encode("utf-8"))
+    fileobj.seek(0)
+    for chunk in iter(lambda: fileobj.read(FINGERPRINT_CHUNK_BYTES), b""):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def roster_state(db_session: Session) -> tuple:
+    """
+    회원 명단의 DB 상태 표시 (회원 수, 마지막 회원 ID, 소속 관계 수)
+    다른 워커 프로세스에서 회원 정보를 바꾼 경우도 확인하기 위해 DB에서 직접 조회 (집계 쿼리 2개)
+    """
+    members = db_session.execute(select(func.count(Member.id), func.max(Member.id))).one()
+    links = db_session.scalar(select(func.count()).select_from(member_clubs))
+    return (members[0], members[1], links)
+
+
+class RecentImports:
+    """
+    최근 등록한 명단 파일 지문 -> 결과
+    등록 이후 회원 정보가 바뀌지 않았을 때만 같은 결과를 재사용:
+    이 프로세스의 member_cache 세대 번호와 DB 상태(roster_state)가 모두 같고, 등록 후 RECENT_IMPORT_TTL_SECONDS 이내
+    """
+
+    def __init__(self, maxsize: int = IDEMPOTENCY_MAX_ENTRIES, ttl: float = RECENT_IMPORT_TTL_SECONDS):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def find(self, db_session: Session, fingerprint: str) -> Optional[Any]:
+        entry = self.cache.get(fingerprint)
+        if entry is None:
+            return None
+        generation, state, result = entry
+        if generation != current_generation() or state != roster_state(db_session):
+            return None
+        return result
+
+    def remember(self, db_session: Session, fingerprint: str, result: Any):
+        # 등록 후 회원 캐시 무효화까지 끝난 시점의 세대 번호와 commit된 DB 상태로 저장
+        self.cache.set(fingerprint, (current_generation(), roster_state(db_session), result))
+
+
+# 명단 업로드 API에서 함께 사용
+upload_requests = IdempotencyStore()
+recent_imports = RecentImports()
@@ -0,0 +1,162 @@
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import datetime
+from typing import BinaryIO, Dict, List, Optional
+
+from database import SessionLocal
+from stats import invalidate_stats
+from member_cache import invalidate_member_cache
+from importer import DEFAULT_COLUMNS, ColumnMapping, ImportResult, RosterFileError, import_roster, iter_roster_rows
+from idempotency import recent_imports, upload_fingerprint
+
+# 백그라운드 일괄 등록 작업 설정
+IMPORT_WORKERS = int(os.getenv("IMPORT_WORKERS", "1"))          # 동시에 처리할 업로드 작업 수
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "500"))  # 한 번에 DB에 반영(commit)할 행 수
+IMPORT_JOB_HISTORY = int(os.getenv("IMPORT_JOB_HISTORY", "50")) # 메모리에 보관할 최근 작업 수
+
+
+class ImportJob:
+    """명단 일괄 등록 작업 한 건의 상태 (워커 스레드가 갱신하고 API가 조회)"""
+
+    def __init__(self, filename: str, requested_by: str):
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.requested_by = requested_by
+        self.status = "queued" # queued -> running -> completed / failed
+        self.result = ImportResult()
+        self.detail: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        self.lock = threading.Lock()
+
+    def to_dict(self) -> dict:
+        with self.lock:
+            r = self.result
+            return {
+                "job_id": self.id,
+                "filename": self.filename,
+                "requested_by": self.requested_by,
+                "status": self.status,
+                "total_rows": r.total_rows,
+                "processed": r.processed,
+                "inserted": r.inserted,
+                "updated": r.updated,
+                "skipped": r.skipped,
+                "error_count": r.error_count,
+                "errors": list(r.errors),
+                "message": self.detail,
+                "created_at": self.created_at,
+                "finished_at": self.finished_at,
+            }
+
+
+class ImportJobManager:
+    """업로드 요청은 작업 ID만 받고 즉시 반환, 실제 등록은 스레드 풀에서 chunk 단위로 처리"""
+
+    def __init__(self, workers: int = IMPORT_WORKERS, chunk_size: int = IMPORT_CHUNK_SIZE, history: int = IMPORT_JOB_HISTORY):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="roster-import")
+        self.chunk_size = chunk_size
+        self.history = history
+        self.jobs: "OrderedDict[str, ImportJob]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def submit(
+        self,
+        filename: str,
+        fileobj: BinaryIO,
+        requested_by: str,
+        mapping: ColumnMapping = DEFAULT_COLUMNS,
+        sheets: Optional[Dict[str, ColumnMapping]] = None,
+    ) -> ImportJob:
+        """
+        fileobj: spool_upload()로 만든 임시 파일 (작업이 끝나면 워커가 닫음)
+        mapping: 원본 파일에서 이름/학번/소속동아리 열 (파일은 워커에서 한 번만 읽음)
+        sheets: 엑셀 시트별 열 지정. 여러 시트 등록은 묶음마다 commit하지 않고 전체를 한 트랜잭션으로 반영
+        """
+        job = ImportJob(filename, requested_by)
+        with self.lock:
+            self.jobs[job.id] = job
+            # 오래된 완료 작업부터 정리 (메모리 보호)
+            while len(self.jobs) > self.history:
+                oldest_id, oldest = next(iter(self.jobs.items()))
+                if oldest.status in ("queued", "running"):
+                    break
+                self.jobs.pop(oldest_id)
+        self.executor.submit(self._run, job, fileobj, mapping, sheets)
+        return job
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def list(self) -> List[ImportJob]:
+        with self.lock:
+            return list(reversed(self.jobs.values()))
+
+    def _run(self, job: ImportJob, fileobj: BinaryIO, mapping: ColumnMapping, sheets: Optional[Dict[str, ColumnMapping]]):
+        with job.lock:
+            job.status = "running"
+        db_session = SessionLocal()
+        progress = ImportResult()
+
+        def publish_progress():
+            with job.lock:
+                job.result = replace(progress, errors=list(progress.errors))
+
+        def on_batch(batch_result: ImportResult):
+            if sheets is not None and len(sheets) > 1:
+                # 여러 시트 명단은 마지막에 한 번에 commit (일부 시트만 반영되지 않도록)
+                publish_progress()
+                return
+            # 묶음 단위로 commit 하여 진행률이 바로 보이도록 함
+            db_session.commit()
+            invalidate_stats()
+            invalidate_member_cache() # 기존 회원의 소속/권한 변경 반영
+            publish_progress()
+
+        try:
+            # [최적화] 같은 파일을 같은 열 지정으로 다시 올린 경우 (그동안 회원 정보 변경이 없으면) DB에 다시 반영하지 않음
+            fingerprint = upload_fingerprint(fileobj, os.path.splitext(job.filename.lower())[1], mapping, sheets)
+            previous = recent_imports.find(db_session, fingerprint)
+            if previous is not None:
+                progress = replace(previous, errors=list(previous.errors))
+                publish_progress()
+                with job.lock:
+                    job.status = "completed"
+                    job.detail = f"{previous.message()} (같은 명단이 이미 등록되어 다시 반영하지 않았습니다)"
+                return
+
+            rows = iter_roster_rows(job.filename, fileobj, progress, mapping, sheets)
+            import_roster(db_session, rows, progress, self.chunk_size, on_batch=on_batch)
+            db_session.commit()
+            invalidate_stats()
+            invalidate_member_cache()
+            recent_imports.remember(db_session, fingerprint, replace(progress, errors=list(progress.errors)))
+            publish_progress()
+            with job.lock:
+                job.status = "completed"
+                job.detail = job.result.message()
+        except RosterFileError as e:
+            db_session.rollback()
+            publish_progress()
+            with job.lock:
+                job.status = "failed"
+                job.detail = str(e)
+        except Exception as e:
+            db_session.rollback()
+            print(f"Import Job Error: {str(e)}")
+            with job.lock:
+                job.status = "failed"
+                job.detail = f"회원 등록 중 서버 오류가 발생했습니다: {str(e)}"
+        finally:
+            db_session.close()
+            fileobj.close()
+            with job.lock:
+                job.finished_at = datetime.utcnow()
+
+
+import_jobs = ImportJobManager()
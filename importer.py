@@ -0,0 +1,575 @@
+import codecs
+import csv
+import io
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from openpyxl import load_workbook
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from clubs import get_division, join_clubs, split_clubs
+from models import Club, Member, MemberStatus, member_clubs
+
+# 명단 한 행: (원본 행 번호, 학번, 이름, 소속동아리)
+RosterRow = Tuple[int, str, str, str]
+
+# 헤더 행 판별용 키워드 (학번이나 이름 자리에 제목이 들어있는 경우)
+SID_HEADER_KEYWORDS = ["학번", "Student", "ID", "id"]
+NAME_HEADER_KEYWORDS = ["이름", "Name", "성명"]
+
+# 결과에 보관할 행 단위 오류 최대 개수 (응답 크기 제한)
+MAX_ROW_ERRORS = 200
+
+# 업로드 파일 임시 저장 설정 (이 크기를 넘으면 메모리 대신 디스크 임시 파일 사용)
+SPOOL_MAX_MEMORY_BYTES = int(os.getenv("IMPORT_SPOOL_MAX_MEMORY_BYTES", str(1024 * 1024)))
+READ_CHUNK_BYTES = 64 * 1024
+
+# 여러 시트 엑셀 파일을 동시에 읽을 프로세스 수 (시트 파싱은 CPU 작업이라 스레드 대신 프로세스 사용)
+# 워커마다 엑셀 파일 전체를 열어 메모리를 쓰므로 기본값은 작게 둠
+SHEET_WORKERS = int(os.getenv("IMPORT_SHEET_WORKERS", str(min(2, os.cpu_count() or 1))))
+
+
+class RosterFileError(ValueError):
+    """업로드된 명단 파일 자체를 읽거나 반영할 수 없는 경우 (인코딩, 형식 오류, 지원하지 않는 DB 등)"""
+
+
+@dataclass(frozen=True)
+class ColumnMapping:
+    """
+    명단 파일에서 이름/학번/소속동아리가 있는 열: 열 번호(0부터) 또는 헤더 행의 제목
+    header_rows: 데이터 앞에서 건너뛸 헤더 행 수 (빈 행 제외). 제목으로 지정한 열은 첫 헤더 행에서 찾음
+    club_name: 소속동아리 열이 없거나(club=None) 비어 있는 행에 사용할 동아리 이름 (예: 엑셀 시트 이름)
+    """
+    name: Union[int, str] = 0
+    sid: Union[int, str] = 1
+    club: Union[int, str, None] = 2
+    header_rows: int = 0
+    club_name: str = ""
+
+    @classmethod
+    def parse(cls, name, sid, club, header_rows: int = 0, club_name: str = "") -> "ColumnMapping":
+        """
+        폼 입력값("0", "학번" 등)으로 생성. 숫자는 열 번호, 그 외는 헤더 제목 (잘못된 값이면 RosterFileError)
+        club_name을 지정하면 소속동아리 열은 생략 가능
+        """
+        club_name = (club_name or "").strip()
+        columns = []
+        for label, value in (("이름", name), ("학번", sid), ("소속동아리", club)):
+            value = "" if value is None else str(value).strip()
+            if not value:
+                if label == "소속동아리" and club_name:
+                    columns.append(None)
+                    continue
+                raise RosterFileError(f"{label} 열을 지정해주세요.")
+            columns.append(int(value) if value.isdigit() else value)
+        if header_rows < 0:
+            raise RosterFileError("헤더 행 수는 0 이상이어야 합니다.")
+        specified = [c for c in columns if c is not None]
+        if len(set(specified)) < len(specified):
+            raise RosterFileError("이름, 학번, 소속동아리는 서로 다른 열이어야 합니다.")
+        if any(isinstance(c, str) for c in columns):
+            header_rows = max(header_rows, 1) # 제목으로 지정하면 첫 행은 헤더
+        return cls(*columns, header_rows=header_rows, club_name=club_name)
+
+    def indexes(self) -> Optional[Tuple[int, int, Optional[int]]]:
+        """(이름, 학번, 소속동아리) 열 번호. 헤더 제목으로 지정한 열이 있으면 None (resolve() 필요)"""
+        columns = (self.name, self.sid, self.club)
+        return None if any(isinstance(c, str) for c in columns) else columns
+
+    def resolve(self, header_cells: Sequence) -> Tuple[int, int, Optional[int]]:
+        """헤더 행에서 제목으로 지정한 열의 번호를 찾음"""
+        titles = [clean_cell(c) for c in header_cells]
+        indexes = []
+        for column in (self.name, self.sid, self.club):
+            if isinstance(column, str):
+                if column not in titles:
+                    raise RosterFileError(f"헤더에서 '{column}' 열을 찾을 수 없습니다.")
+                column = titles.index(column)
+            indexes.append(column)
+        specified = [c for c in indexes if c is not None]
+        if len(set(specified)) < len(specified):
+            raise RosterFileError("이름, 학번, 소속동아리는 서로 다른 열이어야 합니다.")
+        return tuple(indexes)
+
+
+# 기본 형식: 이름,학번,소속동아리 (헤더 행은 is_header_row()로 판별하여 제외)
+DEFAULT_COLUMNS = ColumnMapping()
+
+# 시트 파싱용 프로세스 풀 (여러 시트 등록을 처음 요청할 때 생성, _get_sheet_pool() 참고)
+_sheet_pool: Optional[ProcessPoolExecutor] = None
+_sheet_pool_lock = threading.Lock()
+
+
+@dataclass
+class ImportResult:
+    """명단 일괄 등록 진행 상황 및 결과 집계"""
+    total_rows: Optional[int] = None
+    processed: int = 0
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    errors: List[dict] = field(default_factory=list)
+    error_count: int = 0
+
+    def add_error(self, row_no: int, message: str):
+        self.error_count += 1
+        if len(self.errors) < MAX_ROW_ERRORS:
+            self.errors.append({"row": row_no, "message": message})
+
+    def message(self) -> str:
+        msg = f"신규 {self.inserted}명 등록 완료"
+        if self.updated > 0:
+            msg += f", {self.updated}명 소속 동아리 추가"
+        if self.skipped > 0:
+            msg += f" (중복회원 {self.skipped}명 제외)"
+        return msg
+
+
+def clean_cell(val) -> str:
+    if val is None:
+        return ""
+    s = str(val).strip()
+    # 엑셀에서 숫자가 20241234.0 처럼 읽히는 경우 .0 제거
+    if s.endswith('.0') and s.replace('.', '', 1).isdigit():
+        return s[:-2]
+    return s
+
+
+def is_header_row(sid: str, name: str) -> bool:
+    # 예: '학번', 'Student ID', '이름', 'Name', '성명' 등이 포함되면 헤더로 간주
+    return any(h in sid for h in SID_HEADER_KEYWORDS) or any(h in name for h in NAME_HEADER_KEYWORDS)
+
+
+def _to_roster_row(row_no: int, cells, result: Optional[ImportResult], columns: Tuple[int, int, Optional[int]] = (0, 1, 2), club_name: str = "") -> Optional[RosterRow]:
+    """원본 행을 (행 번호, 학번, 이름, 소속) 으로 변환. 빈 행은 None, 잘못된 행은 오류로 기록"""
+    values = [clean_cell(c) for c in cells] if cells else []
+    if not any(values):
+        return None
+    needed = max(c for c in columns if c is not None) + 1
+    if len(values) < needed:
+        if result is not None:
+            result.add_error(row_no, f"열이 {needed}개 미만입니다. (이름, 학번, 소속동아리)")
+        return None
+    # 지정한 열(기본: 이름(0), 학번(1), 소속동아리(2)) -> DB 처리용: (학번, 이름, 소속동아리)
+    name_idx, sid_idx, club_idx = columns
+    name, sid = values[name_idx], values[sid_idx]
+    club = (values[club_idx] if club_idx is not None else "") or club_name
+    if not sid or not name:
+        if result is not None:
+            result.add_error(row_no, "이름 또는 학번이 비어 있습니다.")
+        return None
+    return (row_no, sid, name, club)
+
+
+def _parse_rows(rows: Iterable[Tuple[int, Sequence]], result: Optional[ImportResult], mapping: ColumnMapping) -> Iterator[RosterRow]:
+    """(행 번호, 원본 셀들) -> RosterRow. 앞쪽 헤더 행은 건너뛰고, 제목으로 지정한 열은 헤더 행에서 찾음"""
+    columns = mapping.indexes()
+    headers_left = mapping.header_rows
+    for row_no, cells in rows:
+        if headers_left:
+            if not any(clean_cell(c) for c in cells or ()):
+                continue
+            if columns is None:
+                columns = mapping.resolve(cells)
+            headers_left -= 1
+            continue
+        if columns is None:
+            raise RosterFileError("파일에 헤더 행이 없습니다.")
+        parsed = _to_roster_row(row_no, cells, result, columns, mapping.club_name)
+        if parsed:
+            yield parsed
+
+
+def spool_upload(source: BinaryIO) -> BinaryIO:
+    """
+    업로드 스트림을 SpooledTemporaryFile로 복사 (작은 파일은 메모리, 큰 파일은 디스크)
+    요청이 끝난 뒤에도 백그라운드 작업에서 읽을 수 있도록 별도 복사본을 만든다
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY_BYTES)
+    shutil.copyfileobj(source, spool, READ_CHUNK_BYTES)
+    spool.seek(0)
+    return spool
+
+
+def _detect_csv_encoding(fileobj: BinaryIO) -> Tuple[str, int]:
+    """
+    파일 전체를 chunk 단위로 증분 디코딩하여 인코딩(UTF-8 또는 CP949) 판별 및 줄 수 계산
+    (파일 전체를 메모리에 올리지 않음)
+    """
+    for encoding in ("utf-8-sig", "cp949"):
+        fileobj.seek(0)
+        decoder = codecs.getincrementaldecoder(encoding)()
+        line_count = 0
+        try:
+            while True:
+                chunk = fileobj.read(READ_CHUNK_BYTES)
+                if not chunk:
+                    decoder.decode(b"", final=True)
+                    break
+                decoder.decode(chunk)
+                line_count += chunk.count(b"\n")
+        except UnicodeDecodeError:
+            continue
+        fileobj.seek(0)
+        return encoding, line_count + 1
+    raise RosterFileError("CSV 파일 인코딩 오류: UTF-8 또는 CP949 형식이 아닙니다.")
+
+
+def _iter_csv_rows(fileobj: BinaryIO, result: Optional[ImportResult], mapping: ColumnMapping) -> Iterator[RosterRow]:
+    encoding, line_count = _detect_csv_encoding(fileobj)
+    if result is not None:
+        result.total_rows = line_count
+    text = io.TextIOWrapper(fileobj, encoding=encoding, newline="")
+    try:
+        yield from _parse_rows(enumerate(csv.reader(text), start=1), result, mapping)
+    finally:
+        # TextIOWrapper가 원본 파일을 닫지 않도록 분리
+        text.detach()
+
+
+def _open_workbook(source: Union[str, BinaryIO]):
+    try:
+        # [최적화] read_only 모드: 시트 전체를 메모리에 올리지 않고 행 단위로 읽음
+        return load_workbook(source, read_only=True, data_only=True)
+    except zipfile.BadZipFile:
+        raise RosterFileError("엑셀 파일 형식이 올바르지 않습니다. (혹시 CSV 파일의 확장자만 .xlsx로 바꾸셨나요? 엑셀에서 '다른 이름으로 저장'을 통해 .xlsx로 저장해주세요.)")
+    except Exception as e:
+        print(f"Excel Error: {str(e)}") # 로그에 에러 출력
+        raise RosterFileError(f"엑셀 처리 중 오류가 발생했습니다: {str(e)}")
+
+
+def _iter_worksheet_rows(ws, result: Optional[ImportResult], mapping: ColumnMapping) -> Iterator[RosterRow]:
+    if result is not None:
+        result.total_rows = ws.max_row # 시트 메타데이터 기준 (진행률 표시용 추정치)
+    try:
+        yield from _parse_rows(enumerate(ws.iter_rows(values_only=True), start=1), result, mapping)
+    except RosterFileError:
+        raise
+    except Exception as e:
+        print(f"Excel Error: {str(e)}")
+        raise RosterFileError(f"엑셀 처리 중 오류가 발생했습니다: {str(e)}")
+
+
+def _get_worksheet(wb, sheet: Optional[str]):
+    if sheet is None:
+        return wb.active
+    if sheet not in wb.sheetnames:
+        raise RosterFileError(f"'{sheet}' 시트를 찾을 수 없습니다.")
+    return wb[sheet]
+
+
+def _iter_xlsx_rows(fileobj: BinaryIO, result: Optional[ImportResult], mapping: ColumnMapping, sheet: Optional[str] = None) -> Iterator[RosterRow]:
+    """sheet: 읽을 시트 이름 (None이면 활성 시트)"""
+    wb = _open_workbook(fileobj)
+    try:
+        yield from _iter_worksheet_rows(_get_worksheet(wb, sheet), result, mapping)
+    finally:
+        wb.close()
+
+
+def _parse_sheets(source: Union[str, BinaryIO], sheets: List[Tuple[str, ColumnMapping]]) -> List[Tuple[List[RosterRow], ImportResult]]:
+    """
+    [프로세스 풀 작업] 엑셀 파일을 한 번 열어 지정한 시트들을 차례로 읽음 (시트별 명단 행 목록과 집계)
+    파일을 열 때 공유 문자열 표 전체를 읽으므로, 시트마다 다시 열지 않고 워커별로 한 번만 엶
+    """
+    wb = _open_workbook(source)
+    try:
+        parsed = []
+        for sheet, mapping in sheets:
+            ws = _get_worksheet(wb, sheet)
+            result = ImportResult()
+            try:
+                rows = list(_iter_worksheet_rows(ws, result, mapping))
+            except RosterFileError as e:
+                raise RosterFileError(f"[{sheet}] {e}")
+            parsed.append((rows, result))
+        return parsed
+    finally:
+        wb.close()
+
+
+def _get_sheet_pool() -> ProcessPoolExecutor:
+    """
+    시트 파싱용 프로세스 풀 반환 (처음 사용할 때 생성)
+    워커 프로세스가 비정상 종료되어(메모리 부족 등) 풀이 깨졌으면 새로 만듦
+    """
+    global _sheet_pool
+    with _sheet_pool_lock:
+        if _sheet_pool is None or _sheet_pool._broken:
+            if _sheet_pool is not None:
+                _sheet_pool.shutdown(wait=False)
+            # spawn: 서버의 스레드/DB 연결을 복제하지 않음
+            _sheet_pool = ProcessPoolExecutor(max_workers=SHEET_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _sheet_pool
+
+
+def _iter_sheet_rows(fileobj: BinaryIO, result: Optional[ImportResult], sheets: Dict[str, ColumnMapping]) -> Iterator[RosterRow]:
+    """
+    [최적화] 여러 시트를 프로세스 풀에서 나눠 동시에 읽고, 지정한 시트 순서대로 이어서 전달
+    전체 소요 시간은 대략 가장 많이 맡은 워커 하나의 시간 (합치기/DB 반영은 호출하는 쪽에서 한 번에 수행)
+    """
+    items = list(sheets.items())
+    if len(items) == 1:
+        # 시트 하나는 목록으로 모으지 않고 활성 시트와 같이 행 단위로 바로 전달
+        sheet, mapping = items[0]
+        yield from _iter_xlsx_rows(fileobj, result, mapping, sheet)
+        return
+    workers = min(SHEET_WORKERS, len(items))
+    if workers <= 1:
+        parsed = _parse_sheets(fileobj, items)
+    else:
+        # 워커 프로세스가 파일을 직접 열 수 있도록 디스크에 저장 (워커마다 파일 내용을 복사해 전달하지 않음)
+        with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as tmp:
+            shutil.copyfileobj(fileobj, tmp, READ_CHUNK_BYTES)
+        try:
+            # 시트를 워커 수만큼 번갈아 나눔 (i번째 워커: i, i+workers, ... 번째 시트)
+            futures = [_get_sheet_pool().submit(_parse_sheets, tmp.name, items[i::workers]) for i in range(workers)]
+            try:
+                groups = [future.result() for future in futures]
+            except BrokenProcessPool:
+                # 깨진 풀은 다음 요청에서 새로 만들어짐
+                raise RosterFileError("엑셀 시트를 읽는 중 작업 프로세스가 비정상 종료되었습니다. 잠시 후 다시 시도해주세요.")
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+        finally:
+            os.unlink(tmp.name)
+        parsed = [None] * len(items)
+        for i, group in enumerate(groups):
+            parsed[i::workers] = group
+
+    if result is not None:
+        result.total_rows = sum(r.total_rows or 0 for _, r in parsed)
+        for (sheet, _), (_, sheet_result) in zip(items, parsed):
+            for error in sheet_result.errors:
+                result.add_error(error["row"], f"[{sheet}] {error['message']}")
+            result.error_count += sheet_result.error_count - len(sheet_result.errors)
+    for rows, _ in parsed:
+        yield from rows
+
+
+def parse_sheet_selection(text: str, default: ColumnMapping) -> Dict[str, ColumnMapping]:
+    """
+    엑셀 시트 선택(JSON 목록) -> {시트 이름: 열 지정} (잘못된 값이면 RosterFileError)
+    [{"sheet": "시트 이름", "name_col": 0, "sid_col": 1, "club_col": 2, "header_rows": 1, "club_from_title": true}, ...]
+    생략한 항목은 default(공통 열 지정)를 따르고, club_from_title이면 시트 이름을 소속 동아리로 사용
+    """
+    try:
+        entries = json.loads(text)
+    except ValueError:
+        raise RosterFileError("시트 선택 형식이 올바르지 않습니다. (JSON 목록)")
+    if not isinstance(entries, list) or not entries or not all(isinstance(e, dict) and e.get("sheet") for e in entries):
+        raise RosterFileError("시트 선택은 {\"sheet\": 시트 이름, ...} 항목의 목록이어야 합니다.")
+
+    sheets = {}
+    for entry in entries:
+        sheet = str(entry["sheet"])
+        if sheet in sheets:
+            raise RosterFileError(f"'{sheet}' 시트가 중복 선택되었습니다.")
+        try:
+            header_rows = int(entry.get("header_rows", default.header_rows))
+        except (TypeError, ValueError):
+            raise RosterFileError(f"[{sheet}] 헤더 행 수는 숫자여야 합니다.")
+        try:
+            sheets[sheet] = ColumnMapping.parse(
+                entry.get("name_col", default.name),
+                entry.get("sid_col", default.sid),
+                entry.get("club_col", default.club),
+                header_rows,
+                sheet if entry.get("club_from_title") else default.club_name,
+            )
+        except RosterFileError as e:
+            raise RosterFileError(f"[{sheet}] {e}")
+    return sheets
+
+
+def iter_roster_rows(
+    filename: str,
+    fileobj: BinaryIO,
+    result: Optional[ImportResult] = None,
+    mapping: ColumnMapping = DEFAULT_COLUMNS,
+    sheets: Optional[Dict[str, ColumnMapping]] = None,
+) -> Iterator[RosterRow]:
+    """
+    CSV 또는 Excel 명단 파일을 한 행씩 읽어 (행 번호, 학번, 이름, 소속동아리) 로 변환하는 generator
+    (기본 형식: 이름,학번,소속동아리 / mapping으로 원본 파일의 열을 지정)
+    sheets: 엑셀 파일에서 읽을 시트별 열 지정 (None이면 활성 시트만 mapping으로 읽음)
+    """
+    filename = (filename or "").lower()
+    if sheets is not None:
+        if not filename.endswith(".xlsx"):
+            raise RosterFileError("시트 선택은 .xlsx 파일에서만 사용할 수 있습니다.")
+        return _iter_sheet_rows(fileobj, result, sheets)
+    if filename.endswith(".csv"):
+        return _iter_csv_rows(fileobj, result, mapping)
+    if filename.endswith(".xlsx"):
+        return _iter_xlsx_rows(fileobj, result, mapping)
+    raise RosterFileError("지원하지 않는 파일 형식입니다. .csv 또는 .xlsx 파일을 사용해주세요.")
+
+
+def iter_batches(items: Iterable, batch_size: int) -> Iterator[List]:
+    """행(또는 학번) generator를 batch_size 크기의 목록으로 묶어서 전달"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def merge_roster_rows(rows: Iterable[RosterRow], result: ImportResult) -> Dict[str, List[Tuple[str, str]]]:
+    """
+    [최적화] 행들을 학번별로 모음 {학번: [(이름, 소속동아리), ...]} (파일에 나온 순서 유지)
+    같은 학번이 여러 행에 나와도 DB에는 한 번만 반영 (일괄 등록은 묶음 단위, 학기 명단 동기화는 명단 전체)
+    """
+    merged: Dict[str, List[Tuple[str, str]]] = {}
+    for row_no, sid, name, club in rows:
+        result.processed += 1
+        # 헤더 행 스킵 (학번이나 이름 자리에 제목이 들어있는 경우 건너뜀)
+        if is_header_row(sid, name):
+            continue
+        merged.setdefault(sid, []).append((name, club))
+    return merged
+
+
+def _plan_member(sid: str, rows: List[Tuple[str, str]], existing, result: ImportResult) -> Optional[dict]:
+    """
+    한 학번의 행들을 순서대로 적용한 최종 상태 (변경이 없으면 None)
+    집계는 행 단위: 신규 회원은 1명, 기존 회원은 동아리가 추가된 행마다 updated, 아니면 skipped
+    existing: DB의 (학번, 소속동아리, 권한) 행 또는 None
+    """
+    if existing is None:
+        # 완전히 새로운 회원: 첫 행의 이름으로 등록하고, 이후 행의 동아리는 별도 집계 없이 추가
+        name, first_club = rows[0]
+        clubs = split_clubs(first_club)
+        # 이름이 '김근호'이거나 소속 동아리가 '총동아리연합회'이면 관리자 권한 부여
+        is_admin = first_club == "총동아리연합회" or name == "김근호"
+        for row_name, club in rows[1:]:
+            added = [c for c in split_clubs(club) if c not in clubs]
+            if added:
+                clubs += added
+                if club == "총동아리연합회" or row_name == "김근호":
+                    is_admin = True
+        result.inserted += 1
+        return {"student_id": sid, "name": name, "clubs": clubs, "role": "admin" if is_admin else "member"}
+
+    # DB에 이미 존재하는 경우: 소속 동아리 추가 (중복되지 않게)
+    clubs = split_clubs(existing.club)
+    role = existing.role
+    changed = False
+    for _, club in rows:
+        added = [c for c in split_clubs(club) if c not in clubs]
+        if added:
+            clubs += added
+            changed = True
+            # 총동아리연합회가 추가되면 관리자 권한 부여
+            if club == "총동아리연합회":
+                role = "admin"
+            result.updated += 1
+        else:
+            result.skipped += 1 # 이미 해당 동아리가 있거나 변경사항 없음
+    if not changed:
+        return None
+    return {"student_id": sid, "name": None, "clubs": clubs, "role": role}
+
+
+def _dialect_insert(db_session: Session):
+    # INSERT ... ON CONFLICT 문법은 DB 종류별 insert()에서만 제공
+    dialect = db_session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql_insert
+    if dialect == "sqlite":
+        return sqlite_insert
+    # 작업 실패 메시지로 관리자에게 그대로 보이도록 RosterFileError 사용
+    raise RosterFileError(f"명단 일괄 등록은 PostgreSQL/SQLite DB에서만 사용할 수 있습니다. (현재: {dialect})")
+
+
+def upsert_members(db_session: Session, planned: List[dict]):
+    """
+    [최적화] 변경할 회원들을 ORM 객체 없이 묶음 SQL로 반영 (commit은 호출하는 쪽에서 수행)
+    1. clubs: 새 동아리 INSERT ... ON CONFLICT DO NOTHING
+    2. members: INSERT ... ON CONFLICT(student_id) DO UPDATE (기존 회원은 소속 동아리/권한만 갱신)
+    3. member_clubs: 소속 관계 INSERT ... ON CONFLICT DO NOTHING (동아리 추가만 하므로 삭제 없음)
+    """
+    if not planned:
+        return
+    insert = _dialect_insert(db_session)
+
+    club_names = list(dict.fromkeys(c for p in planned for c in p["clubs"]))
+    club_ids = {}
+    if club_names:
+        db_session.execute(
+            insert(Club.__table__).on_conflict_do_nothing(index_elements=["name"]),
+            [{"name": n, "division": get_division(n)} for n in club_names],
+        )
+        club_ids = dict(db_session.execute(select(Club.name, Club.id).where(Club.name.in_(club_names))).all())
+
+    stmt = insert(Member.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["student_id"],
+        set_={"club": stmt.excluded.club, "role": stmt.excluded.role},
+    )
+    db_session.execute(stmt, [
+        {
+            "student_id": p["student_id"],
+            "name": p["name"],
+            "club": join_clubs(p["clubs"]),
+            "password": None, # 초기 비밀번호('1234') 상태로 등록 (첫 비밀번호 변경 시 해시 저장)
+            "role": p["role"],
+            "status": MemberStatus.active,
+        }
+        for p in planned
+    ])
+
+    sids = [p["student_id"] for p in planned]
+    member_ids = dict(db_session.execute(select(Member.student_id, Member.id).where(Member.student_id.in_(sids))).all())
+    links = [
+        {"member_id": member_ids[p["student_id"]], "club_id": club_ids[c]}
+        for p in planned for c in p["clubs"]
+    ]
+    if links:
+        db_session.execute(insert(member_clubs).on_conflict_do_nothing(), links)
+
+
+def import_roster(db_session: Session, rows: Iterable[RosterRow], result: ImportResult, batch_size: int, on_batch=None):
+    """
+    [최적화] batch_size행씩 읽어 묶음 안에서 학번별로 합치고, 기존 회원을 한 번에 조회한 뒤 묶음 SQL로 반영
+    파일 전체를 메모리에 모으지 않음 (메모리 사용량은 묶음 크기만큼)
+    다른 묶음에 다시 나온 학번은 앞 묶음에서 반영된 회원으로 조회되어 소속 동아리만 추가됨 (같은 트랜잭션 안에서 조회)
+    on_batch(batch_result)가 주어지면 묶음마다 호출 (백그라운드 작업은 on_batch에서 commit 및 진행률 갱신)
+    """
+    for chunk in iter_batches(rows, batch_size):
+        merged = merge_roster_rows(chunk, result)
+        batch_result = ImportResult()
+        existing = {
+            row.student_id: row
+            for row in db_session.execute(
+                select(Member.student_id, Member.club, Member.role).where(Member.student_id.in_(list(merged)))
+            )
+        }
+        planned = []
+        for sid, member_rows in merged.items():
+            plan = _plan_member(sid, member_rows, existing.get(sid), batch_result)
+            if plan is not None:
+                planned.append(plan)
+        upsert_members(db_session, planned)
+        result.inserted += batch_result.inserted
+        result.updated += batch_result.updated
+        result.skipped += batch_result.skipped
+        if on_batch:
+            on_batch(batch_result)
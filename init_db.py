@@ -1,5 +1,5 @@
 from database import get_db
-from models import Member, MemberStatus
+from models import Member, MemberStatus, sync_member_clubs
 from passlib.context import CryptContext
 
 # 비밀번호 해싱 설정 (main.py 의존성 제거를 위해 직접 정의)
@@ -23,6 +23,7 @@ def init_db_data():
             status=MemberStatus.active,
             role="admin"
         )
+        sync_member_clubs(db, admin_user)
         db.add(admin_user)
         print("✅ 관리자 계정 생성됨 (ID: admin)")
     else:
@@ -38,6 +39,7 @@ def init_db_data():
             status=MemberStatus.active,
             role="member"
         )
+        sync_member_clubs(db, test_user)
         db.add(test_user)
         print("✅ 테스트 계정 생성됨 (ID: 20240001)")
     else:
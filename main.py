@@ -1,28 +1,49 @@
 
-from fastapi import Depends, FastAPI, HTTPException, status, UploadFile, File
+from fastapi import Depends, FastAPI, Form, Header, HTTPException, Query, Request, status, UploadFile, File
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from pydantic import BaseModel
-from typing import Optional, List
-import csv
-import codecs
+from typing import Dict, Optional, List
 import os
-import io
-import zipfile
-from openpyxl import load_workbook
+import hmac
+import time
+import threading
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 
-from jose import JWTError, jwt
+from jose import JWTError
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 
 # 내부 모듈 임포트
 import database as db
-from database import get_db
+from database import AsyncSessionLocal, get_async_db, get_db
 import models
-from models import Member, MemberStatus
+from models import ChatMessage, Club, Member, MemberStatus, member_clubs, sync_member_clubs
+from clubs import join_clubs, split_clubs
+import migrate
+from member_queries import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, member_count_statement, member_filters, member_page_statement, split_page,
+)
+from stats import get_stats, invalidate_stats
+from events import event_broker, format_sse
+from notices import NOTICE_HISTORY_LIMIT, create_notice, get_current_notice, notice_etag, notice_history
+from member_cache import CurrentMember, cache_member, current_generation, get_cached_member, invalidate_member_cache
+from assets import build_assets
+from tokens import decode_token, encode_token
+from importer import ColumnMapping, ImportResult, RosterFileError, parse_sheet_selection, import_roster, iter_roster_rows, spool_upload
+from idempotency import IDEMPOTENCY_HEADER, recent_imports, upload_fingerprint, upload_requests
+from import_jobs import IMPORT_CHUNK_SIZE, import_jobs
+from roster_sync import RosterSyncConflict, apply_roster_sync, plan_roster_sync, sync_previews
 
 # 데이터베이스 테이블 생성 (실제 운영 환경에서는 Alembic 같은 마이그레이션 도구 사용 권장)
 models.Base.metadata.create_all(bind=db.engine)
+# 기존 members.club 문자열을 clubs / member_clubs 테이블로 이전 (이미 이전된 회원은 건너뜀)
+migrate.run_migrations()
 
 # --- 보안 및 인증 설정 ---
 
@@ -35,9 +56,22 @@ ALGORITHM = "HS256"
 MEMBER_TOKEN_EXPIRE_MINUTES = 10 # 일반 회원 10분
 ADMIN_TOKEN_EXPIRE_MINUTES = 10 # 관리자 10분
 
+# [최적화] bcrypt 해시/검증은 CPU를 오래 쓰므로 이벤트 루프 밖의 전용 스레드 풀에서 실행
+# (bcrypt는 해시 중 GIL을 놓기 때문에 스레드로도 병렬 처리됨, 풀 크기로 동시 해시 수 제한)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+
+# 신규/초기화 회원의 초기 비밀번호
+DEFAULT_PASSWORD = "1234"
+
 # DB 초기화용 비밀키
 INIT_DB_SECRET = os.getenv("INIT_DB_SECRET", "local-init-secret")
 
+# 브라우저에서 /events(SSE)에 직접 접속할 수 있도록 허용할 프론트엔드 주소 (콤마 구분)
+# 기본값은 로컬 Streamlit 주소만 허용. 배포 시 프론트엔드 주소를 지정 ("*"는 모든 사이트 허용이므로 주의)
+CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "http://localhost:8501").split(",") if o.strip()]
+EVENTS_HEARTBEAT_SECONDS = 15 # 연결 유지용 빈 메시지 전송 간격
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 # --- 유틸리티 함수 ---
@@ -48,6 +82,28 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+def verify_member_password(user: Member, plain_password: str) -> bool:
+    """
+    회원 비밀번호 확인. password 컬럼이 비어 있으면(None) 아직 비밀번호를 바꾸지 않은
+    '초기 비밀번호' 상태이므로 bcrypt 없이 DEFAULT_PASSWORD와 비교한다.
+    """
+    # [최적화] 일괄 등록 시 회원마다 bcrypt 해시를 만들지 않고 초기 비밀번호 상태로 저장
+    # (초기 비밀번호는 모두 '1234'로 공개된 값이므로 해시를 저장해도 보안 수준은 동일)
+    if user.password is None:
+        return hmac.compare_digest(plain_password.encode("utf-8"), DEFAULT_PASSWORD.encode("utf-8"))
+    return verify_password(plain_password, user.password)
+
+async def run_password_task(func, *args):
+    """비밀번호 해시/검증 함수를 password_executor에서 실행하고 결과를 기다림 (이벤트 루프는 다른 요청 처리)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, func, *args)
+
+async def verify_member_password_async(user: Member, plain_password: str) -> bool:
+    # 초기 비밀번호 상태는 해시 비교가 없으므로 바로 확인
+    if user.password is None:
+        return verify_member_password(user, plain_password)
+    return await run_password_task(verify_password, plain_password, user.password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -55,7 +111,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = encode_token(to_encode, SECRET_KEY, ALGORITHM)
     return encoded_jwt
 
 # --- Pydantic 모델 (데이터 유효성 검사) ---
@@ -79,24 +135,147 @@ class MemberCreate(BaseModel):
     name: str
     club: str
 
+class DivisionCount(BaseModel):
+    division: Optional[str] = None
+    member_count: int
+
+class MemberPage(BaseModel):
+    items: List[MemberInfo]
+    next_cursor: Optional[str] = None
+    total: int
+
+class ClubInfo(BaseModel):
+    name: str
+    division: Optional[str] = None
+    member_count: int
+
+class StatsInfo(BaseModel):
+    total: int
+    active: int
+    admins: int
+    club_count: int
+    clubs: List[ClubInfo]
+    divisions: List[DivisionCount]
+    generated_at: datetime
+
+class MemberBatchRequest(BaseModel):
+    action: str # delete, status, role, club, reset-password
+    student_ids: List[str]
+    value: Optional[str] = None # status/role/club 변경 시 바꿀 값
+
+class MemberBatchItem(BaseModel):
+    student_id: str
+    ok: bool
+    message: str
+
+class MemberBatchResult(BaseModel):
+    action: str
+    succeeded: int
+    failed: int
+    results: List[MemberBatchItem]
+
+class ChatMessageInfo(BaseModel):
+    id: int
+    student_id: Optional[str] = None
+    name: str
+    club: Optional[str] = None
+    role: str
+    message: str
+    created_at: Optional[datetime] = None
+
+class ChatMessageCreate(BaseModel):
+    message: str
+
+class ChatPage(BaseModel):
+    items: List[ChatMessageInfo]
+    deleted_ids: List[int]
+    has_more: bool # 더 오래된 메시지가 있는지 (before_id 조회용)
+
+class NoticeInfo(BaseModel):
+    version: int
+    text: str
+    created_by: Optional[str] = None
+    created_at: Optional[datetime] = None
+    publish_at: Optional[datetime] = None
+
+class NoticeUpdate(BaseModel):
+    text: str
+    publish_at: Optional[datetime] = None # 예약 게시 시각 (없으면 바로 게시)
+
 class PasswordUpdate(BaseModel):
     current_password: str
     new_password: str
 
+class ImportRowError(BaseModel):
+    row: int
+    message: str
+
+class ImportJobStatus(BaseModel):
+    job_id: str
+    filename: str
+    requested_by: str
+    status: str
+    total_rows: Optional[int] = None
+    processed: int
+    inserted: int
+    updated: int
+    skipped: int
+    error_count: int
+    errors: List[ImportRowError]
+    message: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+class RosterSyncChange(BaseModel):
+    kind: str # added, removed, changed
+    student_id: str
+    name: Optional[str] = None
+    before: List[str]
+    after: List[str]
+    delete: bool # 소속 동아리가 하나도 남지 않는 회원
+
+class RosterSyncPreview(BaseModel):
+    token: str
+    clubs: List[str] # 명단에 나온 동아리 (이 동아리들의 소속만 명단 기준으로 맞춤)
+    added: int
+    removed: int
+    changed: int
+    unchanged: int
+    deletable: int
+    changes: List[RosterSyncChange]
+    error_count: int
+    errors: List[ImportRowError]
+    created_at: datetime
+
+class RosterSyncResult(BaseModel):
+    message: str
+    added: int
+    removed: int
+    changed: int
+    deleted: int
+
 # --- FastAPI 애플리케이션 생성 ---
 
 app = FastAPI()
 
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=CORS_ORIGINS,
+    allow_methods=["GET"],
+    allow_headers=["*"],
+)
+
 # --- 인증 관련 의존성 함수 ---
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db_session: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db_session: AsyncSession = Depends(get_async_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        # [최적화] 한 번 검증한 토큰은 만료 시각까지 캐시된 내용을 사용 (tokens.py)
+        payload = decode_token(token, SECRET_KEY, ALGORITHM)
         student_id: str = payload.get("sub")
         if student_id is None:
             raise credentials_exception
@@ -104,13 +283,22 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db_session: Sess
     except JWTError:
         raise credentials_exception
     
-    user = db_session.query(Member).filter(Member.student_id == token_data.student_id).first()
+    # [최적화] 카드 화면이 /members/me, /token/refresh를 계속 호출하므로 회원 정보를 메모리에 캐시
+    # (회원 정보 변경 API에서 invalidate_member_cache()로 즉시 무효화)
+    cached = get_cached_member(token_data.student_id)
+    if cached is not None:
+        return cached
+
+    generation = current_generation()
+    user = await db_session.scalar(select(Member).where(Member.student_id == token_data.student_id))
     if user is None:
         raise credentials_exception
-    return user
+    current = CurrentMember.from_member(user)
+    cache_member(current, generation)
+    return current
 
 # [보안] 관리자 권한 의존성 주입
-def get_current_admin(current_user: Member = Depends(get_current_user)):
+def get_current_admin(current_user: CurrentMember = Depends(get_current_user)):
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -124,13 +312,42 @@ def get_current_admin(current_user: Member = Depends(get_current_user)):
 def read_root():
     return {"message": "Digital Membership API is running. Please access the Streamlit frontend application to use the service."}
 
+# --- 정적 파일 (로고 이미지) ---
+
+# [최적화] 로고를 화면마다 base64로 넣지 않고, 서버 시작 시 크기를 줄인 WebP 변환본을 만들어 주소로 제공
+# 파일 이름에 내용 해시가 들어가므로 브라우저가 한 번 받은 뒤로는 다시 요청하지 않음
+STATIC_ASSETS = build_assets()
+ASSETS_BY_FILENAME = {asset.filename: asset for asset in STATIC_ASSETS.values()}
+ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+@app.get("/assets/manifest")
+def read_asset_manifest(response: Response):
+    """
+    [공통] 로고 이름별 현재 파일 주소 ({"ku-logo": "/assets/ku-logo.<해시>.webp", ...})
+    """
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return {name: f"/assets/{asset.filename}" for name, asset in STATIC_ASSETS.items()}
+
+@app.get("/assets/{filename}")
+def read_asset(filename: str, request: Request):
+    asset = ASSETS_BY_FILENAME.get(filename)
+    if asset is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="파일을 찾을 수 없습니다.")
+    etag = f'"{filename}"'
+    headers = {"ETag": etag, "Cache-Control": ASSET_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=asset.data, media_type=asset.media_type, headers=headers)
+
 @app.post("/token", response_model=Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db_session: Session = Depends(get_db)):
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db_session: AsyncSession = Depends(get_async_db)):
     """
     학번(username)과 비밀번호로 로그인하여 JWT 토큰 발급
     """
-    user = db_session.query(Member).filter(Member.student_id == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.password):
+    user = await db_session.scalar(select(Member).where(Member.student_id == form_data.username))
+    # 해시 검증을 기다리는 동안 DB 연결을 붙잡고 있지 않도록 세션을 먼저 닫음 (조회한 값은 그대로 사용 가능)
+    await db_session.close()
+    if not user or not await verify_member_password_async(user, form_data.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect student_id or password",
@@ -150,7 +367,7 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     return {"access_token": access_token, "token_type": "bearer"}
 
 @app.post("/token/refresh", response_model=Token)
-async def refresh_access_token(current_user: Member = Depends(get_current_user)):
+async def refresh_access_token(current_user: CurrentMember = Depends(get_current_user)):
     """
     [공통] 현재 유효한 토큰을 이용해 만료 시간을 초기화(연장)한 새 토큰 발급
     """
@@ -166,205 +383,506 @@ async def refresh_access_token(current_user: Member = Depends(get_current_user))
     return {"access_token": access_token, "token_type": "bearer"}
 
 @app.get("/members/me", response_model=MemberInfo)
-async def read_users_me(current_user: Member = Depends(get_current_user)):
+async def read_users_me(current_user: CurrentMember = Depends(get_current_user)):
     """
     인증된 사용자의 '이름, 학번, 상태' 정보 조회
     """
     return current_user
 
 @app.put("/members/me/password")
-def update_password(password_data: PasswordUpdate, db_session: Session = Depends(get_db), current_user: Member = Depends(get_current_user)):
+async def update_password(password_data: PasswordUpdate, db_session: AsyncSession = Depends(get_async_db), current_user: CurrentMember = Depends(get_current_user)):
     """
     인증된 사용자가 자신의 비밀번호를 변경
     """
+    # 캐시된 회원 정보에는 비밀번호 해시가 없으므로 DB에서 다시 조회
+    user = await db_session.get(Member, current_user.id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    await db_session.close() # 해시 계산 중에는 DB 연결 반환
+
     # 현재 비밀번호 확인
-    if not verify_password(password_data.current_password, current_user.password):
+    if not await verify_member_password_async(user, password_data.current_password):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Incorrect current password")
     
     # 새 비밀번호로 업데이트
-    current_user.password = get_password_hash(password_data.new_password)
-    db_session.commit()
+    new_hash = await run_password_task(get_password_hash, password_data.new_password)
+    await db_session.execute(update(Member).where(Member.id == user.id).values(password=new_hash))
+    await db_session.commit()
+    invalidate_member_cache(user.student_id)
     
     return {"message": "Password updated successfully"}
 
-# --- 관리자 전용 API ---
+# --- 자유 소통방 API ---
+
+CHAT_PAGE_SIZE = 50
+CHAT_MAX_PAGE_SIZE = 200
+CHAT_MESSAGE_MAX_LENGTH = 1000
 
-@app.get("/admin/members", response_model=List[MemberInfo])
-def read_all_members(db_session: Session = Depends(get_db), admin: Member = Depends(get_current_admin)):
+@app.get("/chat/messages", response_model=ChatPage)
+async def read_chat_messages(
+    after_id: Optional[int] = None,
+    before_id: Optional[int] = None,
+    window_start: Optional[int] = None,
+    limit: int = Query(CHAT_PAGE_SIZE, ge=1, le=CHAT_MAX_PAGE_SIZE),
+    db_session: AsyncSession = Depends(get_async_db),
+    current_user: CurrentMember = Depends(get_current_user),
+):
     """
-    [관리자] 전체 회원 목록 조회
+    [공통] 자유 소통방 메시지 조회 (id 오름차순)
+    - after_id: 이 id 이후의 새 메시지만 조회 (화면 갱신 시 증분 조회)
+    - before_id: 이 id 이전의 메시지 중 최근 limit개 (이전 기록 더 보기)
+    - 둘 다 없으면 최근 limit개
+    window_start ~ after_id 범위에서 삭제된 메시지 id는 deleted_ids로 함께 반환
     """
-    return db_session.query(Member).order_by(Member.club, Member.student_id).all()
+    visible = ChatMessage.deleted_at.is_(None)
+    if after_id is not None:
+        stmt = select(ChatMessage).where(visible, ChatMessage.id > after_id).order_by(ChatMessage.id).limit(limit)
+        items = list((await db_session.scalars(stmt)).all())
+    else:
+        stmt = select(ChatMessage).where(visible)
+        if before_id is not None:
+            stmt = stmt.where(ChatMessage.id < before_id)
+        # 최근 limit개를 id 내림차순으로 가져온 뒤 화면 표시 순서(오름차순)로 뒤집음
+        items = list((await db_session.scalars(stmt.order_by(ChatMessage.id.desc()).limit(limit))).all())[::-1]
 
-@app.post("/admin/upload-csv")
-async def upload_csv(file: UploadFile = File(...), db_session: Session = Depends(get_db), admin: Member = Depends(get_current_admin)):
+    has_more = False
+    if after_id is None:
+        oldest = items[0].id if items else before_id
+        if oldest is not None:
+            older = await db_session.scalar(select(ChatMessage.id).where(visible, ChatMessage.id < oldest).limit(1))
+            has_more = older is not None
+
+    deleted_ids = []
+    if window_start is not None and after_id is not None:
+        deleted_ids = list((await db_session.scalars(
+            select(ChatMessage.id).where(
+                ChatMessage.deleted_at.isnot(None), ChatMessage.id >= window_start, ChatMessage.id <= after_id
+            )
+        )).all())
+
+    return {"items": items, "deleted_ids": deleted_ids, "has_more": has_more}
+
+@app.post("/chat/messages", response_model=ChatMessageInfo)
+async def create_chat_message(chat: ChatMessageCreate, db_session: AsyncSession = Depends(get_async_db), current_user: CurrentMember = Depends(get_current_user)):
     """
-    [관리자] CSV 또는 Excel 파일로 회원 일괄 등록 (형식: 이름,학번,소속동아리)
+    [공통] 자유 소통방 메시지 작성 (작성자 정보는 로그인한 회원 정보로 기록)
     """
-    filename = file.filename.lower()
-    rows = []
+    text = chat.message.strip()
+    if not text:
+        raise HTTPException(status_code=400, detail="메시지를 입력해주세요.")
+    if len(text) > CHAT_MESSAGE_MAX_LENGTH:
+        raise HTTPException(status_code=400, detail=f"메시지는 {CHAT_MESSAGE_MAX_LENGTH}자까지 입력할 수 있습니다.")
 
-    content = await file.read()
+    message = ChatMessage(
+        student_id=current_user.student_id,
+        name=current_user.name,
+        club=current_user.club if current_user.club else "소속 없음",
+        role="assistant" if current_user.role == "admin" else "user",
+        message=text,
+        created_at=datetime.now(),
+    )
+    db_session.add(message)
+    await db_session.commit()
+    event_broker.publish("chat", {"id": message.id})
+    return message
 
-    if filename.endswith(".csv"):
-        try:
-            decoded = content.decode('utf-8-sig')
-        except UnicodeDecodeError:
-            try:
-                decoded = content.decode('cp949')
-            except UnicodeDecodeError:
-                raise HTTPException(status_code=400, detail="CSV 파일 인코딩 오류: UTF-8 또는 CP949 형식이 아닙니다.")
-
-        reader = csv.reader(decoded.splitlines())
-        for row in reader:
-            if len(row) >= 3:
-                # 입력 순서: 이름(0), 학번(1), 소속동아리(2) -> DB 처리용: (학번, 이름, 소속동아리)
-                sid = row[1].strip()
-                name = row[0].strip()
-                club = row[2].strip()
-                if sid and name:
-                    rows.append((sid, name, club))
-    
-    elif filename.endswith(".xlsx"):
-        try:
-            wb = load_workbook(io.BytesIO(content), data_only=True)
-            ws = wb.active
-            for row in ws.iter_rows(values_only=True):
-                if row and len(row) >= 3:
-                    # 데이터가 없는 경우 방지 및 문자열 변환
-                    # 입력 순서: 이름(0), 학번(1), 소속동아리(2)
-                    name_val = row[0]
-                    sid_val = row[1]
-                    club_val = row[2]
-                    
-                    def clean_cell(val):
-                        if val is None: return ""
-                        s = str(val).strip()
-                        # 엑셀에서 숫자가 20241234.0 처럼 읽히는 경우 .0 제거
-                        if s.endswith('.0') and s.replace('.', '', 1).isdigit():
-                            return s[:-2]
-                        return s
-
-                    name = clean_cell(name_val)
-                    sid = clean_cell(sid_val)
-                    club = clean_cell(club_val)
-                    
-                    if sid and name:
-                        rows.append((sid, name, club))
-        except zipfile.BadZipFile:
-            raise HTTPException(status_code=400, detail="엑셀 파일 형식이 올바르지 않습니다. (혹시 CSV 파일의 확장자만 .xlsx로 바꾸셨나요? 엑셀에서 '다른 이름으로 저장'을 통해 .xlsx로 저장해주세요.)")
-        except Exception as e:
-            print(f"Excel Error: {str(e)}") # 로그에 에러 출력
-            raise HTTPException(status_code=400, detail=f"엑셀 처리 중 오류가 발생했습니다: {str(e)}")
+@app.delete("/chat/messages/{message_id}")
+async def delete_chat_message(message_id: int, db_session: AsyncSession = Depends(get_async_db), current_user: CurrentMember = Depends(get_current_user)):
+    """
+    [공통] 자유 소통방 메시지 삭제 (본인 메시지 또는 관리자). 행은 남기고 삭제 시각만 기록
+    """
+    message = await db_session.get(ChatMessage, message_id)
+    if not message or message.deleted_at is not None:
+        raise HTTPException(status_code=404, detail="Message not found")
+
+    # 예전 메시지(학번 없음)는 이름으로 본인 여부 확인
+    is_mine = message.student_id == current_user.student_id if message.student_id else message.name == current_user.name
+    if not is_mine and current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="본인이 작성한 메시지만 삭제할 수 있습니다.")
+
+    message.deleted_at = datetime.now()
+    await db_session.commit()
+    event_broker.publish("chat_deleted", {"id": message_id})
+    return {"message": "삭제 완료"}
+
+# --- 공지사항 / 실시간 알림 API ---
+
+NOTICE_MAX_LENGTH = 1000
+
+def publish_notice_event():
+    # 알림을 받은 화면은 /notice를 다시 조회 (조건부 요청)
+    event_broker.publish("notice")
+
+@app.get("/notice", response_model=NoticeInfo)
+def read_notice(request: Request, response: Response, db_session: Session = Depends(get_db), current_user: CurrentMember = Depends(get_current_user)):
+    """
+    [공통] 현재 게시 중인 공지사항 (회원증 상단 배너)
+    ETag(버전)를 함께 반환하며, If-None-Match가 같으면 본문 없이 304 응답
+    """
+    notice = get_current_notice(db_session)
+    etag = notice_etag(notice)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return notice
+
+@app.put("/admin/notice", response_model=NoticeInfo)
+def update_notice(notice: NoticeUpdate, db_session: Session = Depends(get_db), admin: CurrentMember = Depends(get_current_admin)):
+    """
+    [관리자] 공지사항 새 버전 등록 (내용을 비우면 배너가 사라짐)
+    publish_at을 지정하면 해당 시각에 게시(예약), 없으면 바로 게시하고 접속 중인 회원증 화면에 전달
+    """
+    if len(notice.text) > NOTICE_MAX_LENGTH:
+        raise HTTPException(status_code=400, detail=f"공지사항은 {NOTICE_MAX_LENGTH}자까지 입력할 수 있습니다.")
+
+    publish_at = notice.publish_at
+    if publish_at is not None and publish_at.tzinfo is not None:
+        publish_at = publish_at.astimezone().replace(tzinfo=None) # 서버 시간대 기준으로 저장
+    if publish_at is not None and publish_at <= datetime.now():
+        publish_at = None
+
+    created = create_notice(db_session, notice.text, admin.student_id, publish_at)
+    if publish_at is None:
+        publish_notice_event()
     else:
-        raise HTTPException(status_code=400, detail="지원하지 않는 파일 형식입니다. .csv 또는 .xlsx 파일을 사용해주세요.")
-    
-    success_count = 0
-    updated_count = 0
-    skip_count = 0
-    
-    # [중요] 이번 요청에서 새로 추가된 회원을 임시 저장 (파일 내 중복 방지)
-    new_members_cache = {}
+        # 예약 시각에 접속 중인 화면에 알림 (서버가 재시작되면 다음 조회 때 반영)
+        timer = threading.Timer((publish_at - datetime.now()).total_seconds(), publish_notice_event)
+        timer.daemon = True
+        timer.start()
+    return created
 
-    # [최적화] 파일에 있는 학번들을 미리 DB에서 조회하여 맵핑 (N+1 쿼리 방지 및 정확성 향상)
-    # 헤더가 아닌 유효한 학번만 추출
-    valid_sids = [r[0] for r in rows if not (any(h in r[0] for h in ["학번", "Student", "ID", "id"]) or any(h in r[1] for h in ["이름", "Name", "성명"]))]
-    
-    # DB에 존재하는 회원들을 한 번에 가져옴
-    existing_members_query = db_session.query(Member).filter(Member.student_id.in_(valid_sids)).all()
-    existing_members_map = {m.student_id: m for m in existing_members_query}
+@app.get("/admin/notices", response_model=List[NoticeInfo])
+def read_notice_history(limit: int = Query(NOTICE_HISTORY_LIMIT, ge=1, le=200), db_session: Session = Depends(get_db), admin: CurrentMember = Depends(get_current_admin)):
+    """
+    [관리자] 공지사항 수정 기록 (최신 버전부터, 예약된 공지사항 포함)
+    """
+    return notice_history(db_session, limit)
 
+@app.get("/events")
+async def stream_events(request: Request, token: str):
+    """
+    [공통] 채팅/공지사항 변경 알림 (Server-Sent Events)
+    브라우저 EventSource는 헤더를 보낼 수 없으므로 토큰을 query로 받음. 토큰이 만료되면 auth_expired 이벤트 후 연결 종료
+    """
+    async with AsyncSessionLocal() as db_session:
+        await get_current_user(token=token, db_session=db_session)
+    expires_at = decode_token(token, SECRET_KEY, ALGORITHM).get("exp")
+
+    queue = event_broker.subscribe()
+
+    async def event_stream():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                if expires_at and time.time() >= expires_at:
+                    # 만료된 토큰으로 다시 접속하지 않도록 종료 이벤트를 보낸 뒤 연결 종료
+                    yield "event: auth_expired\ndata: {}\n\n"
+                    break
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=EVENTS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if message is None: # 처리하지 못한 이벤트가 너무 많이 밀림 -> 재접속 유도
+                    break
+                yield format_sse(message)
+        finally:
+            event_broker.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# --- 관리자 전용 API ---
+
+@app.get("/admin/members", response_model=MemberPage)
+async def read_all_members(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+    club: Optional[List[str]] = Query(None),
+    division: Optional[str] = None,
+    member_status: Optional[MemberStatus] = Query(None, alias="status"),
+    role: Optional[str] = None,
+    sort: str = "student_id",
+    db_session: AsyncSession = Depends(get_async_db),
+    admin: CurrentMember = Depends(get_current_admin),
+):
+    """
+    [관리자] 회원 목록 조회 (keyset 페이지네이션)
+    q: 이름/학번 앞부분 검색, club: 동아리(여러 개 가능), division: 분과, status/role: 상태/권한
+    sort: student_id, name, club ('-' 접두사는 내림차순). 다음 페이지는 next_cursor 사용
+    """
+    filters = member_filters(q=q, clubs=club, division=division, status=member_status, role=role)
     try:
-        for sid, name, club in rows:
-            # 헤더 행 스킵 (학번이나 이름 자리에 제목이 들어있는 경우 건너뜀)
-            # 예: '학번', 'Student ID', '이름', 'Name', '성명' 등이 포함되면 헤더로 간주
-            if any(header in sid for header in ["학번", "Student", "ID", "id"]) or any(header in name for header in ["이름", "Name", "성명"]): continue
-
-            # 1. DB에 이미 존재하는지 확인 (미리 가져온 맵에서 확인)
-            if sid in existing_members_map:
-                existing_member = existing_members_map[sid]
-                # 이미 존재하는 경우: 소속 동아리 추가 (중복되지 않게)
-                current_clubs = [c.strip() for c in (existing_member.club or "").split(',')]
-                if club and club not in current_clubs:
-                    if existing_member.club:
-                        existing_member.club += f", {club}"
-                    else:
-                        existing_member.club = club
-                    
-                    # 총동아리연합회가 추가되면 관리자 권한 부여
-                    if club == "총동아리연합회":
-                        existing_member.role = "admin"
-                    
-                    updated_count += 1
-                else:
-                    skip_count += 1 # 이미 해당 동아리가 있거나 변경사항 없음
-            
-            # 2. DB에는 없지만, 이번 파일 업로드로 방금 추가된 회원인지 확인 (캐시 확인)
-            elif sid in new_members_cache:
-                member_to_update = new_members_cache[sid]
-                current_clubs = [c.strip() for c in (member_to_update.club or "").split(',')]
-                if club and club not in current_clubs:
-                    if member_to_update.club:
-                        member_to_update.club += f", {club}"
-                    else:
-                        member_to_update.club = club
-                    
-                    if club == "총동아리연합회" or name == "김근호":
-                        member_to_update.role = "admin"
-                    # 이미 success_count에 포함되었으므로 카운트는 유지하거나 updated로 이동 가능하나, 
-                    # 사용자 혼동 방지를 위해 여기서는 별도 카운트 증가 없이 진행
-            
-            else:
-                # 3. 완전히 새로운 회원 등록
-                # 이름이 '김근호'이거나 소속 동아리가 '총동아리연합회'이면 관리자 권한 부여
-                role = "admin" if club == "총동아리연합회" or name == "김근호" else "member"
-                # 초기 비밀번호는 '1234'로 설정
-                new_member = Member(
-                    student_id=sid,
-                    name=name,
-                    club=club,
-                    password=get_password_hash("1234"),
-                    role=role,
-                    status=MemberStatus.active
-                )
-                db_session.add(new_member)
-                new_members_cache[sid] = new_member # 캐시에 등록
-                success_count += 1
-        
+        stmt = member_page_statement(filters, sort, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    members = (await db_session.scalars(stmt)).all()
+    items, next_cursor = split_page(members, sort, limit)
+    total = await db_session.scalar(member_count_statement(filters))
+    return {"items": items, "next_cursor": next_cursor, "total": total}
+
+@app.get("/admin/stats", response_model=StatsInfo)
+def read_stats(db_session: Session = Depends(get_db), admin: CurrentMember = Depends(get_current_admin)):
+    """
+    [관리자] 대시보드 통계 (전체/활동/관리자 수, 동아리별·분과별 회원 수)
+    SQL 집계 결과를 서버에 캐시하며, 회원 정보가 바뀌면 즉시 무효화
+    """
+    return get_stats(db_session)
+
+@app.get("/admin/clubs", response_model=List[ClubInfo])
+def read_clubs(division: Optional[str] = None, db_session: Session = Depends(get_db), admin: CurrentMember = Depends(get_current_admin)):
+    """
+    [관리자] 등록된 동아리 목록 (분과, 소속 회원 수). 회원이 없는 동아리는 제외
+    """
+    query = (
+        db_session.query(Club.name, Club.division, func.count(member_clubs.c.member_id).label("member_count"))
+        .join(member_clubs, member_clubs.c.club_id == Club.id)
+        .group_by(Club.id, Club.name, Club.division)
+        .order_by(Club.name)
+    )
+    if division:
+        query = query.filter(Club.division == division)
+    return [{"name": name, "division": div, "member_count": count} for name, div, count in query.all()]
+
+@app.get("/admin/clubs/{club_name}/members", response_model=List[MemberInfo])
+def read_club_members(club_name: str, db_session: Session = Depends(get_db), admin: CurrentMember = Depends(get_current_admin)):
+    """
+    [관리자] 특정 동아리 소속 회원 목록 (member_clubs 인덱스 조회)
+    """
+    return (
+        db_session.query(Member)
+        .join(member_clubs, member_clubs.c.member_id == Member.id)
+        .join(Club, Club.id == member_clubs.c.club_id)
+        .filter(Club.name == club_name)
+        .order_by(Member.student_id)
+        .all()
+    )
+
+def get_roster_columns(
+    name_col: str = Form("0"),
+    sid_col: str = Form("1"),
+    club_col: str = Form("2"),
+    header_rows: int = Form(0),
+    club_name: str = Form(""),
+) -> ColumnMapping:
+    """
+    명단 업로드 폼의 열 지정 (열 번호(0부터) 또는 헤더 제목, 기본값: 이름,학번,소속동아리 순서)
+    club_name: 소속동아리 열이 없거나 비어 있는 행에 사용할 동아리 이름
+    [최적화] 원본 파일과 열 지정만 받아 서버에서 한 번만 읽음 (프론트엔드에서 CSV로 다시 변환하지 않음)
+    """
+    try:
+        return ColumnMapping.parse(name_col, sid_col, club_col, header_rows, club_name)
+    except RosterFileError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def get_roster_sheets(sheets: Optional[str] = Form(None), columns: ColumnMapping = Depends(get_roster_columns)) -> Optional[Dict[str, ColumnMapping]]:
+    """
+    [기능 추가] 엑셀 파일의 여러 시트를 한 번에 등록 (JSON 목록, 없으면 활성 시트만)
+    예: [{"sheet": "축구부", "club_col": null, "club_from_title": true}, {"sheet": "농구부", "name_col": 1, "sid_col": 0}]
+    시트별로 생략한 열 지정은 name_col 등 공통 값을 따름. 시트들은 동시에 읽고 한 번에 반영
+    """
+    if not sheets:
+        return None
+    try:
+        return parse_sheet_selection(sheets, columns)
+    except RosterFileError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/admin/upload-csv")
+def upload_csv(
+    file: UploadFile = File(...),
+    columns: ColumnMapping = Depends(get_roster_columns),
+    sheets: Optional[Dict[str, ColumnMapping]] = Depends(get_roster_sheets),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+    db_session: Session = Depends(get_db),
+    admin: CurrentMember = Depends(get_current_admin),
+):
+    """
+    [관리자] CSV 또는 Excel 파일로 회원 일괄 등록 (기본 형식: 이름,학번,소속동아리 / name_col 등으로 열 지정)
+    요청 안에서 전체를 처리하는 동기 방식. 대용량 명단은 /admin/imports 사용 권장
+    [최적화] 중복 업로드 방지: 같은 Idempotency-Key 헤더로 다시 요청하면 파일을 읽지 않고 이전 응답 반환,
+    같은 파일을 같은 열 지정으로 다시 올리면(파일 내용의 SHA-256 지문) 그동안 회원 정보 변경이 없었다면 DB에 다시 반영하지 않음
+    """
+    request_key = ("upload-csv", admin.student_id, idempotency_key) if idempotency_key else None
+    if request_key:
+        first, previous_response = upload_requests.claim(request_key)
+        if not first:
+            return previous_response
+
+    result = ImportResult()
+    response = None
+    try:
+        fingerprint = upload_fingerprint(file.file, os.path.splitext((file.filename or "").lower())[1], columns, sheets)
+        previous = recent_imports.find(db_session, fingerprint)
+        if previous is not None:
+            response = {"message": f"{previous.message()} (같은 명단이 이미 등록되어 다시 반영하지 않았습니다)"}
+            return response
+
+        # [최적화] 파일을 행 단위로 읽어 묶음마다 학번별로 합친 뒤 묶음 SQL로 반영
+        rows = iter_roster_rows(file.filename, file.file, result, columns, sheets)
+        import_roster(db_session, rows, result, IMPORT_CHUNK_SIZE)
         db_session.commit()
-        
-        msg = f"신규 {success_count}명 등록 완료"
-        if updated_count > 0:
-            msg += f", {updated_count}명 소속 동아리 추가"
-        if skip_count > 0:
-            msg += f" (중복회원 {skip_count}명 제외)"
-            
-        return {"message": msg}
+        invalidate_stats()
+        # 기존 회원의 소속/권한이 바뀌었을 수 있으므로 회원 정보 캐시 전체 무효화
+        invalidate_member_cache()
+        recent_imports.remember(db_session, fingerprint, result)
+        response = {"message": result.message()}
+        return response
+    except RosterFileError as e:
+        db_session.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         db_session.rollback()
         print(f"Upload Error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"회원 등록 중 서버 오류가 발생했습니다: {str(e)}")
+    finally:
+        if request_key:
+            if response is not None:
+                upload_requests.complete(request_key, response)
+            else:
+                upload_requests.release(request_key)
+
+@app.post("/admin/imports", response_model=ImportJobStatus, status_code=status.HTTP_202_ACCEPTED)
+def create_import_job(
+    file: UploadFile = File(...),
+    columns: ColumnMapping = Depends(get_roster_columns),
+    sheets: Optional[Dict[str, ColumnMapping]] = Depends(get_roster_sheets),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+    admin: CurrentMember = Depends(get_current_admin),
+):
+    """
+    [관리자] 명단 일괄 등록 작업 생성. 작업 ID를 즉시 반환하고 등록은 백그라운드에서 진행
+    진행 상황은 GET /admin/imports/{job_id} 로 조회
+    같은 Idempotency-Key 헤더로 다시 요청하면 새 작업을 만들지 않고 기존 작업을 반환
+    """
+    filename = (file.filename or "").lower()
+    if not (filename.endswith(".csv") or filename.endswith(".xlsx")):
+        raise HTTPException(status_code=400, detail="지원하지 않는 파일 형식입니다. .csv 또는 .xlsx 파일을 사용해주세요.")
+
+    request_key = ("imports", admin.student_id, idempotency_key) if idempotency_key else None
+    if request_key:
+        while True:
+            first, job_id = upload_requests.claim(request_key)
+            if first:
+                break
+            job = import_jobs.get(job_id)
+            if job is not None:
+                return job.to_dict()
+            # 작업 기록이 이미 정리된 키: 저장된 결과를 지우고 다시 확인 (먼저 claim한 요청이 새 작업을 만듦)
+            upload_requests.discard(request_key, job_id)
+
+    try:
+        # 요청이 끝나면 업로드 파일이 닫히므로 백그라운드 작업용 임시 파일로 복사
+        spooled = spool_upload(file.file)
+        job = import_jobs.submit(file.filename, spooled, requested_by=admin.student_id, mapping=columns, sheets=sheets)
+    except Exception:
+        if request_key:
+            upload_requests.release(request_key)
+        raise
+    if request_key:
+        upload_requests.complete(request_key, job.id)
+    return job.to_dict()
+
+@app.get("/admin/imports", response_model=List[ImportJobStatus])
+def list_import_jobs(admin: CurrentMember = Depends(get_current_admin)):
+    """
+    [관리자] 최근 일괄 등록 작업 목록 (최신순)
+    """
+    return [job.to_dict() for job in import_jobs.list()]
+
+@app.get("/admin/imports/{job_id}", response_model=ImportJobStatus)
+def read_import_job(job_id: str, admin: CurrentMember = Depends(get_current_admin)):
+    """
+    [관리자] 일괄 등록 작업 진행 상황 조회 (처리/신규/갱신/제외 행 수 및 행 단위 오류)
+    """
+    job = import_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job.to_dict()
+
+@app.post("/admin/roster-sync", response_model=RosterSyncPreview)
+def preview_roster_sync(
+    file: UploadFile = File(...),
+    columns: ColumnMapping = Depends(get_roster_columns),
+    sheets: Optional[Dict[str, ColumnMapping]] = Depends(get_roster_sheets),
+    db_session: Session = Depends(get_db),
+    admin: CurrentMember = Depends(get_current_admin),
+):
+    """
+    [관리자] 학기 명단 동기화 미리보기
+    명단에 나온 동아리의 현재 소속 회원과 비교하여 추가/제외/변경/유지 회원을 계산 (DB는 변경하지 않음)
+    반환된 token으로 POST /admin/roster-sync/{token}/apply 호출 시 변경 사항만 반영
+    """
+    result = ImportResult()
+    try:
+        rows = iter_roster_rows(file.filename, file.file, result, columns, sheets)
+        plan = plan_roster_sync(db_session, rows, result, requested_by=admin.student_id)
+    except RosterFileError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return plan.summary()
+
+@app.post("/admin/roster-sync/{token}/apply", response_model=RosterSyncResult)
+def apply_roster_sync_preview(token: str, delete_members: bool = False, db_session: Session = Depends(get_db), admin: CurrentMember = Depends(get_current_admin)):
+    """
+    [관리자] 미리보기한 명단 동기화를 한 트랜잭션으로 적용
+    delete_members=true이면 소속 동아리가 하나도 남지 않는 회원(관리자 제외)은 회원 정보도 삭제
+    """
+    plan = sync_previews.get(token)
+    if plan is None:
+        raise HTTPException(status_code=404, detail="미리보기가 만료되었습니다. 명단을 다시 업로드해주세요.")
+    try:
+        counts = apply_roster_sync(db_session, plan, delete_members=delete_members)
+        db_session.commit()
+    except RosterSyncConflict as e:
+        db_session.rollback()
+        sync_previews.pop(token)
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except RosterFileError as e:
+        db_session.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        db_session.rollback()
+        print(f"Roster Sync Error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"명단 동기화 중 서버 오류가 발생했습니다: {str(e)}")
+    sync_previews.pop(token)
+    if plan.changes:
+        invalidate_stats()
+        invalidate_member_cache()
+
+    message = f"추가 {counts['added']}명, 제외 {counts['removed']}명, 변경 {counts['changed']}명 반영 완료"
+    if counts["deleted"]:
+        message += f" (회원 {counts['deleted']}명 삭제)"
+    if not plan.changes:
+        message = "변경 사항이 없습니다."
+    return {"message": message, **counts}
 
 @app.post("/admin/members", response_model=MemberInfo)
-def create_member(member: MemberCreate, db_session: Session = Depends(get_db), admin: Member = Depends(get_current_admin)):
+def create_member(member: MemberCreate, db_session: Session = Depends(get_db), admin: CurrentMember = Depends(get_current_admin)):
     """
     [관리자] 개별 회원 직접 등록
     """
     existing_member = db_session.query(Member).filter(Member.student_id == member.student_id).first()
     if existing_member:
         # 이미 존재하는 회원이면 소속 동아리만 추가
-        current_clubs = [c.strip() for c in (existing_member.club or "").split(',')]
-        if member.club and member.club not in current_clubs:
-            if existing_member.club:
-                existing_member.club += f", {member.club}"
-            else:
-                existing_member.club = member.club
+        current_clubs = split_clubs(existing_member.club)
+        new_clubs = [c for c in split_clubs(member.club) if c not in current_clubs]
+        if new_clubs:
+            existing_member.club = join_clubs(current_clubs + new_clubs)
+            sync_member_clubs(db_session, existing_member)
             
             # 총동아리연합회 소속이 추가되거나 이름이 김근호인 경우 관리자 권한 부여
             if member.club == "총동아리연합회" or member.name == "김근호":
                 existing_member.role = "admin"
             
             db_session.commit()
+            invalidate_stats()
+            invalidate_member_cache(existing_member.student_id)
             db_session.refresh(existing_member)
             return existing_member
         else:
@@ -377,37 +895,112 @@ def create_member(member: MemberCreate, db_session: Session = Depends(get_db), a
         student_id=member.student_id,
         name=member.name,
         club=member.club,
-        password=get_password_hash("1234"), # 초기 비밀번호는 1234로 설정
+        password=None, # 초기 비밀번호(1234) 상태
         role=role,
         status=MemberStatus.active
     )
+    sync_member_clubs(db_session, new_member)
     db_session.add(new_member)
     db_session.commit()
+    invalidate_stats()
+    invalidate_member_cache(new_member.student_id)
     db_session.refresh(new_member)
     return new_member
 
+# 일괄 작업 종류와 성공 메시지
+MEMBER_BATCH_ACTIONS = {
+    "delete": "삭제 완료",
+    "status": "상태 변경 완료",
+    "role": "회원 권한 변경 완료",
+    "club": "소속 동아리 변경 완료",
+    "reset-password": "비밀번호 초기화 완료",
+}
+MAX_BATCH_SIZE = 1000
+
+@app.post("/admin/members/batch", response_model=MemberBatchResult)
+def batch_update_members(batch: MemberBatchRequest, db_session: Session = Depends(get_db), admin: CurrentMember = Depends(get_current_admin)):
+    """
+    [관리자] 여러 회원에 대한 삭제/상태/권한/소속 동아리 변경/비밀번호 초기화를 한 번에 처리
+    하나의 트랜잭션에서 처리하고 마지막에 한 번만 commit. 회원별 처리 결과를 함께 반환
+    """
+    if batch.action not in MEMBER_BATCH_ACTIONS:
+        raise HTTPException(status_code=400, detail=f"action은 {', '.join(MEMBER_BATCH_ACTIONS)} 중 하나여야 합니다.")
+    if batch.action in ("status", "role", "club") and not batch.value:
+        raise HTTPException(status_code=400, detail="변경할 값(value)을 입력해주세요.")
+    if batch.action == "status" and batch.value not in MemberStatus.__members__:
+        raise HTTPException(status_code=400, detail="status 값은 active 또는 inactive 여야 합니다.")
+
+    student_ids = list(dict.fromkeys(batch.student_ids)) # 중복 제거 (순서 유지)
+    if len(student_ids) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_BATCH_SIZE}명까지 처리할 수 있습니다.")
+
+    # [최적화] 대상 회원을 한 번의 쿼리로 조회 (삭제/소속 변경 시 member_clubs도 함께 로딩)
+    query = db_session.query(Member).filter(Member.student_id.in_(student_ids))
+    if batch.action in ("delete", "club"):
+        query = query.options(selectinload(Member.clubs))
+    members = {m.student_id: m for m in query.all()} if student_ids else {}
+
+    club_cache = {}
+    results = []
+    for sid in student_ids:
+        user = members.get(sid)
+        if not user:
+            results.append({"student_id": sid, "ok": False, "message": "User not found"})
+            continue
+
+        if batch.action == "delete":
+            db_session.delete(user)
+        elif batch.action == "status":
+            user.status = MemberStatus[batch.value]
+        elif batch.action == "role":
+            user.role = batch.value
+        elif batch.action == "club":
+            user.club = join_clubs(split_clubs(batch.value))
+            sync_member_clubs(db_session, user, club_cache)
+        elif batch.action == "reset-password":
+            user.password = None # 초기 비밀번호(1234) 상태로 되돌림
+        results.append({"student_id": sid, "ok": True, "message": MEMBER_BATCH_ACTIONS[batch.action]})
+
+    done = [r["student_id"] for r in results if r["ok"]]
+    if done:
+        db_session.commit()
+        invalidate_stats()
+        invalidate_member_cache(*done)
+
+    return {
+        "action": batch.action,
+        "succeeded": len(done),
+        "failed": len(results) - len(done),
+        "results": results,
+    }
+
 @app.patch("/admin/members/{student_id}/status")
-def update_member_status(student_id: str, status: str, db_session: Session = Depends(get_db), admin: Member = Depends(get_current_admin)):
+def update_member_status(student_id: str, status: str, db_session: Session = Depends(get_db), admin: CurrentMember = Depends(get_current_admin)):
     user = db_session.query(Member).filter(Member.student_id == student_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     user.status = MemberStatus.active if status == "active" else MemberStatus.inactive
     db_session.commit()
+    invalidate_stats()
+    invalidate_member_cache(student_id)
     return {"message": "상태 변경 완료"}
 
 @app.patch("/admin/members/{student_id}/club")
-def update_member_club(student_id: str, club: str, db_session: Session = Depends(get_db), admin: Member = Depends(get_current_admin)):
+def update_member_club(student_id: str, club: str, db_session: Session = Depends(get_db), admin: CurrentMember = Depends(get_current_admin)):
     user = db_session.query(Member).filter(Member.student_id == student_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    user.club = club
+    user.club = join_clubs(split_clubs(club))
+    sync_member_clubs(db_session, user)
     db_session.commit()
+    invalidate_stats()
+    invalidate_member_cache(student_id)
     return {"message": "소속 동아리 변경 완료"}
 
 @app.patch("/admin/members/{student_id}/id")
-def update_member_id(student_id: str, new_id: str, db_session: Session = Depends(get_db), admin: Member = Depends(get_current_admin)):
+def update_member_id(student_id: str, new_id: str, db_session: Session = Depends(get_db), admin: CurrentMember = Depends(get_current_admin)):
     if db_session.query(Member).filter(Member.student_id == new_id).first():
         raise HTTPException(status_code=400, detail="이미 존재하는 학번입니다.")
     
@@ -417,30 +1010,35 @@ def update_member_id(student_id: str, new_id: str, db_session: Session = Depends
     
     user.student_id = new_id
     db_session.commit()
+    invalidate_member_cache(student_id, new_id)
     return {"message": "학번 변경 완료"}
 
 @app.patch("/admin/members/{student_id}/role")
-def update_member_role(student_id: str, role: str, db_session: Session = Depends(get_db), admin: Member = Depends(get_current_admin)):
+def update_member_role(student_id: str, role: str, db_session: Session = Depends(get_db), admin: CurrentMember = Depends(get_current_admin)):
     user = db_session.query(Member).filter(Member.student_id == student_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     user.role = role
     db_session.commit()
+    invalidate_stats()
+    invalidate_member_cache(student_id)
     return {"message": "회원 권한 변경 완료"}
 
 @app.delete("/admin/members/{student_id}")
-def delete_member(student_id: str, db_session: Session = Depends(get_db), admin: Member = Depends(get_current_admin)):
+def delete_member(student_id: str, db_session: Session = Depends(get_db), admin: CurrentMember = Depends(get_current_admin)):
     user = db_session.query(Member).filter(Member.student_id == student_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     db_session.delete(user)
     db_session.commit()
+    invalidate_stats()
+    invalidate_member_cache(student_id)
     return {"message": "삭제 완료"}
 
 @app.patch("/admin/members/{student_id}/reset-password")
-def reset_password(student_id: str, db_session: Session = Depends(get_db), admin: Member = Depends(get_current_admin)):
+def reset_password(student_id: str, db_session: Session = Depends(get_db), admin: CurrentMember = Depends(get_current_admin)):
     """
     [관리자] 특정 회원의 비밀번호를 '1234'로 초기화
     """
@@ -448,8 +1046,9 @@ def reset_password(student_id: str, db_session: Session = Depends(get_db), admin
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    user.password = get_password_hash("1234")
+    user.password = None # 초기 비밀번호(1234) 상태로 되돌림
     db_session.commit()
+    invalidate_member_cache(student_id)
     return {"message": f"Password for {student_id} has been reset to '1234'."}
 
 @app.get("/init-db")
@@ -474,6 +1073,7 @@ def init_database(secret: Optional[str] = None, db_session: Session = Depends(ge
             status=MemberStatus.active,
             role="admin"
         )
+        sync_member_clubs(db_session, admin_user)
         db_session.add(admin_user)
         messages.append("관리자 계정(admin) 생성 완료")
     
@@ -487,6 +1087,7 @@ def init_database(secret: Optional[str] = None, db_session: Session = Depends(ge
             status=MemberStatus.active,
             role="member"
         )
+        sync_member_clubs(db_session, test_user)
         db_session.add(test_user)
         messages.append("테스트 계정(20240001) 생성 완료")
         
@@ -494,4 +1095,6 @@ def init_database(secret: Optional[str] = None, db_session: Session = Depends(ge
         messages.append("이미 모든 계정이 존재합니다.")
         
     db_session.commit()
+    invalidate_stats()
+    invalidate_member_cache()
     return {"status": "success", "details": messages}
@@ -0,0 +1,66 @@
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from cache import TTLCache
+from models import Member, MemberStatus
+
+# 인증된 회원 정보 캐시 (토큰 subject(학번) -> 회원 정보)
+# 회원 정보를 바꾸는 API에서 invalidate_member_cache()로 즉시 무효화하고,
+# 여러 워커 프로세스로 실행할 때를 대비해 짧은 TTL을 함께 적용
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "30"))
+AUTH_CACHE_MAX_SIZE = int(os.getenv("AUTH_CACHE_MAX_SIZE", "4096"))
+
+_member_cache = TTLCache(maxsize=AUTH_CACHE_MAX_SIZE, ttl=AUTH_CACHE_TTL_SECONDS)
+# 조회 도중 회원 정보가 바뀌면 오래된 값이 캐시에 남지 않도록 세대(generation) 번호로 확인
+_generation = 0
+
+
+@dataclass(frozen=True)
+class CurrentMember:
+    """
+    인증된 회원 정보 스냅샷 (세션에 묶이지 않은 읽기 전용 값)
+    비밀번호 해시는 보관하지 않으므로 비밀번호 확인/변경 시에는 DB에서 다시 조회
+    """
+    id: int
+    student_id: str
+    name: str
+    club: Optional[str]
+    status: MemberStatus
+    role: str
+
+    @classmethod
+    def from_member(cls, member: Member) -> "CurrentMember":
+        return cls(
+            id=member.id,
+            student_id=member.student_id,
+            name=member.name,
+            club=member.club,
+            status=member.status,
+            role=member.role,
+        )
+
+
+def current_generation() -> int:
+    return _generation
+
+
+def get_cached_member(student_id: str) -> Optional[CurrentMember]:
+    return _member_cache.get(student_id)
+
+
+def cache_member(member: CurrentMember, generation: int):
+    """generation: 조회를 시작하기 전에 current_generation()으로 받아 둔 값"""
+    if generation == _generation:
+        _member_cache.set(member.student_id, member)
+
+
+def invalidate_member_cache(*student_ids: str):
+    """학번을 주면 해당 회원만, 주지 않으면 전체 캐시를 무효화"""
+    global _generation
+    _generation += 1
+    if not student_ids:
+        _member_cache.clear()
+        return
+    for student_id in student_ids:
+        _member_cache.pop(student_id)
@@ -0,0 +1,111 @@
+import base64
+import json
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, exists, func, or_, select
+
+from models import Club, Member, member_clubs
+
+# 관리자 회원 목록 정렬 기준 ('-' 접두사는 내림차순). 동률은 항상 학번으로 정렬
+MEMBER_SORT_COLUMNS = {
+    "student_id": Member.student_id,
+    "name": Member.name,
+    "club": Member.club,
+}
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(values: Sequence) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(values), ensure_ascii=False).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8"))
+    except Exception:
+        raise ValueError("잘못된 cursor 값입니다.")
+    if not isinstance(values, list) or len(values) != 2:
+        raise ValueError("잘못된 cursor 값입니다.")
+    return values
+
+
+def parse_sort(sort: str) -> Tuple[str, bool]:
+    """'name' -> ('name', False), '-name' -> ('name', True)"""
+    descending = sort.startswith("-")
+    key = sort.lstrip("-")
+    if key not in MEMBER_SORT_COLUMNS:
+        raise ValueError(f"정렬 기준은 {', '.join(MEMBER_SORT_COLUMNS)} 중 하나여야 합니다.")
+    return key, descending
+
+
+def _prefix(column, text: str):
+    # LIKE 대신 범위 조건을 사용하여 SQLite/PostgreSQL 모두 B-tree 인덱스를 탈 수 있도록 함
+    return and_(column >= text, column < text + "\U0010ffff")
+
+
+def member_filters(
+    q: Optional[str] = None,
+    clubs: Optional[List[str]] = None,
+    division: Optional[str] = None,
+    status: Optional[str] = None,
+    role: Optional[str] = None,
+) -> list:
+    """관리자 회원 목록 검색 조건 (이름/학번 앞부분 검색, 동아리, 분과, 상태, 권한)"""
+    filters = []
+    if q and q.strip():
+        q = q.strip()
+        filters.append(or_(_prefix(Member.name, q), _prefix(Member.student_id, q)))
+    if clubs:
+        filters.append(exists().where(
+            member_clubs.c.member_id == Member.id,
+            member_clubs.c.club_id == Club.id,
+            Club.name.in_(clubs),
+        ))
+    if division:
+        filters.append(exists().where(
+            member_clubs.c.member_id == Member.id,
+            member_clubs.c.club_id == Club.id,
+            Club.division == division,
+        ))
+    if status:
+        filters.append(Member.status == status)
+    if role:
+        filters.append(Member.role == role)
+    return filters
+
+
+def member_page_statement(filters: list, sort: str, limit: int, cursor: Optional[str] = None):
+    """
+    keyset(cursor) 방식 페이지 조회문. 다음 페이지 존재 여부 확인을 위해 limit + 1건 조회
+    """
+    key, descending = parse_sort(sort)
+    column = MEMBER_SORT_COLUMNS[key]
+    stmt = select(Member).where(*filters)
+
+    if cursor:
+        last_value, last_sid = decode_cursor(cursor)
+        if descending:
+            stmt = stmt.where(or_(column < last_value, and_(column == last_value, Member.student_id < last_sid)))
+        else:
+            stmt = stmt.where(or_(column > last_value, and_(column == last_value, Member.student_id > last_sid)))
+
+    if key == "student_id":
+        order_by = [column.desc() if descending else column.asc()]
+    else:
+        order_by = [column.desc(), Member.student_id.desc()] if descending else [column.asc(), Member.student_id.asc()]
+    return stmt.order_by(*order_by).limit(limit + 1)
+
+
+def member_count_statement(filters: list):
+    return select(func.count()).select_from(Member).where(*filters)
+
+
+def split_page(members: list, sort: str, limit: int) -> Tuple[list, Optional[str]]:
+    """limit + 1건 조회 결과를 (현재 페이지, 다음 페이지 cursor) 로 분리"""
+    if len(members) <= limit:
+        return members, None
+    items = members[:limit]
+    key, _ = parse_sort(sort)
+    last = items[-1]
+    return items, encode_cursor([getattr(last, key), last.student_id])
@@ -0,0 +1,173 @@
+import json
+import os
+from datetime import datetime
+
+from sqlalchemy import exists, func, or_
+from sqlalchemy.orm import selectinload
+
+from clubs import NO_CLUB_VALUES, get_division, join_clubs, split_clubs
+from database import Base, SessionLocal, engine
+from models import ChatMessage, Club, Member, Notice, member_clubs, sync_member_clubs
+
+# 한 번에 이전할 회원 수
+BACKFILL_BATCH_SIZE = 500
+# 예전 자유 소통방 기록 파일 (chat_messages 테이블로 이전)
+CHAT_HISTORY_FILE = os.getenv("CHAT_HISTORY_FILE", "chat_history.json")
+# 예전 공지사항 파일 (notices 테이블로 이전)
+NOTICE_FILE = os.getenv("NOTICE_FILE", "notice.txt")
+
+def backfill_member_clubs(db_session) -> int:
+    """
+    [마이그레이션] members.club 문자열(콤마 구분)을 clubs / member_clubs 테이블로 이전
+    소속 관계가 아직 없는 회원만 처리하므로 여러 번 실행해도 안전함
+    """
+    has_clubs = exists().where(member_clubs.c.member_id == Member.id)
+    club_cache = {}
+    migrated = 0
+    last_id = 0
+    while True:
+        # id 기준 keyset 페이지 (동아리 이름이 공백뿐이라 관계가 생기지 않는 회원도 다시 조회하지 않음)
+        members = (
+            db_session.query(Member)
+            .options(selectinload(Member.clubs))
+            .filter(Member.id > last_id, Member.club.isnot(None), Member.club != "", ~has_clubs)
+            .order_by(Member.id)
+            .limit(BACKFILL_BATCH_SIZE)
+            .all()
+        )
+        if not members:
+            break
+        for member in members:
+            sync_member_clubs(db_session, member, club_cache)
+            if member.clubs:
+                migrated += 1
+        last_id = members[-1].id
+        db_session.commit()
+    return migrated
+
+def normalize_club_strings(db_session) -> int:
+    """
+    [마이그레이션] 쉼표 외의 구분 기호(，/&+)나 괄호/따옴표, '소속없음'이 들어간 예전 소속 동아리 문자열을
+    공통 규칙(clubs.split_clubs)으로 다시 저장하고 소속 관계도 갱신 (정리된 회원은 다시 조회되지 않음)
+    """
+    irregular = or_(
+        *[Member.club.contains(ch) for ch in "，/&+[]'\""],
+        func.lower(func.trim(Member.club)).in_(NO_CLUB_VALUES),
+    )
+    members = db_session.query(Member).options(selectinload(Member.clubs)).filter(irregular).all()
+    club_cache = {}
+    for member in members:
+        member.club = join_clubs(split_clubs(member.club))
+        sync_member_clubs(db_session, member, club_cache)
+    if members:
+        db_session.commit()
+    return len(members)
+
+def sync_club_divisions(db_session) -> int:
+    """
+    [마이그레이션] clubs.division을 현재 분과표(clubs.CLUB_DIVISIONS) 기준으로 갱신
+    (분과 정보는 서버의 clubs 테이블에 저장되고, 프론트엔드는 /admin/clubs로 받아서 사용)
+    """
+    changed = 0
+    for club in db_session.query(Club).all():
+        division = get_division(club.name)
+        if club.division != division:
+            club.division = division
+            changed += 1
+    if changed:
+        db_session.commit()
+    return changed
+
+def ensure_indexes():
+    """
+    [마이그레이션] 모델에 새로 추가된 인덱스 생성 (create_all은 기존 테이블에 인덱스를 추가하지 않음)
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+def normalize_member_columns(db_session):
+    """
+    [마이그레이션] 이름/소속 동아리가 NULL인 예전 행을 빈 문자열로 통일 (정렬/페이지네이션 기준 일관성)
+    """
+    db_session.query(Member).filter(Member.name.is_(None)).update({Member.name: ""}, synchronize_session=False)
+    db_session.query(Member).filter(Member.club.is_(None)).update({Member.club: ""}, synchronize_session=False)
+    db_session.commit()
+
+def _legacy_chat_time(chat: dict):
+    # 예전 메시지의 id는 작성 시각(time.time()) 문자열
+    try:
+        return datetime.fromtimestamp(float(chat.get("id")))
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+
+def import_chat_history(db_session, path: str = CHAT_HISTORY_FILE) -> int:
+    """
+    [마이그레이션] chat_history.json의 메시지를 chat_messages 테이블로 이전
+    테이블이 비어 있을 때만 실행하므로 여러 번 실행해도 중복되지 않음
+    """
+    if not os.path.exists(path) or db_session.query(exists().where(ChatMessage.id.isnot(None))).scalar():
+        return 0
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            chat_history = json.load(f)
+    except (OSError, ValueError):
+        return 0
+
+    messages = [
+        ChatMessage(
+            student_id=chat.get("student_id"),
+            name=chat.get("name", ""),
+            club=chat.get("club"),
+            role=chat.get("role", "user"),
+            message=chat.get("message", ""),
+            created_at=_legacy_chat_time(chat),
+        )
+        for chat in chat_history
+        if isinstance(chat, dict) and chat.get("message")
+    ]
+    db_session.add_all(messages)
+    db_session.commit()
+    return len(messages)
+
+def import_notice_file(db_session, path: str = NOTICE_FILE) -> bool:
+    """
+    [마이그레이션] notice.txt 내용을 notices 테이블의 첫 버전으로 이전 (테이블이 비어 있을 때만)
+    """
+    if not os.path.exists(path) or db_session.query(exists().where(Notice.id.isnot(None))).scalar():
+        return False
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read().strip()
+    if not text:
+        return False
+    published = datetime.fromtimestamp(os.path.getmtime(path))
+    db_session.add(Notice(text=text, created_by=None, created_at=published, publish_at=published))
+    db_session.commit()
+    return True
+
+def run_migrations():
+    ensure_indexes()
+    db_session = SessionLocal()
+    try:
+        normalize_member_columns(db_session)
+        migrated = backfill_member_clubs(db_session)
+        if migrated:
+            print(f"✅ {migrated}명의 소속 동아리를 member_clubs 테이블로 이전했습니다.")
+        normalized = normalize_club_strings(db_session)
+        if normalized:
+            print(f"✅ {normalized}명의 소속 동아리 표기를 정리했습니다.")
+        if sync_club_divisions(db_session):
+            print("✅ 동아리 분과 정보를 갱신했습니다.")
+        imported = import_chat_history(db_session)
+        if imported:
+            print(f"✅ 자유 소통방 메시지 {imported}개를 chat_messages 테이블로 이전했습니다.")
+        if import_notice_file(db_session):
+            print("✅ notice.txt 공지사항을 notices 테이블로 이전했습니다.")
+    finally:
+        db_session.close()
+
+if __name__ == "__main__":
+    import models
+    import database
+    models.Base.metadata.create_all(bind=database.engine)
+    run_migrations()
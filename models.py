@@ -1,11 +1,29 @@
-from sqlalchemy import Column, Integer, String, Boolean, Enum
+from sqlalchemy import Column, Integer, String, Boolean, Enum, ForeignKey, Index, Table, Text, DateTime
+from sqlalchemy.orm import relationship
 from database import Base
+from clubs import get_division, split_clubs
 import enum
 
 class MemberStatus(str, enum.Enum):
     active = "active"
     inactive = "inactive"
 
+# 회원-동아리 소속 관계 (다대다). 동아리별 회원 조회를 위해 club_id 인덱스 추가
+member_clubs = Table(
+    "member_clubs",
+    Base.metadata,
+    Column("member_id", Integer, ForeignKey("members.id", ondelete="CASCADE"), primary_key=True),
+    Column("club_id", Integer, ForeignKey("clubs.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_member_clubs_club_id", "club_id"),
+)
+
+class Club(Base):
+    __tablename__ = "clubs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, index=True)
+    division = Column(String, index=True)  # 예: '예술음악분과', '미분류'
+
 class Member(Base):
     __tablename__ = "members"
 
@@ -13,6 +31,60 @@ class Member(Base):
     student_id = Column(String, unique=True, index=True)
     password = Column(String)
     name = Column(String)
-    club = Column(String)
+    club = Column(String)  # 화면 표시용 소속 동아리 문자열 ('한울, 딕트'). 조회/필터는 clubs 관계 사용
     status = Column(Enum(MemberStatus), default=MemberStatus.active)
-    role = Column(String, default="member")  # 'admin' 또는 'member'
\ No newline at end of file
+    role = Column(String, default="member")  # 'admin' 또는 'member'
+
+    clubs = relationship(Club, secondary=member_clubs, backref="members")
+
+    # 관리자 회원 목록의 검색/정렬/필터(keyset 페이지네이션)용 인덱스
+    __table_args__ = (
+        Index("ix_members_name_student_id", "name", "student_id"),
+        Index("ix_members_club_student_id", "club", "student_id"),
+        Index("ix_members_status", "status"),
+        Index("ix_members_role", "role"),
+    )
+
+# 자유 소통방 메시지 (id는 계속 증가하므로 "id N 이후 메시지" 조회에 그대로 사용)
+class ChatMessage(Base):
+    __tablename__ = "chat_messages"
+
+    id = Column(Integer, primary_key=True, index=True)
+    student_id = Column(String, index=True)  # 예전 chat_history.json에서 옮긴 메시지는 비어 있을 수 있음
+    name = Column(String)
+    club = Column(String)
+    role = Column(String, default="user")  # 'assistant'(관리자) 또는 'user'
+    message = Column(Text)
+    created_at = Column(DateTime)
+    deleted_at = Column(DateTime, nullable=True)  # 삭제 시 행을 지우지 않고 시각만 기록 (soft delete)
+
+# 회원증 상단 공지사항 (수정할 때마다 새 행을 추가, id가 곧 버전 번호)
+class Notice(Base):
+    __tablename__ = "notices"
+
+    id = Column(Integer, primary_key=True, index=True)
+    text = Column(Text, default="")  # 빈 문자열이면 배너 숨김
+    created_by = Column(String)
+    created_at = Column(DateTime)
+    publish_at = Column(DateTime, index=True)  # 게시 시각 (예약 게시가 아니면 작성 시각과 같음)
+
+def get_or_create_clubs(db_session, names, club_cache: dict = None):
+    """
+    동아리 이름 목록에 해당하는 Club 객체를 조회하고, 없으면 생성 (이름 순서 유지)
+    club_cache: {이름: Club} 일괄 등록처럼 반복 호출할 때 조회를 줄이기 위한 캐시
+    """
+    club_cache = club_cache if club_cache is not None else {}
+    missing = [n for n in names if n not in club_cache]
+    if missing:
+        for club in db_session.query(Club).filter(Club.name.in_(missing)).all():
+            club_cache[club.name] = club
+        for n in missing:
+            if n not in club_cache:
+                club = Club(name=n, division=get_division(n))
+                db_session.add(club)
+                club_cache[n] = club
+    return [club_cache[n] for n in names]
+
+def sync_member_clubs(db_session, member: Member, club_cache: dict = None):
+    """members.club 문자열을 기준으로 member_clubs 소속 관계를 갱신 (club 문자열을 바꾼 뒤 호출)"""
+    member.clubs = get_or_create_clubs(db_session, split_clubs(member.club), club_cache)
@@ -0,0 +1,81 @@
+import threading
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models import Notice
+
+# 공지사항 수정 기록 조회 기본 개수
+NOTICE_HISTORY_LIMIT = 50
+
+# 현재 게시 중인 공지사항 캐시: (공지사항 dict, 다음 예약 게시 시각)
+# 수정 시 invalidate_notice()로 무효화하고, 예약된 공지사항은 게시 시각이 지나면 다시 조회
+_current = None
+_generation = 0
+_lock = threading.Lock()
+
+EMPTY_NOTICE = {"version": 0, "text": "", "created_by": None, "created_at": None, "publish_at": None}
+
+
+def notice_to_dict(notice: Notice) -> dict:
+    return {
+        "version": notice.id,
+        "text": notice.text or "",
+        "created_by": notice.created_by,
+        "created_at": notice.created_at,
+        "publish_at": notice.publish_at,
+    }
+
+
+def notice_etag(notice: dict) -> str:
+    return f'"notice-{notice["version"]}"'
+
+
+def get_current_notice(db_session: Session) -> dict:
+    """게시 시각이 지난 공지사항 중 가장 최근 버전 (없으면 빈 공지사항)"""
+    global _current
+    now = datetime.now()
+    with _lock:
+        cached = _current
+        generation = _generation
+    if cached is not None:
+        notice, next_publish_at = cached
+        if next_publish_at is None or now < next_publish_at:
+            return notice
+
+    latest = db_session.scalar(
+        select(Notice).where(Notice.publish_at <= now).order_by(Notice.publish_at.desc(), Notice.id.desc()).limit(1)
+    )
+    next_publish_at = db_session.scalar(
+        select(Notice.publish_at).where(Notice.publish_at > now).order_by(Notice.publish_at).limit(1)
+    )
+    notice = notice_to_dict(latest) if latest else EMPTY_NOTICE
+    with _lock:
+        # 조회 도중 공지사항이 수정되었으면 캐시에 남기지 않음
+        if generation == _generation:
+            _current = (notice, next_publish_at)
+    return notice
+
+
+def create_notice(db_session: Session, text: str, created_by: str, publish_at: Optional[datetime] = None) -> dict:
+    """새 버전 추가 (publish_at이 없으면 바로 게시)"""
+    now = datetime.now()
+    notice = Notice(text=text.strip(), created_by=created_by, created_at=now, publish_at=publish_at or now)
+    db_session.add(notice)
+    db_session.commit()
+    invalidate_notice()
+    return notice_to_dict(notice)
+
+
+def notice_history(db_session: Session, limit: int = NOTICE_HISTORY_LIMIT) -> List[dict]:
+    notices = db_session.scalars(select(Notice).order_by(Notice.id.desc()).limit(limit)).all()
+    return [notice_to_dict(n) for n in notices]
+
+
+def invalidate_notice():
+    global _current, _generation
+    with _lock:
+        _generation += 1
+        _current = None
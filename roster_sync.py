@@ -0,0 +1,227 @@
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, delete, select
+from sqlalchemy.orm import Session
+
+from cache import TTLCache
+from clubs import split_clubs
+from importer import ImportResult, RosterRow, iter_batches, merge_roster_rows, upsert_members
+from models import Club, Member, member_clubs
+
+# 미리보기 결과 보관 (적용 요청 시 토큰으로 찾음)
+SYNC_PREVIEW_TTL_SECONDS = int(os.getenv("SYNC_PREVIEW_TTL_SECONDS", "600"))
+SYNC_PREVIEW_MAX = 20
+# 미리보기 응답에 포함할 변경 회원 목록 최대 개수 (응답 크기 제한, 집계는 전체 기준)
+SYNC_CHANGE_LIST_LIMIT = 1000
+# 학번 목록으로 조회할 때 한 번에 넣을 학번 수
+SYNC_QUERY_BATCH_SIZE = 500
+
+# 변경 종류: added(신규 또는 해당 동아리에 새로 소속), removed(명단에서 빠짐), changed(해당 동아리 간 소속 변경)
+CHANGE_KINDS = ("added", "removed", "changed")
+
+
+class RosterSyncConflict(Exception):
+    """미리보기 이후 해당 회원들의 정보가 바뀌어 미리보기 내용을 그대로 적용할 수 없는 경우"""
+
+
+@dataclass
+class MemberChange:
+    kind: str
+    student_id: str
+    name: Optional[str]
+    before: List[str]
+    after: List[str]
+    role: str
+    delete: bool = False # 소속 동아리가 하나도 남지 않는 회원 (삭제 선택 시 회원 자체를 삭제)
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "student_id": self.student_id,
+            "name": self.name,
+            "before": self.before,
+            "after": self.after,
+            "delete": self.delete,
+        }
+
+
+@dataclass
+class RosterSyncPlan:
+    clubs: List[str]
+    roster: Dict[str, List[Tuple[str, str]]]
+    snapshot: str
+    changes: List[MemberChange]
+    unchanged: int
+    result: ImportResult
+    requested_by: str
+    token: str = field(default_factory=lambda: uuid.uuid4().hex)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+    def counts(self) -> Dict[str, int]:
+        counts = {kind: 0 for kind in CHANGE_KINDS}
+        for change in self.changes:
+            counts[change.kind] += 1
+        return counts
+
+    def summary(self) -> dict:
+        return {
+            "token": self.token,
+            "clubs": self.clubs,
+            **self.counts(),
+            "unchanged": self.unchanged,
+            "deletable": sum(1 for c in self.changes if c.delete),
+            "changes": [c.to_dict() for c in self.changes[:SYNC_CHANGE_LIST_LIMIT]],
+            "error_count": self.result.error_count,
+            "errors": list(self.result.errors),
+            "created_at": self.created_at,
+        }
+
+
+# 미리보기 토큰 -> RosterSyncPlan
+sync_previews = TTLCache(maxsize=SYNC_PREVIEW_MAX, ttl=SYNC_PREVIEW_TTL_SECONDS)
+
+
+def _load_current(db_session: Session, clubs: List[str], sids: Iterable[str]) -> Dict[str, tuple]:
+    """대상 동아리 소속 회원 + 명단에 있는 학번의 현재 정보 {학번: (학번, 이름, 소속동아리, 권한)}"""
+    columns = (Member.student_id, Member.name, Member.club, Member.role)
+    current = {}
+    if clubs:
+        rows = db_session.execute(
+            select(*columns)
+            .join(member_clubs, member_clubs.c.member_id == Member.id)
+            .join(Club, Club.id == member_clubs.c.club_id)
+            .where(Club.name.in_(clubs))
+            .distinct()
+        )
+        current.update((row.student_id, row) for row in rows)
+    for batch in iter_batches(sids, SYNC_QUERY_BATCH_SIZE):
+        rows = db_session.execute(select(*columns).where(Member.student_id.in_(batch)))
+        current.update((row.student_id, row) for row in rows)
+    return current
+
+
+def _snapshot(current: Dict[str, tuple]) -> str:
+    """현재 상태의 지문 (미리보기 이후 변경 여부 확인용)"""
+    digest = hashlib.sha256()
+    for sid in sorted(current):
+        row = current[sid]
+        digest.update(repr((sid, row.club, row.role)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _diff(roster: Dict[str, List[Tuple[str, str]]], clubs: List[str], current: Dict[str, tuple]) -> Tuple[List[MemberChange], int]:
+    """
+    [최적화] 학번별 소속 동아리 집합 비교로 변경 사항 계산
+    명단에 나온 동아리(대상 동아리)의 소속만 명단 기준으로 맞추고, 다른 동아리 소속은 그대로 유지
+    """
+    affected = set(clubs)
+    changes, unchanged = [], 0
+    for sid in sorted(roster.keys() | current.keys()):
+        rows = roster.get(sid)
+        existing = current.get(sid)
+        before = split_clubs(existing.club) if existing else []
+        file_clubs = []
+        for _, club in rows or []:
+            file_clubs += [c for c in split_clubs(club) if c not in file_clubs]
+        after = [c for c in before if c not in affected]
+        after += [c for c in file_clubs if c not in after]
+
+        if existing is None:
+            name = rows[0][0]
+            # 이름이 '김근호'이거나 소속 동아리가 '총동아리연합회'이면 관리자 권한 부여
+            role = "admin" if "총동아리연합회" in after or name == "김근호" else "member"
+            changes.append(MemberChange("added", sid, name, before, after, role))
+            continue
+        if set(before) == set(after):
+            unchanged += 1
+            continue
+
+        role = existing.role
+        if "총동아리연합회" in after and "총동아리연합회" not in before:
+            role = "admin"
+        name = rows[0][0] if rows else existing.name
+        if not rows:
+            # 관리자는 소속 동아리가 없어져도 삭제하지 않음
+            changes.append(MemberChange("removed", sid, name, before, after, role, delete=not after and role != "admin"))
+        elif not affected.intersection(before):
+            changes.append(MemberChange("added", sid, name, before, after, role))
+        else:
+            changes.append(MemberChange("changed", sid, name, before, after, role))
+    return changes, unchanged
+
+
+def plan_roster_sync(db_session: Session, rows: Iterable[RosterRow], result: ImportResult, requested_by: str) -> RosterSyncPlan:
+    """
+    업로드한 학기 명단과 대상 동아리의 현재 소속을 비교한 미리보기 (DB는 변경하지 않음)
+    명단에서 빠진 회원을 찾으려면 명단 전체가 필요하므로 학번별로 합친 명단 전체를 미리보기에 보관
+    """
+    roster = merge_roster_rows(rows, result)
+    clubs = list(dict.fromkeys(c for entries in roster.values() for _, club in entries for c in split_clubs(club)))
+    current = _load_current(db_session, clubs, roster.keys())
+    changes, unchanged = _diff(roster, clubs, current)
+    plan = RosterSyncPlan(
+        clubs=clubs,
+        roster=roster,
+        snapshot=_snapshot(current),
+        changes=changes,
+        unchanged=unchanged,
+        result=result,
+        requested_by=requested_by,
+    )
+    sync_previews.set(plan.token, plan)
+    return plan
+
+
+def apply_roster_sync(db_session: Session, plan: RosterSyncPlan, delete_members: bool = False) -> Dict[str, int]:
+    """
+    미리보기의 변경 사항만 반영 (commit은 호출하는 쪽에서 한 번에 수행)
+    미리보기 이후 대상 회원 정보가 바뀌었으면 RosterSyncConflict
+    """
+    current = _load_current(db_session, plan.clubs, plan.roster.keys())
+    if _snapshot(current) != plan.snapshot:
+        raise RosterSyncConflict("미리보기 이후 회원 정보가 변경되었습니다. 다시 미리보기를 실행해주세요.")
+
+    counts = plan.counts()
+    counts["deleted"] = 0
+    if not plan.changes:
+        return counts
+
+    to_delete = [c for c in plan.changes if c.delete and delete_members]
+    to_upsert = [c for c in plan.changes if not (c.delete and delete_members)]
+
+    # 1. 회원 추가/소속 동아리 문자열 갱신 및 새 소속 관계 추가 (importer와 같은 묶음 SQL)
+    upsert_members(db_session, [
+        {"student_id": c.student_id, "name": c.name, "clubs": c.after, "role": c.role}
+        for c in to_upsert
+    ])
+
+    # 2. 빠진 소속 관계 삭제
+    removed_links = [(c.student_id, club) for c in to_upsert for club in c.before if club not in c.after]
+    sids = list({sid for sid, _ in removed_links} | {c.student_id for c in to_delete})
+    member_ids = {}
+    for batch in iter_batches(sids, SYNC_QUERY_BATCH_SIZE):
+        member_ids.update(db_session.execute(select(Member.student_id, Member.id).where(Member.student_id.in_(batch))).all())
+    if removed_links:
+        club_names = list({club for _, club in removed_links})
+        club_ids = dict(db_session.execute(select(Club.name, Club.id).where(Club.name.in_(club_names))).all())
+        db_session.execute(
+            delete(member_clubs).where(
+                member_clubs.c.member_id == bindparam("m_id"),
+                member_clubs.c.club_id == bindparam("c_id"),
+            ),
+            [{"m_id": member_ids[sid], "c_id": club_ids[club]} for sid, club in removed_links if club in club_ids],
+        )
+
+    # 3. 소속 동아리가 남지 않은 회원 삭제 (선택 시)
+    if to_delete:
+        ids = [member_ids[c.student_id] for c in to_delete]
+        for batch in iter_batches(ids, SYNC_QUERY_BATCH_SIZE):
+            db_session.execute(delete(member_clubs).where(member_clubs.c.member_id.in_(batch)))
+            db_session.execute(delete(Member).where(Member.id.in_(batch)))
+        counts["deleted"] = len(to_delete)
+    return counts
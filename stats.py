@@ -0,0 +1,67 @@
+import os
+from datetime import datetime
+
+from sqlalchemy import case, distinct, func, select
+from sqlalchemy.orm import Session
+
+from cache import TTLCache
+from models import Club, Member, MemberStatus, member_clubs
+
+# 관리자 대시보드 통계 캐시 (쓰기 작업 시 invalidate_stats()로 즉시 무효화, 다중 워커 대비 TTL 적용)
+STATS_CACHE_TTL_SECONDS = float(os.getenv("STATS_CACHE_TTL_SECONDS", "60"))
+
+_stats_cache = TTLCache(maxsize=1, ttl=STATS_CACHE_TTL_SECONDS)
+# 집계 도중 쓰기가 일어나면 오래된 결과가 캐시에 남지 않도록 세대(generation) 번호로 확인
+_generation = 0
+
+
+def compute_stats(db_session: Session) -> dict:
+    """회원 수/활동 회원/관리자/동아리별·분과별 회원 수를 SQL 집계로 계산"""
+    total, active, admins = db_session.execute(
+        select(
+            func.count(Member.id),
+            func.coalesce(func.sum(case((Member.status == MemberStatus.active, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((Member.role == "admin", 1), else_=0)), 0),
+        )
+    ).one()
+
+    club_rows = db_session.execute(
+        select(Club.name, Club.division, func.count(member_clubs.c.member_id))
+        .join(member_clubs, member_clubs.c.club_id == Club.id)
+        .group_by(Club.id, Club.name, Club.division)
+        .order_by(Club.name)
+    ).all()
+
+    # 한 회원이 같은 분과의 동아리 여러 곳에 소속된 경우 한 번만 셈
+    division_rows = db_session.execute(
+        select(Club.division, func.count(distinct(member_clubs.c.member_id)))
+        .join(member_clubs, member_clubs.c.club_id == Club.id)
+        .group_by(Club.division)
+        .order_by(Club.division)
+    ).all()
+
+    return {
+        "total": total,
+        "active": active,
+        "admins": admins,
+        "club_count": len(club_rows),
+        "clubs": [{"name": name, "division": division, "member_count": count} for name, division, count in club_rows],
+        "divisions": [{"division": division, "member_count": count} for division, count in division_rows],
+        "generated_at": datetime.utcnow(),
+    }
+
+
+def get_stats(db_session: Session) -> dict:
+    stats = _stats_cache.get("stats")
+    if stats is None:
+        generation = _generation
+        stats = compute_stats(db_session)
+        if generation == _generation:
+            _stats_cache.set("stats", stats)
+    return stats
+
+
+def invalidate_stats():
+    global _generation
+    _generation += 1
+    _stats_cache.clear()
@@ -0,0 +1,76 @@
+import hashlib
+import os
+import time
+
+from jose import JWTError
+from jose import jwt as jose_jwt
+
+from cache import TTLCache
+
+# 선택 사항: PyJWT (설치되어 있고 JWT_BACKEND=pyjwt일 때만 사용)
+try:
+    import jwt as pyjwt
+except ImportError:
+    pyjwt = None
+
+# JWT 라이브러리 선택: jose(기본값) / pyjwt
+# 두 라이브러리의 속도 차이는 크지 않으므로(benchmarks/jwt_verify.py) 검증 비용은 아래 캐시로 줄임
+JWT_BACKEND = os.getenv("JWT_BACKEND", "jose").strip().lower()
+if JWT_BACKEND not in ("jose", "pyjwt"):
+    raise RuntimeError(f"알 수 없는 JWT_BACKEND 값입니다: {JWT_BACKEND} (jose 또는 pyjwt)")
+if JWT_BACKEND == "pyjwt" and pyjwt is None:
+    raise RuntimeError("JWT_BACKEND=pyjwt 설정에는 PyJWT 설치가 필요합니다. (pip install pyjwt)")
+USE_PYJWT = JWT_BACKEND == "pyjwt"
+
+# 검증된 토큰 캐시 크기 (동시에 사용 중인 토큰 수 정도)
+TOKEN_CACHE_MAX_SIZE = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "10000"))
+
+# [최적화] 검증이 끝난 토큰의 내용(claims)을 만료 시각(exp)까지 캐시
+# 키는 토큰의 SHA-256 해시 (토큰 원문을 메모리에 보관하지 않음). 토큰은 서명이 바뀌면 해시도 바뀌므로
+# 같은 해시면 이미 서명을 확인한 토큰과 같은 토큰이다.
+_verified_tokens = TTLCache(maxsize=TOKEN_CACHE_MAX_SIZE)
+
+
+def encode_token(claims: dict, secret_key: str, algorithm: str) -> str:
+    if USE_PYJWT:
+        return pyjwt.encode(claims, secret_key, algorithm=algorithm)
+    return jose_jwt.encode(claims, secret_key, algorithm=algorithm)
+
+
+def _decode(token: str, secret_key: str, algorithm: str) -> dict:
+    if USE_PYJWT:
+        try:
+            return pyjwt.decode(token, secret_key, algorithms=[algorithm])
+        except pyjwt.PyJWTError as e:
+            # 호출하는 쪽에서는 라이브러리와 관계없이 JWTError만 처리하면 되도록 변환
+            raise JWTError(str(e)) from e
+    return jose_jwt.decode(token, secret_key, algorithms=[algorithm])
+
+
+def decode_token(token: str, secret_key: str, algorithm: str) -> dict:
+    """
+    서명과 만료 시각을 확인한 토큰 내용 (잘못된 토큰이면 JWTError)
+    같은 토큰은 만료될 때까지 캐시된 결과를 사용 (해시 한 번으로 확인)
+    """
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    claims = _verified_tokens.get(key)
+    if claims is not None:
+        return claims
+
+    claims = _decode(token, secret_key, algorithm)
+    exp = claims.get("exp")
+    if exp is not None:
+        ttl = float(exp) - time.time()
+        if ttl > 0:
+            _verified_tokens.set(key, claims, ttl=ttl)
+    return claims
+
+
+def token_cache_stats() -> dict:
+    stats = _verified_tokens.stats()
+    stats["backend"] = "pyjwt" if USE_PYJWT else "jose"
+    return stats
+
+
+def clear_token_cache():
+    _verified_tokens.clear()